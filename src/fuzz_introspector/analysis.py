@@ -19,7 +19,8 @@ import multiprocessing
 import os
 import shutil
 
-from typing import (Dict, List, Type, Set, Union)
+from typing import (Any, Dict, Iterator, List, Optional, Tuple, Type, Set,
+                    Union)
 
 from fuzz_introspector import (cfg_load, code_coverage, constants, data_loader,
                                debug_info, html_helpers, json_report, utils)
@@ -50,30 +51,41 @@ class IntrospectionProject():
         self.base_folder = target_folder
         self.coverage_url = coverage_url
         self.optional_analyses = []
+        self.function_store = function_profile.FunctionProfileStore()
 
     def load_data_files(self,
                         parallelise=True,
                         correlation_file=None,
                         out_dir: str = '',
-                        harness_lists=None):
+                        harness_lists=None,
+                        cache_dir: Optional[str] = None,
+                        jobs: Optional[int] = None):
         """Generates the `proj_profile` and `profiles` elements of this class
         based on the raw data given as arguments. This function must be called
         before any real use of `IntrospectionProject` can happen.
+
+        If `cache_dir` is set, parsed and accummulated profiles are reused
+        from, and stored in, the given cache directory. `jobs` sets the number
+        of worker processes used for loading and accummulating profiles.
         """
 
         if harness_lists:
             logger.info('Loading profiles using harness list')
             self.profiles = []
             for report_yaml, calltree_text in harness_lists:
-                self.profiles.append(
-                    fuzzer_profile.FuzzerProfile('cfg_file',
-                                                 report_yaml,
-                                                 self.language,
-                                                 cfg_content=calltree_text))
+                profile = fuzzer_profile.FuzzerProfile(
+                    'cfg_file',
+                    report_yaml,
+                    self.language,
+                    cfg_content=calltree_text)
+                profile.intern_functions(self.function_store)
+                self.profiles.append(profile)
         else:
             logger.info('Loading profiles using files')
-            self.profiles = data_loader.load_all_profiles(
-                self.base_folder, self.language, parallelise)
+            with utils.time_stage('Loading profiles'):
+                self.profiles = data_loader.load_all_profiles(
+                    self.base_folder, self.language, parallelise, cache_dir,
+                    jobs, self.function_store)
 
         logger.info("Found %d profiles", len(self.profiles))
         if len(self.profiles) == 0:
@@ -86,44 +98,84 @@ class IntrospectionProject():
             for profile in self.profiles:
                 profile.correlate_executable_name(correlation_dict)
 
-        logger.info("[+] Accummulating profiles")
-        logger.info("Accummulating using multiprocessing")
-        manager = multiprocessing.Manager()
-        semaphore = multiprocessing.Semaphore(10)
+        # Accummulated profiles are returned by the workers with their own
+        # copy of the module functions, so intern them in a new store as
+        # they come in. The functions loaded above are dropped along with the
+        # loaded profiles.
+        accummulated_store = function_profile.FunctionProfileStore()
+
+        # Reuse accummulated profiles from the cache where possible.
+        profile_ids = [f"uniq-{idx}" for idx in range(len(self.profiles))]
+        accummulated_profiles: Dict[str, fuzzer_profile.FuzzerProfile] = {}
+        pending_profiles: Dict[str, fuzzer_profile.FuzzerProfile] = {}
+        cache_keys: Dict[str, str] = {}
+        for uniq_id, profile in zip(profile_ids, self.profiles):
+            if cache_dir:
+                cache_key = data_loader.get_accummulated_cache_key(
+                    profile, self.base_folder, self.profiles)
+                if cache_key is not None:
+                    cache_keys[uniq_id] = cache_key
+                    cached_profile = data_loader.load_cached_profile(
+                        cache_dir, cache_key)
+                    if cached_profile is not None:
+                        cached_profile.intern_functions(accummulated_store)
+                        accummulated_profiles[uniq_id] = cached_profile
+                        continue
+            pending_profiles[uniq_id] = profile
+        logger.info("Reusing %d accummulated profiles from cache",
+                    len(accummulated_profiles))
+
+        logger.info("[+] Propagating functions reached")
+        with utils.time_stage('Propagating functions reached'):
+            fuzzer_profile.propagate_functions_reached(
+                list(pending_profiles.values()), self.function_store)
+
+        # Parse coverage reports once up front, so they are shared by all
+        # profiles rather than parsed by each accummulation worker.
+        logger.info("[+] Loading coverage reports")
+        accummulation_jobs = (jobs if jobs is not None else
+                              DEFAULT_ACCUMMULATION_JOBS)
+        with utils.time_stage('Loading coverage reports'):
+            fuzzer_profile.preload_coverage(
+                list(pending_profiles.values()), self.base_folder,
+                accummulation_jobs if parallelise else 1)
 
-        return_dict = manager.dict()
+        logger.info("[+] Accummulating profiles")
+        with utils.time_stage('Accummulating profiles'):
+            for uniq_id, profile in _accummulate_profiles(
+                    pending_profiles, self.base_folder, parallelise,
+                    accummulation_jobs):
+                profile.intern_functions(accummulated_store)
+                accummulated_profiles[uniq_id] = profile
+                if cache_dir and uniq_id in cache_keys:
+                    data_loader.save_cached_profile(cache_dir,
+                                                    cache_keys[uniq_id],
+                                                    profile)
+        code_coverage.clear_llvm_coverage_cache()
+
+        self.profiles = [
+            accummulated_profiles[uniq_id] for uniq_id in profile_ids
+            if uniq_id in accummulated_profiles
+        ]
 
-        jobs = []
-        idx = 0
-        for profile in self.profiles:
-            p = multiprocessing.Process(
-                target=fuzzer_profile.FuzzerProfile.accummulate_profile,
-                args=(profile, self.base_folder, return_dict, f"uniq-{idx}",
-                      semaphore))
-            jobs.append(p)
-            idx += 1
-            p.start()
-        for proc in jobs:
-            proc.join()
-
-        new_profiles = []
-        for idx in return_dict:
-            new_profiles.append(return_dict[idx])
-        self.profiles = new_profiles
+        self.function_store = accummulated_store
+        logger.info("Interned %d unique functions", len(self.function_store))
 
         logger.info("[+] Creating project profile")
-        self.proj_profile = project_profile.MergedProjectProfile(
-            self.profiles, self.language)
+        with utils.time_stage('Creating project profile'):
+            self.proj_profile = project_profile.MergedProjectProfile(
+                self.profiles, self.language, self.function_store)
         self.proj_profile.coverage_url = self.coverage_url
 
         logger.info("[+] Refining profiles")
         for profile in self.profiles:
             profile.refine_paths(self.proj_profile.basefolder)
 
-        for profile in self.profiles:
-            overlay_calltree_with_coverage(profile, self.proj_profile,
-                                           self.coverage_url, self.base_folder,
-                                           out_dir)
+        with utils.time_stage('Overlaying calltrees with coverage'):
+            for profile in self.profiles:
+                overlay_calltree_with_coverage(profile, self.proj_profile,
+                                               self.coverage_url,
+                                               self.base_folder, out_dir)
         # Load all debug files
         self.debug_files = data_loader.load_all_debug_files(self.base_folder)
 
@@ -178,6 +230,70 @@ class IntrospectionProject():
             debug_info.dump_debug_report(self.debug_report, out_dir)
 
 
+# Number of worker processes used to accummulate profiles by default.
+DEFAULT_ACCUMMULATION_JOBS = 10
+
+# Profiles and target folder of the ongoing accummulation. These are set in
+# the pool initializer, so forked workers inherit them instead of having each
+# profile pickled to them.
+_ACCUMMULATION_STATE: Dict[str, Any] = {}
+
+
+def _init_accummulation_worker(profiles: Dict[str,
+                                              fuzzer_profile.FuzzerProfile],
+                               target_folder: str) -> None:
+    """Initializer of accummulation pool workers."""
+    _ACCUMMULATION_STATE['profiles'] = profiles
+    _ACCUMMULATION_STATE['target_folder'] = target_folder
+
+
+def _accummulate_profile_worker(
+        uniq_id: str) -> Tuple[str, Optional[fuzzer_profile.FuzzerProfile]]:
+    """Accummulates a single profile. The resulting profile is returned to
+    the parent process by pickling."""
+    profile = _ACCUMMULATION_STATE['profiles'][uniq_id]
+    try:
+        profile.accummulate_profile(_ACCUMMULATION_STATE['target_folder'],
+                                    None, None, None)
+    except Exception as err:
+        logger.error('Failed to accummulate profile %s: %s',
+                     profile.identifier, err)
+        return uniq_id, None
+    return uniq_id, profile
+
+
+def _accummulate_profiles(
+    profiles: Dict[str, fuzzer_profile.FuzzerProfile],
+    target_folder: str,
+    parallelise: bool = True,
+    jobs: Optional[int] = None
+) -> Iterator[Tuple[str, fuzzer_profile.FuzzerProfile]]:
+    """Accummulates `profiles` using a pool of `jobs` worker processes and
+    yields the accummulated profiles along with their ids, as soon as each
+    profile is accummulated."""
+    if jobs is None:
+        jobs = DEFAULT_ACCUMMULATION_JOBS
+    jobs = max(1, min(jobs, len(profiles)))
+    _init_accummulation_worker(profiles, target_folder)
+    try:
+        if parallelise and jobs > 1:
+            logger.info("Accummulating using %d workers", jobs)
+            with multiprocessing.Pool(jobs, _init_accummulation_worker,
+                                      (profiles, target_folder)) as pool:
+                for uniq_id, profile in pool.imap_unordered(
+                        _accummulate_profile_worker, profiles,
+                        data_loader.get_pool_chunksize(len(profiles), jobs)):
+                    if profile is not None:
+                        yield uniq_id, profile
+        else:
+            for uniq_id in profiles:
+                uniq_id, profile = _accummulate_profile_worker(uniq_id)
+                if profile is not None:
+                    yield uniq_id, profile
+    finally:
+        _ACCUMMULATION_STATE.clear()
+
+
 class AnalysisInterface(abc.ABC):
     """Plugin interface class."""
     name: str = ""
@@ -343,9 +459,7 @@ def get_node_coverage_hitcount(demangled_name: str, callstack: Dict[int, str],
             logger.info("There is no coverage data (not even all negative).")
         node.cov_parent = "EP"
 
-        node_hitcount = 0
-        for (n_line_number, hit_count_cov) in coverage_data:
-            node_hitcount = max(hit_count_cov, node_hitcount)
+        node_hitcount = coverage_data.get_max_hitcount()
         is_first = False
     elif callstack_has_parent(node, callstack):
         # Find the parent function and check coverage of the node
@@ -496,8 +610,9 @@ def overlay_calltree_with_coverage(
     target_coverage_url = utils.get_target_coverage_url(
         coverage_url, target_name, profile.target_lang)
     logger.info("Using coverage url: %s", target_coverage_url)
-    for node in cfg_load.extract_all_callsites(
-            profile.fuzzer_callsite_calltree):
+    all_callsites = cfg_load.extract_all_callsites(
+        profile.fuzzer_callsite_calltree)
+    for node in all_callsites:
         node.cov_ct_idx = ct_idx
         ct_idx += 1
 
@@ -528,63 +643,16 @@ def overlay_calltree_with_coverage(
     # For python, do a hack where we check if any node is covered, and, if so,
     # ensure the entrypoint is covered.
     logger.info("Overlaying 2")
-    all_nodes = cfg_load.extract_all_callsites(
-        profile.fuzzer_callsite_calltree)
-    if len(all_nodes) > 0:
-        for node in cfg_load.extract_all_callsites(
-                profile.fuzzer_callsite_calltree)[1:]:
+    if len(all_callsites) > 0:
+        for node in all_callsites[1:]:
             if node.cov_hitcount > 0:
-                all_nodes[0].cov_hitcount = 200
-                all_nodes[0].cov_color = get_hit_count_color(200)
+                all_callsites[0].cov_hitcount = 200
+                all_callsites[0].cov_color = get_hit_count_color(200)
                 break
 
     # Extract data about which nodes unlocks data
     logger.info("Overlaying 3")
-    all_callsites = cfg_load.extract_all_callsites(
-        profile.fuzzer_callsite_calltree)
-    prev_end = -1
-    for idx1, n1 in enumerate(all_callsites):
-        n1 = all_callsites[idx1]
-        prev = None
-        if idx1 > 0:
-            prev = all_callsites[idx1 - 1]
-        if n1.cov_hitcount == 0 and (
-            (prev is not None and prev.depth <= n1.depth) or idx1 < prev_end):
-            n1.cov_forward_reds = 0
-            n1.cov_largest_blocked_func = "none"
-            continue
-
-        # Read forward untill we see a green node.
-        idx2 = idx1 + 1
-        forward_red = 0
-        largest_blocked_name = ""
-        largest_blocked_count = 0
-        while idx2 < len(all_callsites):
-            # Check if we should break or increment forward_red
-            n2 = all_callsites[idx2]
-
-            # break if the node is visited. We *could* change this to another
-            # metric, e.g. all nodes underneath n1 that are off, i.e. instead
-            # of breaking here we would increment forward_red iff
-            # cov-hitcount != 0. This, however, would prioritise blockers at
-            # the top rather than precisely locate them in the calltree.
-            if n2.cov_hitcount != 0:
-                break
-
-            try:
-                fd = proj_profile.dst_to_fd_cache[n2.dst_function_name]
-                if fd.total_cyclomatic_complexity > largest_blocked_count:
-                    largest_blocked_count = fd.total_cyclomatic_complexity
-                    largest_blocked_name = n2.dst_function_name
-            except KeyError:
-                pass
-
-            forward_red += 1
-            idx2 += 1
-        prev_end = idx2 - 1
-        # logger.info("Assigning forward red: %d for index %d"%(forward_red, idx1))
-        n1.cov_forward_reds = forward_red
-        n1.cov_largest_blocked_func = largest_blocked_name
+    update_forward_reds(all_callsites, proj_profile.dst_to_fd_cache)
 
     logger.info("Updating branch complexities")
     update_branch_complexities(proj_profile.all_functions, profile.coverage)
@@ -624,6 +692,68 @@ def overlay_calltree_with_coverage(
                                                        out_dir)
 
 
+def update_forward_reds(
+        all_callsites: List[cfg_load.CalltreeCallsite],
+        dst_to_fd_cache: Dict[str, function_profile.FunctionProfile]) -> None:
+    """Sets the amount of uncovered nodes following each node in the
+    calltree, and the most complex function among those nodes.
+
+    The uncovered nodes following a node are those up until the next covered
+    node. Uncovered nodes that are part of the uncovered nodes following an
+    earlier node, or that are not at a shallower depth than the node before
+    them, are only the continuation of a blocker and get no forward reds.
+
+    The uncovered runs are computed in a single reverse scan, so each node
+    is only visited a constant amount of times.
+    """
+    callsite_count = len(all_callsites)
+    # run_length[idx] is the amount of consecutive uncovered nodes starting at
+    # idx, and run_blocked[idx] the index of the first node with the largest
+    # complexity among those, or -1 if none has a positive complexity.
+    run_length = [0] * (callsite_count + 1)
+    run_blocked = [-1] * (callsite_count + 1)
+    run_blocked_count = [0] * (callsite_count + 1)
+    for idx in range(callsite_count - 1, -1, -1):
+        node = all_callsites[idx]
+        # break if the node is visited. We *could* change this to another
+        # metric, e.g. all nodes underneath n1 that are off, i.e. instead
+        # of breaking here we would increment forward_red iff
+        # cov-hitcount != 0. This, however, would prioritise blockers at
+        # the top rather than precisely locate them in the calltree.
+        if node.cov_hitcount != 0:
+            continue
+
+        run_length[idx] = run_length[idx + 1] + 1
+        run_blocked[idx] = run_blocked[idx + 1]
+        run_blocked_count[idx] = run_blocked_count[idx + 1]
+        fd = dst_to_fd_cache.get(node.dst_function_name)
+        if fd is not None and fd.total_cyclomatic_complexity > 0 and (
+                fd.total_cyclomatic_complexity >= run_blocked_count[idx]):
+            run_blocked[idx] = idx
+            run_blocked_count[idx] = fd.total_cyclomatic_complexity
+
+    prev_end = -1
+    for idx1, n1 in enumerate(all_callsites):
+        prev = None
+        if idx1 > 0:
+            prev = all_callsites[idx1 - 1]
+        if n1.cov_hitcount == 0 and (
+            (prev is not None and prev.depth <= n1.depth) or idx1 < prev_end):
+            n1.cov_forward_reds = 0
+            n1.cov_largest_blocked_func = "none"
+            continue
+
+        # The uncovered nodes following n1 are the run starting right after it.
+        forward_red = run_length[idx1 + 1]
+        prev_end = idx1 + forward_red
+        n1.cov_forward_reds = forward_red
+        if run_blocked[idx1 + 1] == -1:
+            n1.cov_largest_blocked_func = ""
+        else:
+            n1.cov_largest_blocked_func = all_callsites[run_blocked[
+                idx1 + 1]].dst_function_name
+
+
 def update_branch_complexities(
         all_functions: Dict[str, function_profile.FunctionProfile],
         coverage: code_coverage.CoverageProfile) -> None:
@@ -1064,10 +1194,6 @@ def correlate_introspection_functions_to_debug_info(all_functions_json_report,
 
 
 def extract_all_sources(language):
-    all_files = set()
-    for root, dirs, files in os.walk('/src/'):
-        for f in files:
-            all_files.add(os.path.join(root, f))
     interesting_source_files = set()
 
     if language == 'jvm':
@@ -1088,7 +1214,9 @@ def extract_all_sources(language):
         '/src/source-code/'
     ]
 
-    for file in all_files:
+    # Directories to avoid are not walked into, but the files are still
+    # checked as the patterns may also match file names.
+    for file in utils.get_file_index('/src/', to_avoid).files:
         if not any(file.endswith(ext) for ext in test_extensions):
             continue
 
@@ -1143,6 +1271,20 @@ def _extract_test_information_cpp(report_dict, out_dir):
     return extract_tests_from_directories(directories, 'c-cpp', out_dir)
 
 
+def _get_outermost_directories(directories: Set[str]) -> List[str]:
+    """Returns the directories that are not nested in any of the other
+    directories. The files in a tree include those of all nested trees, so
+    only the outermost directories need to be looked at."""
+    outermost_directories = []
+    for directory in sorted(directories):
+        parent = os.path.dirname(directory)
+        while parent not in directories and parent != os.path.dirname(parent):
+            parent = os.path.dirname(parent)
+        if parent not in directories:
+            outermost_directories.append(directory)
+    return outermost_directories
+
+
 def extract_tests_from_directories(directories,
                                    language,
                                    out_dir,
@@ -1153,26 +1295,24 @@ def extract_tests_from_directories(directories,
     all_directories = set()
     all_files_in_subtree = set()
     for directory in directories:
-        for root, _, files in os.walk(directory):
-            for f in files:
-                file_path = os.path.join(root, f)
-                all_files_in_subtree.add(file_path)
-
-                assembled_dir = '/'
-                for dd2 in file_path.split('/'):
-                    # Skip empty dd2
-                    if not dd2:
-                        continue
+        for file_path in utils.get_file_index(directory).files:
+            all_files_in_subtree.add(file_path)
+
+            assembled_dir = '/'
+            for dd2 in file_path.split('/'):
+                # Skip empty dd2
+                if not dd2:
+                    continue
 
-                    # Skip hidden directories
-                    if dd2.startswith('.'):
-                        break
+                # Skip hidden directories
+                if dd2.startswith('.'):
+                    break
 
-                    assembled_dir += dd2
-                    if os.path.isdir(assembled_dir
-                                     ) and assembled_dir.startswith(directory):
-                        all_directories.add(assembled_dir)
-                    assembled_dir += '/'
+                assembled_dir += dd2
+                if assembled_dir not in all_directories and os.path.isdir(
+                        assembled_dir) and assembled_dir.startswith(directory):
+                    all_directories.add(assembled_dir)
+                assembled_dir += '/'
 
     inspirations = ["sample", "test", "example"]
     all_inspiration_dirs = set()
@@ -1201,57 +1341,53 @@ def extract_tests_from_directories(directories,
         'third_party', '/build/', '/usr/local/', '/fuzz-introspector/',
         '/root/.cache/', '/usr/', '/tmp/', '/src/inspector'
     ]
-    for directory in all_inspiration_dirs:
-        for root, dirs, files in os.walk(directory):
-            for f in files:
-                if not any(f.endswith(ext) for ext in test_extensions):
-                    continue
-                # Absolute path
-                absolute_path = os.path.join(root, f)
-                if any([avoid in absolute_path for avoid in to_avoid]):
-                    continue
-                if absolute_path.startswith('/out/'):
-                    continue
-                if absolute_path.startswith('/src/inspector/'):
-                    continue
-                try:
-                    with open(absolute_path, 'r') as file_fp:
-                        if 'LLVMFuzzerTestOneInput' in file_fp.read():
-                            continue
-                        # For rust projects
-                        if 'fuzz_target' in file_fp.read():
-                            continue
-                        # For python projects
-                        if '.Fuzz()' in file_fp.read():
-                            continue
-                        # For jvm projects
-                        if 'fuzzerTestOneInput' in file_fp.read():
-                            continue
-                        # For go projects
-                        if 'Fuzz' in file_fp.read():
-                            continue
-                except UnicodeDecodeError:
-                    continue
-                all_test_files.add(absolute_path)
+    for directory in _get_outermost_directories(all_inspiration_dirs):
+        for absolute_path in utils.get_file_index(directory).files:
+            if not any(absolute_path.endswith(ext) for ext in test_extensions):
+                continue
+            # Absolute path
+            if any([avoid in absolute_path for avoid in to_avoid]):
+                continue
+            if absolute_path.startswith('/out/'):
+                continue
+            if absolute_path.startswith('/src/inspector/'):
+                continue
+            try:
+                with open(absolute_path, 'r') as file_fp:
+                    if 'LLVMFuzzerTestOneInput' in file_fp.read():
+                        continue
+                    # For rust projects
+                    if 'fuzz_target' in file_fp.read():
+                        continue
+                    # For python projects
+                    if '.Fuzz()' in file_fp.read():
+                        continue
+                    # For jvm projects
+                    if 'fuzzerTestOneInput' in file_fp.read():
+                        continue
+                    # For go projects
+                    if 'Fuzz' in file_fp.read():
+                        continue
+            except UnicodeDecodeError:
+                continue
+            all_test_files.add(absolute_path)
 
     # Iterate through all directories and search for files with test in them.
-    for directory in all_directories:
-        for root, dirs, files in os.walk(directory):
-            for f in files:
-                if not any(f.endswith(ext) for ext in test_extensions):
-                    continue
-                # Absolute path
-                absolute_path = os.path.join(root, f)
-                if any([avoid in absolute_path for avoid in to_avoid]):
-                    continue
-                if absolute_path.startswith('/out/'):
-                    continue
-                if absolute_path.startswith('/src/inspector/'):
-                    continue
-                if absolute_path.startswith('/usr/'):
-                    continue
-                if "test" in f:
-                    all_test_files.add(absolute_path)
+    for directory in _get_outermost_directories(all_directories):
+        for absolute_path in utils.get_file_index(directory).files:
+            if not any(absolute_path.endswith(ext) for ext in test_extensions):
+                continue
+            # Absolute path
+            if any([avoid in absolute_path for avoid in to_avoid]):
+                continue
+            if absolute_path.startswith('/out/'):
+                continue
+            if absolute_path.startswith('/src/inspector/'):
+                continue
+            if absolute_path.startswith('/usr/'):
+                continue
+            if "test" in os.path.basename(absolute_path):
+                all_test_files.add(absolute_path)
     new_test_files = set()
     for test_file in all_test_files:
         if test_file.startswith('//'):
@@ -13,9 +13,11 @@
 # limitations under the License.
 """ Module for loading CFG files """
 
+import io
 import logging
+import sys
 
-from typing import (List, Optional)
+from typing import (Iterable, Iterator, List, Optional, Union)
 
 from fuzz_introspector.exceptions import CalltreeError
 
@@ -27,6 +29,15 @@ class CalltreeCallsite():
     Represents a single node in the calltree
     """
 
+    # Calltrees of large projects have millions of nodes, so avoid a
+    # per-node attribute dictionary.
+    __slots__ = ('dst_function_name', 'dst_function_source_file',
+                 'src_linenumber', 'parent_calltree_callsite', 'depth',
+                 'src_function_source_file', 'src_function_name', 'children',
+                 'cov_ct_idx', 'cov_parent', 'cov_hitcount', 'cov_color',
+                 'hitcount', 'cov_link', 'cov_callsite_link',
+                 'cov_forward_reds', 'cov_largest_blocked_func')
+
     def __init__(
             self, dst_function_name: str, dst_function_source_file: str,
             depth: int, src_linenumber: int,
@@ -53,14 +64,24 @@ class CalltreeCallsite():
         self.cov_largest_blocked_func: str = ""
 
 
+def iter_callsites(calltree: CalltreeCallsite) -> Iterator[CalltreeCallsite]:
+    """Yields all callsites in the tree rooted at the given node in
+    pre-order. The traversal is iterative, so it is not limited by the depth
+    of the calltree."""
+    stack = [calltree]
+    while stack:
+        node = stack.pop()
+        yield node
+        if node.children:
+            stack.extend(node.children[::-1])
+
+
 def extract_all_callsites_recursive(
         calltree: CalltreeCallsite,
         callsite_nodes: List[CalltreeCallsite]) -> None:
-    """Given a node, will assemble all callsites in the children.
-    Recursive function."""
-    callsite_nodes.append(calltree)
-    for c in calltree.children:
-        extract_all_callsites_recursive(c, callsite_nodes)
+    """Given a node, will assemble all callsites in the children in
+    pre-order."""
+    callsite_nodes.extend(iter_callsites(calltree))
 
 
 def extract_all_callsites(
@@ -69,100 +90,105 @@ def extract_all_callsites(
         logger.debug("Trying to extract from a None calltree")
         return []
 
-    cs_list: List[CalltreeCallsite] = []
-    extract_all_callsites_recursive(calltree, cs_list)
-    return cs_list
+    return list(iter_callsites(calltree))
 
 
 def print_ctcs_tree(ctcs: CalltreeCallsite) -> None:
-    spacing = " " * int(ctcs.depth)
-    print(f"{spacing}{ctcs.dst_function_name}"
-          f" -- {ctcs.dst_function_source_file} -- {ctcs.src_linenumber}")
-    for c in ctcs.children:
-        print_ctcs_tree(c)
+    for node in iter_callsites(ctcs):
+        spacing = " " * int(node.depth)
+        print(f"{spacing}{node.dst_function_name}"
+              f" -- {node.dst_function_source_file} -- {node.src_linenumber}")
 
 
-def data_file_read_calltree(cfg_content: str) -> Optional[CalltreeCallsite]:
+def data_file_read_calltree(
+        cfg_content: Union[str, Iterable[str]]) -> Optional[CalltreeCallsite]:
     """
     Extracts the calltree of a fuzzer from a .data file.
     This is for C/C++ files
 
+    The calltree is streamed line by line, from either the content of the
+    file or an iterable of its lines, e.g. the opened file. Function and file
+    names are interned, as the same names recur throughout the calltree.
+
     Returns a CalltreeCallsite that is the root of the tree read.
     """
     read_tree = False
     curr_ctcs_node = None
     curr_depth = -1
 
-    all_lines = []
+    if isinstance(cfg_content, str):
+        cfg_content = io.StringIO(cfg_content)
+
     try:
-        for line in cfg_content.split('\n'):
-            if line.strip():
-                all_lines.append(line)
+        for line in cfg_content:
+            line = line.replace("\n", "")
+            if not line.strip():
+                continue
+            if read_tree and "======" not in line:
+                stripped_line = line.strip().split(" ")
+                # Parse the line
+                # Type: {spacing depth} {target filename} {line count}
+                if len(stripped_line) == 3:
+                    target_func = stripped_line[0]
+                    filename = stripped_line[1]
+                    linenumber = int(stripped_line[2].replace(
+                        "linenumber=", ""))
+                else:
+                    target_func = stripped_line[0]
+                    filename = ""
+                    linenumber = 0
+
+                if "......" in filename or "......" in target_func:
+                    filename = filename.replace("......", "")
+                    target_func = target_func.replace("......", "")
+                target_func = sys.intern(target_func)
+                filename = sys.intern(filename)
+
+                space_count = len(line) - len(line.lstrip(' '))
+                depth = int(space_count / 2)
+
+                # Create a callsite nide
+                ctcs = CalltreeCallsite(target_func, filename, depth,
+                                        linenumber, curr_ctcs_node)
+
+                # Check if this node is still a child of the current parent node
+                # and handle if not.
+                if curr_depth == -1:
+                    # First node
+                    curr_ctcs_node = ctcs
+                elif depth > curr_depth and curr_ctcs_node is not None:
+                    # We are going one calldepth deeper
+                    # Special case in the root parent case, where we have no
+                    # parent in the current node and also no children.
+                    if (curr_ctcs_node.parent_calltree_callsite is not None
+                            or curr_ctcs_node.children):
+                        curr_ctcs_node = curr_ctcs_node.children[-1]
+
+                elif depth < curr_depth and curr_ctcs_node is not None:
+                    # We are going up, find out how much
+                    depth_diff = int(curr_depth - depth)
+                    tmp_node = curr_ctcs_node
+                    idx = 0
+                    while (idx < depth_diff
+                           and tmp_node.parent_calltree_callsite is not None):
+                        tmp_node = tmp_node.parent_calltree_callsite
+                        idx += 1
+                    curr_ctcs_node = tmp_node
+                # Add the node to the current parent
+                if curr_depth != -1 and curr_ctcs_node is not None:
+                    ctcs.parent_calltree_callsite = curr_ctcs_node
+                    ctcs.src_function_name = (
+                        ctcs.parent_calltree_callsite.dst_function_name)
+                    curr_ctcs_node.children.append(ctcs)
+                curr_depth = depth
+
+            if "====================================" in line:
+                read_tree = False
+            if "Call tree" in line:
+                read_tree = True
     except UnicodeDecodeError:
         raise CalltreeError("Decoding error when reading CFG file")
 
-    for line in all_lines:
-        line = line.replace("\n", "")
-        if read_tree and "======" not in line:
-            stripped_line = line.strip().split(" ")
-            # Parse the line
-            # Type: {spacing depth} {target filename} {line count}
-            if len(stripped_line) == 3:
-                target_func = stripped_line[0]
-                filename = stripped_line[1]
-                linenumber = int(stripped_line[2].replace("linenumber=", ""))
-            else:
-                target_func = stripped_line[0]
-                filename = ""
-                linenumber = 0
-
-            if "......" in filename or "......" in target_func:
-                filename = filename.replace("......", "")
-                target_func = target_func.replace("......", "")
-
-            space_count = len(line) - len(line.lstrip(' '))
-            depth = int(space_count / 2)
-
-            # Create a callsite nide
-            ctcs = CalltreeCallsite(target_func, filename, depth, linenumber,
-                                    curr_ctcs_node)
-
-            # Check if this node is still a child of the current parent node
-            # and handle if not.
-            if curr_depth == -1:
-                # First node
-                curr_ctcs_node = ctcs
-            elif depth > curr_depth and curr_ctcs_node is not None:
-                # We are going one calldepth deeper
-                # Special case in the root parent case, where we have no
-                # parent in the current node and also no children.
-                if (curr_ctcs_node.parent_calltree_callsite is not None
-                        or curr_ctcs_node.children):
-                    curr_ctcs_node = curr_ctcs_node.children[-1]
-
-            elif depth < curr_depth and curr_ctcs_node is not None:
-                # We are going up, find out how much
-                depth_diff = int(curr_depth - depth)
-                tmp_node = curr_ctcs_node
-                idx = 0
-                while (idx < depth_diff
-                       and tmp_node.parent_calltree_callsite is not None):
-                    tmp_node = tmp_node.parent_calltree_callsite
-                    idx += 1
-                curr_ctcs_node = tmp_node
-            # Add the node to the current parent
-            if curr_depth != -1 and curr_ctcs_node is not None:
-                ctcs.parent_calltree_callsite = curr_ctcs_node
-                ctcs.src_function_name = (
-                    ctcs.parent_calltree_callsite.dst_function_name)
-                curr_ctcs_node.children.append(ctcs)
-            curr_depth = depth
-
-        if "====================================" in line:
-            read_tree = False
-        if "Call tree" in line:
-            read_tree = True
-
     # move upwards from any node in the tree
     ctcs_root: Optional[CalltreeCallsite] = curr_ctcs_node
     if ctcs_root is None:
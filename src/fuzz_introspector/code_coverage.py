@@ -17,15 +17,22 @@ import os
 import sys
 import json
 import logging
+import multiprocessing
 import re
 
+from array import array
+from bisect import bisect_left
 from typing import (
     Any,
     Dict,
+    Iterator,
     List,
+    Sequence,
     Set,
     Optional,
     Tuple,
+    Union,
+    overload,
 )
 
 from fuzz_introspector import utils
@@ -39,12 +46,119 @@ COVERAGE_BRANCH_REGEX = re.compile(r'.*\|.*\sBranch.*\(.*:.*\):')
 logger = logging.getLogger(name=__name__)
 
 
+class LineCoverage(Sequence[Tuple[int, int]]):
+    """Line coverage of a single function, as a sequence of pairs of line
+    number and hitcount.
+
+    The line numbers and hitcounts are stored in two contiguous arrays rather
+    than as a list of tuples, and the number of lines hit is maintained as
+    lines are added, so summaries of the coverage are O(1).
+    """
+
+    __slots__ = ('_lines', '_hits', 'lines_hit')
+
+    def __init__(
+            self,
+            line_hits: Optional[Sequence[Tuple[int, int]]] = None) -> None:
+        self._lines = array('I')
+        self._hits = array('Q')
+        self.lines_hit = 0
+        if line_hits is not None:
+            for line_number, hit_count in line_hits:
+                self.append(line_number, hit_count)
+
+    def append(self, line_number: int, hit_count: int) -> None:
+        """Adds the hitcount of a line to the coverage."""
+        self._lines.append(line_number)
+        self._hits.append(hit_count)
+        if hit_count > 0:
+            self.lines_hit += 1
+
+    def get_line_hitcount(self, line_number: int) -> int:
+        """Returns the hitcount of the first occurrence of `line_number`, or
+        -1 if the line is not in the coverage."""
+        try:
+            return self._hits[self._lines.index(line_number)]
+        except ValueError:
+            return -1
+
+    def get_max_hitcount(self) -> int:
+        """Returns the highest hitcount of any line, 0 if there are none."""
+        return max(self._hits, default=0)
+
+    def merge_max(self,
+                  other: 'LineCoverage',
+                  func_name: str = '') -> 'LineCoverage':
+        """Returns the merge of this and `other` coverage of the same
+        function, taking the element-wise max of the hitcounts. Lines are
+        matched by position, lines beyond the end of `other` keep their
+        hitcount and lines whose numbers differ are dropped."""
+        merged = LineCoverage()
+        if self._lines == other._lines:
+            merged._lines = array('I', self._lines)
+            merged._hits = array('Q', map(max, self._hits, other._hits))
+            merged.lines_hit = sum(1 for hit_count in merged._hits
+                                   if hit_count > 0)
+            return merged
+
+        other_len = len(other._lines)
+        for idx, line_number in enumerate(self._lines):
+            hit_count = self._hits[idx]
+            if idx < other_len:
+                # It may be that line numbers are not the same for the same
+                # function name across different fuzzers.
+                # This *could* actually happen, and will often (almost always)
+                # happen for LLVMFuzzerTestOneInput. In this case we just
+                # gracefully continue and ignore issues.
+                if other._lines[idx] != line_number:
+                    logger.info(
+                        f"Line numbers are different in the same function: "
+                        f"{func_name}:{line_number}:{other._lines[idx]}, "
+                        f"ignoring")
+                    continue
+                hit_count = max(hit_count, other._hits[idx])
+            merged.append(line_number, hit_count)
+        return merged
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    @overload
+    def __getitem__(self, idx: int) -> Tuple[int, int]:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[Tuple[int, int]]:
+        ...
+
+    def __getitem__(
+        self,
+        idx: Union[int,
+                   slice]) -> Union[Tuple[int, int], List[Tuple[int, int]]]:
+        if isinstance(idx, slice):
+            return list(zip(self._lines[idx], self._hits[idx]))
+        return self._lines[idx], self._hits[idx]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self._lines, self._hits)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LineCoverage):
+            return self._lines == other._lines and self._hits == other._hits
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'LineCoverage({list(self)!r})'
+
+
 class CoverageProfile:
     """Stores and handles a runtime coverage data.
 
-    :ivar Dict[str, List[Tuple[int, int]]] covmap:  Dictionary of string to
-        list of tuples of ints. The tuples correspond to line number and
-        hitcount. The string can have multiple meanings depending on the
+    :ivar Dict[str, LineCoverage] covmap:  Dictionary of string to
+        line coverage, i.e. sequence of pairs of ints. The pairs correspond to
+        line number and hitcount. The string can have multiple meanings depending on the
         language being handled. For C/C++ it corresponds to functions,
         and for Python it correspond to source code files.
 
@@ -59,13 +173,102 @@ class CoverageProfile:
     """
 
     def __init__(self) -> None:
-        self.covmap: Dict[str, List[Tuple[int, int]]] = dict()
+        self.covmap: Dict[str, LineCoverage] = dict()
         self.file_map: Dict[str, List[Tuple[int, int]]] = dict()
         self.branch_cov_map: Dict[str, List[int]] = dict()
         self._cov_type = ""
         self.coverage_files: List[str] = []
         self.dual_file_map: Dict[str, Dict[str, List[int]]] = dict()
         self.kernel_coverage: List[Dict[Any, Any]] = []
+        self._reset_fuzz_key_index()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The name resolution index is cheap to rebuild, so leave it out of
+        # pickled profiles.
+        state = self.__dict__.copy()
+        del state['_fuzz_key_cache']
+        del state['_rust_key_index']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._reset_fuzz_key_index()
+
+    def _reset_fuzz_key_index(self) -> None:
+        """Drops the name resolution index, see `_resolve_fuzz_key`."""
+        self._fuzz_key_cache: Dict[str, Optional[str]] = dict()
+        self._fuzz_key_cache_size = len(self.covmap)
+        self._rust_key_index: Optional[Tuple[List[str], List[int],
+                                             List[str]]] = None
+
+    def _resolve_fuzz_key(self, funcname: str) -> Optional[str]:
+        """Resolves a function name to its key in covmap. The name is tried
+        as is, demangled, normalised and without generics, and for Rust
+        functions missing crate information by suffix.
+
+        Resolved names are memoised. As keys are never removed from covmap,
+        the memoised names are only dropped when keys are added.
+        """
+        if self._fuzz_key_cache_size != len(self.covmap):
+            self._reset_fuzz_key_index()
+        try:
+            return self._fuzz_key_cache[funcname]
+        except KeyError:
+            pass
+
+        fuzz_key: Optional[str] = None
+        if funcname in self.covmap:
+            fuzz_key = funcname
+        elif utils.demangle_cpp_func(funcname) in self.covmap:
+            fuzz_key = utils.demangle_cpp_func(funcname)
+        elif utils.normalise_str(funcname) in self.covmap:
+            fuzz_key = utils.normalise_str(funcname)
+        elif utils.remove_jvm_generics(funcname) in self.covmap:
+            fuzz_key = utils.remove_jvm_generics(funcname)
+        else:
+            # Handle special case for rust where crate is missing from function name
+            fuzz_key = self._locate_rust_fuzz_key(
+                utils.demangle_rust_func(funcname))
+
+        self._fuzz_key_cache[funcname] = fuzz_key
+        return fuzz_key
+
+    def _get_first_key_with_suffix(self, suffix: str) -> Optional[str]:
+        """Returns the first key of covmap, in insertion order, that ends
+        with `suffix`. Keys are looked up in an index of the reversed keys,
+        in which all keys with the same suffix form a contiguous range."""
+        if self._rust_key_index is None:
+            keys = list(self.covmap)
+            key_order = sorted(range(len(keys)), key=lambda i: keys[i][::-1])
+            self._rust_key_index = ([keys[i][::-1]
+                                     for i in key_order], key_order, keys)
+        reversed_keys, key_order, keys = self._rust_key_index
+
+        reversed_suffix = suffix[::-1]
+        start = bisect_left(reversed_keys, reversed_suffix)
+        end = bisect_left(reversed_keys, reversed_suffix + chr(0x10ffff),
+                          start)
+        if start == end:
+            return None
+        return keys[min(key_order[start:end])]
+
+    def _locate_rust_fuzz_key(self, funcname: str) -> Optional[str]:
+        """Locates the covmap key of a rust function with missing crate
+        information. Same as `utils.locate_rust_fuzz_key` but using the
+        suffix index rather than scanning covmap."""
+        while funcname:
+            match = self._get_first_key_with_suffix(funcname)
+            # Ensure the matched key contains crate information which is
+            # unique for rust
+            if match and '::' in match:
+                return match
+
+            if '::' in funcname:
+                funcname = funcname.split('::', 1)[1]
+            else:
+                break
+
+        return None
 
     def set_type(self, cov_type: str) -> None:
         self._cov_type = cov_type
@@ -157,7 +360,7 @@ class CoverageProfile:
             return True
         return False
 
-    def get_hit_details(self, funcname: str) -> List[Tuple[int, int]]:
+    def get_hit_details(self, funcname: str) -> LineCoverage:
         """Returns details of code coverage for a given function.
 
         This should only be used for coverage profiles that are non-file type.
@@ -165,28 +368,16 @@ class CoverageProfile:
         :param funcname: Function name to lookup.
         :type funcname: str
 
-        :rtype: List[Tuple[int, int]]
-        :returns: List of pairs where the first element is the source code
+        :rtype: LineCoverage
+        :returns: Sequence of pairs where the first element is the source code
             linenumber and the second element is the amount of times that line
             was covered.
         """
         logger.debug(f"Getting coverage of {funcname}")
-        fuzz_key = None
-        if funcname in self.covmap:
-            fuzz_key = funcname
-        elif utils.demangle_cpp_func(funcname) in self.covmap:
-            fuzz_key = utils.demangle_cpp_func(funcname)
-        elif utils.normalise_str(funcname) in self.covmap:
-            fuzz_key = utils.normalise_str(funcname)
-        elif utils.remove_jvm_generics(funcname) in self.covmap:
-            fuzz_key = utils.remove_jvm_generics(funcname)
-        else:
-            # Handle special case for rust where crate is missing from function name
-            fuzz_key = utils.locate_rust_fuzz_key(
-                utils.demangle_rust_func(funcname), self.covmap)
+        fuzz_key = self._resolve_fuzz_key(funcname)
 
         if fuzz_key is None or fuzz_key not in self.covmap:
-            return []
+            return LineCoverage()
 
         return self.covmap[fuzz_key]
 
@@ -287,7 +478,7 @@ class CoverageProfile:
 
                 if fname not in self.covmap:
                     # Fail safe
-                    self.covmap[fname] = []
+                    self.covmap[fname] = LineCoverage()
 
                 # If we have the file in dual_file_map identify the
                 # executed vs non-executed lines and store in covmap.
@@ -300,13 +491,13 @@ class CoverageProfile:
                     if (exec_line > fstart) and (exec_line < fend
                                                  or fend == -1):
                         logger.debug("E: %s", exec_line)
-                        self.covmap[fname].append((exec_line, 1000))
+                        self.covmap[fname].append(exec_line, 1000)
                 for non_exec_line in self.dual_file_map[filename][
                         'missing_lines']:
                     if (non_exec_line > fstart) and (non_exec_line < fend
                                                      or fend == -1):
                         logger.debug("N: %s", non_exec_line)
-                        self.covmap[fname].append((non_exec_line, 0))
+                        self.covmap[fname].append(non_exec_line, 0)
 
     def correlate_python_functions_with_coverage(
         self,
@@ -365,39 +556,19 @@ class CoverageProfile:
             the total amount of lines in a function and second element is the
             amount of lines in the function that are hit.
         """
-        fuzz_key = None
-        if funcname in self.covmap:
-            fuzz_key = funcname
-        elif utils.demangle_cpp_func(funcname) in self.covmap:
-            fuzz_key = utils.demangle_cpp_func(funcname)
-        elif utils.normalise_str(funcname) in self.covmap:
-            fuzz_key = utils.normalise_str(funcname)
-        elif utils.remove_jvm_generics(funcname) in self.covmap:
-            fuzz_key = utils.remove_jvm_generics(funcname)
-        else:
-            # Handle special case for rust where crate is missing from function name
-            fuzz_key = utils.locate_rust_fuzz_key(
-                utils.demangle_rust_func(funcname), self.covmap)
+        fuzz_key = self._resolve_fuzz_key(funcname)
 
         if fuzz_key is None:
             return None, None
 
-        lines_hit = [ht for ln, ht in self.covmap[fuzz_key] if ht > 0]
-        return len(self.covmap[fuzz_key]), len(lines_hit)
+        line_coverage = self.covmap[fuzz_key]
+        return len(line_coverage), line_coverage.lines_hit
 
     def is_func_lineno_hit(self, func_name: str, lineno: int) -> bool:
         """
         Checks if a given line number in a function is hit.
         """
-        func_hit_details = self.get_hit_details(func_name)
-
-        for line_info in func_hit_details:
-            if lineno == line_info[0]:
-                if line_info[1] != 0:
-                    return True
-                else:
-                    return False
-        return False
+        return self.get_hit_details(func_name).get_line_hitcount(lineno) > 0
 
 
 def extract_hitcount(coverage_line: str) -> int:
@@ -429,6 +600,307 @@ def extract_hitcount(coverage_line: str) -> int:
     return int(num)
 
 
+# Parsed function and branch coverage of a single .covreport file.
+LlvmReportCoverage = Tuple[Dict[str, LineCoverage], Dict[str, List[int]]]
+
+# Cache of parsed .covreport files, so each report is only parsed once per
+# run even if it is used by several fuzzer profiles. Keyed by the path of the
+# report and whether it holds Rust coverage.
+_LLVM_REPORT_CACHE: Dict[Tuple[str, bool], Tuple[Tuple[int, int],
+                                                 LlvmReportCoverage]] = {}
+
+
+def _extract_hitcount_bytes(coverage_field: bytes) -> int:
+    """Bytes variant of `extract_hitcount` with a fast path for plain
+    integer hitcounts, which make up the vast majority of a report."""
+    coverage_field = coverage_field.strip()
+    if coverage_field.isdigit():
+        return int(coverage_field)
+    return extract_hitcount(coverage_field.decode('latin-1'))
+
+
+def parse_llvm_coverage_report(profile_file: str,
+                               is_rust: bool = False) -> LlvmReportCoverage:
+    """Parses a single coverage report of "llvm-cov show" in one streaming
+    pass over the raw bytes of the file. See `load_llvm_coverage` for details
+    of the format.
+
+    Lines of source code, which make up the bulk of a report, are handled
+    directly on the bytes. Only function names and the rare lines that may
+    hold switch, case and branch coverage are decoded.
+
+    :returns: tuple of function coverage map and branch coverage map.
+    """
+    covmap: Dict[str, LineCoverage] = {}
+    branch_cov_map: Dict[str, List[int]] = {}
+    with open(profile_file, 'rb') as pf:
+        curr_func = None
+        curr_lines = LineCoverage()
+        switch_string = str()
+        switch_line_number = None
+        case_line_numbers: Set[int] = set()
+        for raw_line in pf:
+            raw_line = raw_line.rstrip(b'\n')
+            pipe_idx = raw_line.find(b'|')
+
+            # Parse lines that signal function names. These linse indicate that the
+            # lines following this line will be the specific source code lines of
+            # the given function.
+            # Example line:
+            #  "LLVMFuzzerTestOneInput:\n"
+            if pipe_idx == -1:
+                if not raw_line.endswith(b':'):
+                    continue
+                line = utils.safe_decode(raw_line)
+                if line is None:
+                    continue
+                if len(line.split(":")) == 3:
+                    curr_func = line.split(":")[1].replace(" ", "")
+                else:
+                    curr_func = line.replace(" ", "").replace(":", "")
+                if is_rust:
+                    curr_func = utils.demangle_rust_func(curr_func)
+                else:
+                    curr_func = utils.demangle_cpp_func(curr_func)
+                curr_lines = LineCoverage()
+                covmap[curr_func] = curr_lines
+                switch_string = ''
+                switch_line_number = None
+                continue
+
+            if curr_func is None:
+                continue
+
+            # Parse lines that signal specific line of code. These lines only
+            # offer after the function names parsed above.
+            # Example line:
+            #  "   83|  5.99M|    char *kldfj = (char*)malloc(123);\n"
+            if (b'Branch' not in raw_line and b'switch' not in raw_line
+                    and b'case' not in raw_line):
+                # Skip the lines that can not be decoded, as done for the
+                # decoded lines below.
+                if (not raw_line.isascii()
+                        and utils.safe_decode(raw_line) is None):
+                    continue
+                try:
+                    line_number = int(raw_line[:pipe_idx])
+                except ValueError:
+                    continue
+                hit_end = raw_line.find(b'|', pipe_idx + 1)
+                if hit_end == -1:
+                    hit_end = len(raw_line)
+                # Write out numbers e.g. 1.2k into 1200 and 5.99M to 5990000
+                try:
+                    hit_times = _extract_hitcount_bytes(raw_line[pipe_idx +
+                                                                 1:hit_end])
+                    if hit_times == -1:
+                        continue
+                except Exception:
+                    # Avoid overcounting the code lines by skipping comments
+                    # and empty lines.
+                    if b' 0| ' in raw_line:
+                        hit_times = 0
+                    else:
+                        continue
+                curr_lines.append(line_number, hit_times)
+                continue
+
+            line = utils.safe_decode(raw_line)
+            if line is None:
+                continue
+
+            # Special treatment for switch statement coverage:
+            # The line for switch MAY get one Branch entry; We use it for collecting
+            # overall hitcout of statement.
+            # Each `case` gets its own Branch entry for coverage. The important part
+            # is true_hit because that means if a `case` is taken or not.
+            if curr_func and COVERAGE_SWITCH_REGEX.match(line):
+                line_segs = line.split("|")
+                try:
+                    switch_line_number = int(line_segs[0])
+                except Exception:
+                    continue
+
+                try:
+                    # Calculate the column of the switch keyword.
+                    column_number = line_segs[2].find('switch') + 1
+                except Exception:
+                    continue
+                case_line_numbers = set()  # To keep track of switch cases.
+                # This string may be updated if there is Branch pattern for this line.
+                switch_string = f'{curr_func}:{switch_line_number},{column_number}'
+                logger.debug(f'Seen switch in coverage: {switch_string}')
+
+            # This parses Branch cov info in the form of:
+            #  |  Branch (81:7): [True: 1.2k, False: 0]
+            if curr_func and COVERAGE_BRANCH_REGEX.match(line):
+                try:
+                    line_number = int(line.split('(')[1].split(':')[0])
+                except Exception:
+                    continue
+                try:
+                    column_number = int(line.split(':')[1].split(')')[0])
+                except Exception:
+                    continue
+
+                try:
+                    true_hit = extract_hitcount(
+                        line.split('True:')[1].split(',')[0])
+                    if true_hit == -1:
+                        continue
+                except Exception:
+                    continue
+                try:
+                    false_hit = extract_hitcount(
+                        line.split('False:')[1].replace("]", ""))
+                    if false_hit == -1:
+                        continue
+                except Exception:
+                    continue
+
+                if switch_line_number and line_number == switch_line_number:
+                    # This Branch pattern belongs to switch line.
+                    # Note that the column number is inacurrate as it belongs to
+                    # the variable inside pranthesis. Should not use it for switch_string.
+                    branch_cov_map[switch_string] = [true_hit, false_hit]
+                elif line_number in case_line_numbers:
+                    # This Branch pattern belongs to a `case`.
+                    try:
+                        # This collects for `case` taken side.
+                        branch_cov_map[switch_string].append(true_hit)
+                    except Exception:
+                        # Taking care of anomalies where the coverage report has no
+                        # Branch pattern for switch line.
+                        logger.debug(
+                            f'The switch had no Branch pattern {switch_string}'
+                        )
+                        branch_cov_map[switch_string] = [
+                            true_hit, false_hit, true_hit
+                        ]
+                else:
+                    # This Branch pattern belongs to a conditional branch.
+                    branch_string = f'{curr_func}:{line_number},{column_number}'
+                    branch_cov_map[branch_string] = [true_hit, false_hit]
+                continue
+
+            # Extract source code line number
+            try:
+                line_number = int(line.split("|")[0])
+            except Exception:
+                continue
+
+            if COVERAGE_CASE_REGEX.match(line):
+                if switch_string:
+                    case_line_numbers.add(line_number)
+                else:
+                    logger.info('found case outside a switch?! \n%s', line)
+
+            # Extract hit count
+            try:
+                hit_times = extract_hitcount(line.split("|")[1])
+                if hit_times == -1:
+                    continue
+            except Exception:
+                # Avoid overcounting the code lines by skipping comments and empty lines.
+                if " 0| " in line:
+                    hit_times = 0
+                else:
+                    continue
+            curr_lines.append(line_number, hit_times)
+    return covmap, branch_cov_map
+
+
+def _get_report_stamp(profile_file: str) -> Tuple[int, int]:
+    """Returns size and modification time of a coverage report, used to
+    detect stale entries in the report cache."""
+    stat = os.stat(profile_file)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _parse_llvm_coverage_report_with_stamp(
+    cache_key: Tuple[str, bool]
+) -> Tuple[Tuple[str, bool], Tuple[int, int], LlvmReportCoverage]:
+    """Internal function used for multiprocess report parsing"""
+    profile_file, is_rust = cache_key
+    return (cache_key, _get_report_stamp(profile_file),
+            parse_llvm_coverage_report(profile_file, is_rust))
+
+
+def get_llvm_coverage_report(profile_file: str,
+                             is_rust: bool = False) -> LlvmReportCoverage:
+    """Returns the parsed coverage of a single report, parsing the report
+    only if it is not in the report cache."""
+    cache_key = (profile_file, is_rust)
+    stamp = _get_report_stamp(profile_file)
+    cached = _LLVM_REPORT_CACHE.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    logger.info(f"Reading coverage report: {profile_file}")
+    report_coverage = parse_llvm_coverage_report(profile_file, is_rust)
+    _LLVM_REPORT_CACHE[cache_key] = (stamp, report_coverage)
+    return report_coverage
+
+
+def preload_llvm_coverage_reports(coverage_reports: List[str],
+                                  is_rust: bool = False,
+                                  jobs: int = 1) -> None:
+    """Parses the given coverage reports into the report cache, using a pool
+    of `jobs` worker processes. Processes forked afterwards, e.g. to
+    accummulate fuzzer profiles, reuse the parsed reports."""
+    cache_keys = []
+    for profile_file in coverage_reports:
+        cache_key = (profile_file, is_rust)
+        cached = _LLVM_REPORT_CACHE.get(cache_key)
+        if cached is None or cached[0] != _get_report_stamp(profile_file):
+            cache_keys.append(cache_key)
+    if not cache_keys:
+        return
+
+    jobs = max(1, min(jobs, len(cache_keys)))
+    logger.info("Parsing %d coverage reports using %d workers",
+                len(cache_keys), jobs)
+    if jobs > 1:
+        with multiprocessing.Pool(jobs) as pool:
+            results = pool.imap_unordered(
+                _parse_llvm_coverage_report_with_stamp, cache_keys)
+            for cache_key, stamp, report_coverage in results:
+                _LLVM_REPORT_CACHE[cache_key] = (stamp, report_coverage)
+    else:
+        for cache_key in cache_keys:
+            _LLVM_REPORT_CACHE[cache_key] = (
+                _parse_llvm_coverage_report_with_stamp(cache_key)[1:])
+
+
+def clear_llvm_coverage_cache() -> None:
+    """Drops all parsed reports from the report cache."""
+    _LLVM_REPORT_CACHE.clear()
+
+
+def get_llvm_coverage_reports(target_dir: str,
+                              target_name: Optional[str] = None) -> List[str]:
+    """Returns the coverage reports in `target_dir` to use for `target_name`.
+    This is the report of the target if there is one, and all reports
+    otherwise."""
+    all_coverage_reports = utils.get_all_files_in_tree_with_regex(
+        target_dir, ".*\.covreport$")
+    logger.info(f"Found {len(all_coverage_reports)} coverage reports")
+
+    coverage_reports = list()
+
+    # Only use coverage report for the target if there is one.
+    if target_name is not None:
+        for cov_report in all_coverage_reports:
+            cov_report_base = os.path.basename(cov_report)
+            if cov_report_base == target_name + ".covreport":
+                coverage_reports.append(cov_report)
+
+    # If we found no target coverage report then use all reports.
+    if len(coverage_reports) == 0:
+        coverage_reports = all_coverage_reports
+    return coverage_reports
+
+
 def load_llvm_coverage(target_dir: str,
                        target_name: Optional[str] = None,
                        is_rust: bool = False) -> CoverageProfile:
@@ -453,6 +925,9 @@ def load_llvm_coverage(target_dir: str,
     target specific coverage profiles. However, if no coverage profile matches
     that given name then the function will find *all* coverage reports it can and
     use all of them.
+
+    Each report is parsed once and kept in a report cache, from which it is
+    shared with other profiles using the same report.
     """
 
     if target_name is not None:
@@ -460,171 +935,17 @@ def load_llvm_coverage(target_dir: str,
     else:
         logger.info(f"Loading LLVM coverage for directory {target_dir}")
 
-    all_coverage_reports = utils.get_all_files_in_tree_with_regex(
-        target_dir, ".*\.covreport$")
-    logger.info(f"Found {len(all_coverage_reports)} coverage reports")
-
-    coverage_reports = list()
-
-    # Only use coverage report for the target if there is one.
-    if target_name is not None:
-        for cov_report in all_coverage_reports:
-            cov_report_base = os.path.basename(cov_report)
-            if cov_report_base == target_name + ".covreport":
-                coverage_reports.append(cov_report)
-
-    # If we found no target coverage report then use all reports.
-    if len(coverage_reports) == 0:
-        coverage_reports = all_coverage_reports
+    coverage_reports = get_llvm_coverage_reports(target_dir, target_name)
 
     cp = CoverageProfile()
     logger.info(f"Using the following coverages {coverage_reports}")
     cp.set_type("function")
     for profile_file in coverage_reports:
         cp.coverage_files.append(profile_file)
-        logger.info(f"Reading coverage report: {profile_file}")
-        with open(profile_file, 'rb') as pf:
-            curr_func = None
-            switch_string = str()
-            switch_line_number = None
-            case_line_numbers: Set[int] = set()
-            for raw_line in pf:
-                line = utils.safe_decode(raw_line)
-                if line is None:
-                    continue
-
-                line = line.replace("\n", "")
-                logger.debug(f"cov-readline: { line }")
-
-                # Parse lines that signal function names. These linse indicate that the
-                # lines following this line will be the specific source code lines of
-                # the given function.
-                # Example line:
-                #  "LLVMFuzzerTestOneInput:\n"
-                if len(line) > 0 and line[-1] == ":" and "|" not in line:
-                    if len(line.split(":")) == 3:
-                        curr_func = line.split(":")[1].replace(" ",
-                                                               "").replace(
-                                                                   ":", "")
-                    else:
-                        curr_func = line.replace(" ", "").replace(":", "")
-                    if is_rust:
-                        curr_func = utils.demangle_rust_func(curr_func)
-                    else:
-                        curr_func = utils.demangle_cpp_func(curr_func)
-                    cp.covmap[curr_func] = list()
-                    switch_string = ''
-                    switch_line_number = None
-                # Special treatment for switch statement coverage:
-                # The line for switch MAY get one Branch entry; We use it for collecting
-                # overall hitcout of statement.
-                # Each `case` gets its own Branch entry for coverage. The important part
-                # is true_hit because that means if a `case` is taken or not.
-                if curr_func and COVERAGE_SWITCH_REGEX.match(line):
-                    line_segs = line.split("|")
-                    try:
-                        switch_line_number = int(line_segs[0])
-                    except Exception:
-                        continue
-
-                    try:
-                        # Calculate the column of the switch keyword.
-                        column_number = line_segs[2].find('switch') + 1
-                    except Exception:
-                        continue
-                    case_line_numbers = set()  # To keep track of switch cases.
-                    # This string may be updated if there is Branch pattern for this line.
-                    switch_string = f'{curr_func}:{switch_line_number},{column_number}'
-                    logger.debug(f'Seen switch in coverage: {switch_string}')
-
-                # This parses Branch cov info in the form of:
-                #  |  Branch (81:7): [True: 1.2k, False: 0]
-                if curr_func and COVERAGE_BRANCH_REGEX.match(line):
-                    try:
-                        line_number = int(line.split('(')[1].split(':')[0])
-                    except Exception:
-                        continue
-                    try:
-                        column_number = int(line.split(':')[1].split(')')[0])
-                    except Exception:
-                        continue
-
-                    try:
-                        true_hit = extract_hitcount(
-                            line.split('True:')[1].split(',')[0])
-                        if true_hit == -1:
-                            continue
-                    except Exception:
-                        continue
-                    try:
-                        false_hit = extract_hitcount(
-                            line.split('False:')[1].replace("]", ""))
-                        if false_hit == -1:
-                            continue
-                    except Exception:
-                        continue
-
-                    if switch_line_number and line_number == switch_line_number:
-                        # This Branch pattern belongs to switch line.
-                        # Note that the column number is inacurrate as it belongs to
-                        # the variable inside pranthesis. Should not use it for switch_string.
-                        cp.branch_cov_map[switch_string] = [
-                            true_hit, false_hit
-                        ]
-                    elif line_number in case_line_numbers:
-                        # This Branch pattern belongs to a `case`.
-                        try:
-                            # This collects for `case` taken side.
-                            cp.branch_cov_map[switch_string].append(true_hit)
-                        except Exception:
-                            # Taking care of anomalies where the coverage report has no
-                            # Branch pattern for switch line.
-                            logger.debug(
-                                f'The switch had no Branch pattern {switch_string}'
-                            )
-                            cp.branch_cov_map[switch_string] = [
-                                true_hit, false_hit, true_hit
-                            ]
-                    else:
-                        # This Branch pattern belongs to a conditional branch.
-                        branch_string = f'{curr_func}:{line_number},{column_number}'
-                        cp.branch_cov_map[branch_string] = [
-                            true_hit, false_hit
-                        ]
-                # Parse lines that signal specific line of code. These lines only
-                # offer after the function names parsed above.
-                # Example line:
-                #  "   83|  5.99M|    char *kldfj = (char*)malloc(123);\n"
-                elif curr_func is not None and "|" in line:
-                    # Extract source code line number
-                    try:
-                        line_number = int(line.split("|")[0])
-                    except Exception:
-                        continue
-
-                    if COVERAGE_CASE_REGEX.match(line):
-                        if switch_string:
-                            case_line_numbers.add(line_number)
-                        else:
-                            logger.info('found case outside a switch?! \n%s',
-                                        line)
-
-                    # Extract hit count
-                    # Write out numbers e.g. 1.2k into 1200 and 5.99M to 5990000
-                    try:
-                        hit_times = extract_hitcount(line.split("|")[1])
-                        if hit_times == -1:
-                            continue
-                    except Exception:
-                        # Avoid overcounting the code lines by skipping comments and empty lines.
-                        if " 0| " in line:
-                            hit_times = 0
-                        else:
-                            continue
-                    # Add source code line and hitcount to coverage map of current function
-                    logger.debug(f"reading coverage: {curr_func} "
-                                 f"-- {line_number} -- {hit_times}")
-                    cp.covmap[curr_func].append((line_number, hit_times))
+        covmap, branch_cov_map = get_llvm_coverage_report(
+            profile_file, is_rust)
+        cp.covmap.update(covmap)
+        cp.branch_cov_map.update(branch_cov_map)
     return cp
 
 
@@ -748,12 +1069,12 @@ def load_go_coverage(target_dir: str,
         # Only process when we have correct start and end line number
         # for the function
         if start_line > 0 and end_line > 0:
-            cp.covmap[name] = []
+            cp.covmap[name] = LineCoverage()
             for file, coverage in line_coverage.items():
                 if file.endswith(source_file):
                     for line_no in range(start_line, end_line + 1):
-                        cp.covmap[name].append(
-                            (line_no, coverage.get(line_no, 0)))
+                        cp.covmap[name].append(line_no,
+                                               coverage.get(line_no, 0))
 
     return cp
 
@@ -859,11 +1180,9 @@ def load_jvm_coverage(target_dir: str,
                 end_item = min(start_item + total_line, len(line_list))
 
                 # Store lines, hit_time into the covmap under the target method
-                cp.covmap[name] = []
+                cp.covmap[name] = LineCoverage(line_list[start_item:end_item])
                 # Add source code line and hitcount to coverage map of current function
                 logger.debug(f"reading coverage: {name} -- {line_list}")
-                for count in range(start_item, end_item):
-                    cp.covmap[name].append(line_list[count])
 
     return cp
 
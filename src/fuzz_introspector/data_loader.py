@@ -15,22 +15,130 @@
 
 import os
 import json
+import functools
+import hashlib
 import logging
 import multiprocessing
+import pickle
+import tempfile
 
 from typing import (
-    Any,
-    Dict,
     List,
     Optional,
 )
 
 from fuzz_introspector import constants
 from fuzz_introspector import utils
-from fuzz_introspector.datatypes import (fuzzer_profile, bug)
+from fuzz_introspector.datatypes import (function_profile, fuzzer_profile, bug)
+from fuzz_introspector.exceptions import CalltreeError
 
 logger = logging.getLogger(name=__name__)
 
+# Files read when loading coverage of a profile. Used to identify whether a
+# cached accummulated profile is still valid.
+COVERAGE_FILES_REGEX = r".*\.covreport$|.*all_cov\.json$|fuzz\.cov|jacoco\.xml"
+
+
+def _get_data_yaml_file(cfg_file: str) -> Optional[str]:
+    """Returns the yaml file holding the frontend data of a .data file"""
+    target_data_f = cfg_file
+    if cfg_file.endswith('.txt'):
+        target_data_f = '/'.join(cfg_file.split('/')[:-1]) + '/report'
+
+    if os.path.isfile(target_data_f + ".yaml"):
+        return target_data_f + ".yaml"
+    if os.path.isfile('report.yaml'):
+        return 'report.yaml'
+    return None
+
+
+def get_profile_cache_key(data_file: str, language: str) -> str:
+    """Returns a key identifying the path and content of a fuzzer data file
+    and its yaml file, as well as the version of Fuzz Introspector, which is
+    used to look up the parsed profile in a cache directory. The path is
+    part of the key as the profile refers to the data file by its path."""
+    hasher = hashlib.sha256()
+    hasher.update(f'{utils.get_tool_version()}:{language}:'
+                  f'{os.path.abspath(data_file)}'.encode())
+    for filename in (data_file, _get_data_yaml_file(data_file)):
+        hasher.update(b'\0')
+        if filename is None or not os.path.isfile(filename):
+            continue
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def get_accummulated_cache_key(
+        profile: fuzzer_profile.FuzzerProfile, target_folder: str,
+        profiles: List[fuzzer_profile.FuzzerProfile]) -> Optional[str]:
+    """Returns a key identifying the accummulated state of a profile loaded
+    using the cache, or None if the profile, or any of the other `profiles`
+    of the project, was not loaded using the cache.
+
+    The functions reached are propagated on the functions of all profiles of
+    the project, so the key covers the cache keys of all `profiles`.
+    Accummulation depends on the coverage reports in the target folder as
+    well. These can be very large, so they are identified by their path, size
+    and modification time rather than their content.
+    """
+    if profile.cache_key is None or any(other.cache_key is None
+                                        for other in profiles):
+        return None
+    profile_cache_keys = [str(other.cache_key) for other in profiles]
+
+    hasher = hashlib.sha256()
+    hasher.update(f'{profile.cache_key}:{profile.binary_executable}'.encode())
+    for profile_cache_key in sorted(profile_cache_keys):
+        hasher.update(f':{profile_cache_key}'.encode())
+    for env_var in ('FI_KERNEL_COV', 'FI_ENTRYPOINT'):
+        hasher.update(f':{os.environ.get(env_var, "")}'.encode())
+    for cov_file in sorted(
+            utils.get_all_files_in_tree_with_regex(target_folder,
+                                                   COVERAGE_FILES_REGEX)):
+        stat = os.stat(cov_file)
+        cov_path = os.path.relpath(cov_file, target_folder)
+        hasher.update(
+            f':{cov_path}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return f'accummulated-{hasher.hexdigest()}'
+
+
+def load_cached_profile(
+        cache_dir: str,
+        cache_key: str) -> Optional[fuzzer_profile.FuzzerProfile]:
+    """Loads a profile snapshot from the cache directory, if it exists."""
+    cache_file = os.path.join(cache_dir, f'{cache_key}.pickle')
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        with open(cache_file, 'rb') as f:
+            profile = pickle.load(f)
+    except Exception as e:
+        logger.info('Failed to load cached profile %s: %s', cache_file, e)
+        return None
+    if not isinstance(profile, fuzzer_profile.FuzzerProfile):
+        return None
+    logger.info(' - loaded %s from cache', cache_key)
+    return profile
+
+
+def save_cached_profile(cache_dir: str, cache_key: str,
+                        profile: fuzzer_profile.FuzzerProfile) -> None:
+    """Stores a profile snapshot in the cache directory. The snapshot is
+    written to a temporary file first, so concurrent readers never see a
+    partially written snapshot."""
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(profile, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, os.path.join(cache_dir, f'{cache_key}.pickle'))
+    except Exception as e:
+        logger.info('Failed to cache profile %s: %s', cache_key, e)
+        if os.path.isfile(tmp_file):
+            os.remove(tmp_file)
+
 
 def read_fuzzer_data_file_to_profile(
         cfg_file: str,
@@ -64,18 +172,17 @@ def read_fuzzer_data_file_to_profile(
             logger.info('Found no module yaml files')
             return None
 
+    # Stream the calltree from the file rather than reading it whole.
     try:
         with open(cfg_file, 'r') as f:
-            cfg_content = f.read()
-    except UnicodeDecodeError:
+            profile = fuzzer_profile.FuzzerProfile(cfg_file,
+                                                   data_dict_yaml,
+                                                   language,
+                                                   cfg_content=f)
+    except CalltreeError:
         logger.info('CFG file not valid.')
         return None
 
-    profile = fuzzer_profile.FuzzerProfile(cfg_file,
-                                           data_dict_yaml,
-                                           language,
-                                           cfg_content=cfg_content)
-
     if not profile.has_entry_point():
         logger.info("Found no entrypoints")
 
@@ -83,18 +190,33 @@ def read_fuzzer_data_file_to_profile(
     return profile
 
 
-def _load_profile(data_file: str, language: str, manager, semaphore=None):
-    """Internal function used for multithreaded profile loading"""
-    if semaphore is not None:
-        semaphore.acquire()
-
-    profile = read_fuzzer_data_file_to_profile(data_file, language)
-    if profile is not None:
-        manager[data_file] = profile
+def _load_profile(data_file: str,
+                  language: str,
+                  cache_dir: Optional[str] = None
+                  ) -> Optional[fuzzer_profile.FuzzerProfile]:
+    """Internal function used for multiprocess profile loading"""
+    profile = None
+    if cache_dir:
+        cache_key = get_profile_cache_key(data_file, language)
+        profile = load_cached_profile(cache_dir, cache_key)
+        if profile is None:
+            profile = read_fuzzer_data_file_to_profile(data_file, language)
+            if profile is not None:
+                profile.cache_key = cache_key
+                save_cached_profile(cache_dir, cache_key, profile)
     else:
+        profile = read_fuzzer_data_file_to_profile(data_file, language)
+
+    if profile is None:
         logger.error('profile is none')
-    if semaphore is not None:
-        semaphore.release()
+    return profile
+
+
+def get_pool_chunksize(task_count: int, jobs: int) -> int:
+    """Returns the number of tasks to submit to a pool worker at once. Tasks
+    are split in a few chunks per worker, to balance the load while limiting
+    the overhead of submitting tasks."""
+    return max(1, task_count // (jobs * 4))
 
 
 def load_all_debug_files(target_folder: str):
@@ -125,19 +247,32 @@ def find_all_debug_function_files(target_folder: str):
 
 
 def load_all_profiles(
-        target_folder: str,
-        language: str,
-        parallelise: bool = True) -> List[fuzzer_profile.FuzzerProfile]:
-    """Loads all profiles in target_folder in a multi-threaded manner"""
+    target_folder: str,
+    language: str,
+    parallelise: bool = True,
+    cache_dir: Optional[str] = None,
+    jobs: Optional[int] = None,
+    function_store: Optional[function_profile.FunctionProfileStore] = None
+) -> List[fuzzer_profile.FuzzerProfile]:
+    """Loads all profiles in target_folder using a pool of `jobs` worker
+    processes. Profiles are returned by the workers directly.
+
+    If `cache_dir` is set, parsed profiles are stored in and reused from the
+    cache directory, keyed by the content of their data files.
+
+    If `function_store` is set, the functions of each profile are interned in
+    the store as soon as the profile is loaded, so only a single copy of the
+    module functions is kept rather than one per loaded profile.
+    """
     logger.info('Loading profiles from %s', target_folder)
-    if language == "jvm":
-        # Java targets tend to be quite large, so we try to avoid memory
-        # exhaustion here.
-        semaphore_count = 3
-    else:
-        semaphore_count = 6
+    if jobs is None:
+        if language == "jvm":
+            # Java targets tend to be quite large, so we try to avoid memory
+            # exhaustion here.
+            jobs = 3
+        else:
+            jobs = 6
 
-    profiles = []
     data_files = utils.get_all_files_in_tree_with_regex(
         target_folder, "fuzzerLogFile.*\.data$")
     data_files.extend(
@@ -149,28 +284,29 @@ def load_all_profiles(
     data_files.extend(target_calltrees)
 
     logger.info(" - found %d profiles to load", len(data_files))
-    if parallelise:
-        manager = multiprocessing.Manager()
-        semaphore = multiprocessing.Semaphore(semaphore_count)
-        return_dict = manager.dict()
-        jobs = []
-        for data_file in data_files:
-            p = multiprocessing.Process(target=_load_profile,
-                                        args=(data_file, language, return_dict,
-                                              semaphore))
-            jobs.append(p)
-            p.start()
-        for proc in jobs:
-            proc.join()
-
-        for v in return_dict.values():
-            profiles.append(v)
+    load_func = functools.partial(_load_profile,
+                                  language=language,
+                                  cache_dir=cache_dir)
+    jobs = max(1, min(jobs, len(data_files)))
+    profiles = []
+
+    def _add_profile(profile: Optional[fuzzer_profile.FuzzerProfile]) -> None:
+        if profile is None:
+            return
+        if function_store is not None:
+            profile.intern_functions(function_store)
+        profiles.append(profile)
+
+    if parallelise and jobs > 1:
+        logger.info(" - loading profiles using %d workers", jobs)
+        with multiprocessing.Pool(jobs) as pool:
+            for profile in pool.imap(load_func, data_files,
+                                     get_pool_chunksize(len(data_files),
+                                                        jobs)):
+                _add_profile(profile)
     else:
-        return_dict_gen: Dict[Any, Any] = dict()
         for data_file in data_files:
-            _load_profile(data_file, language, return_dict_gen, None)
-        for v in return_dict_gen.values():
-            profiles.append(v)
+            _add_profile(load_func(data_file))
 
     return profiles
 
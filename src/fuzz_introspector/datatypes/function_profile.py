@@ -18,7 +18,12 @@ import logging
 from typing import (
     Any,
     Dict,
+    Iterable,
+    Iterator,
     List,
+    Optional,
+    Set,
+    Tuple,
 )
 
 from fuzz_introspector.datatypes import branch_profile
@@ -212,3 +217,201 @@ class FunctionProfile:
             return elem['JavaMethodInfo']['exceptions']
 
         return []
+
+
+class FunctionBitset:
+    """
+    Compact set of functions, stored as a bitset over the dense function IDs
+    assigned by a :py:class:`FunctionProfileStore`.
+    """
+
+    def __init__(self, function_ids: Iterable[int] = ()) -> None:
+        self._bits = bytearray()
+        for func_id in function_ids:
+            self.add(func_id)
+
+    def add(self, func_id: int) -> None:
+        byte_idx = func_id >> 3
+        if byte_idx >= len(self._bits):
+            self._bits.extend(bytes(byte_idx + 1 - len(self._bits)))
+        self._bits[byte_idx] |= 1 << (func_id & 7)
+
+    def __contains__(self, func_id: int) -> bool:
+        byte_idx = func_id >> 3
+        if byte_idx >= len(self._bits):
+            return False
+        return bool(self._bits[byte_idx] >> (func_id & 7) & 1)
+
+    def __len__(self) -> int:
+        return int.from_bytes(self._bits, 'little').bit_count()
+
+    def __iter__(self) -> Iterator[int]:
+        """Yields the function IDs in the set in increasing order."""
+        for byte_idx, byte in enumerate(self._bits):
+            while byte:
+                low_bit = byte & -byte
+                yield (byte_idx << 3) + low_bit.bit_length() - 1
+                byte ^= low_bit
+
+    def __or__(self, other: 'FunctionBitset') -> 'FunctionBitset':
+        union = FunctionBitset()
+        union._bits = bytearray(
+            (int.from_bytes(self._bits, 'little')
+             | int.from_bytes(other._bits, 'little')).to_bytes(
+                 max(len(self._bits), len(other._bits)), 'little'))
+        return union
+
+
+class FunctionProfileStore:
+    """
+    Project-wide store of interned :py:class:`FunctionProfile` objects.
+
+    Each fuzzer data file holds the full list of functions in the module, so
+    without interning every fuzzer profile carries its own copy of every
+    function. The store keeps a single canonical FunctionProfile per function,
+    keyed by name and source file, which all fuzzer profiles then reference.
+
+    The store also assigns dense integer IDs to function names, which are
+    used to represent sets of functions as :py:class:`FunctionBitset`.
+    """
+
+    def __init__(self) -> None:
+        self._functions: Dict[Tuple[str, str], FunctionProfile] = dict()
+        self.function_ids: Dict[str, int] = dict()
+
+    def __len__(self) -> int:
+        return len(self._functions)
+
+    def intern(self, func_profile: FunctionProfile) -> FunctionProfile:
+        """Returns the canonical instance of `func_profile`, adding it to the
+        store if the function has not been seen before."""
+        key = (func_profile.function_name, func_profile.function_source_file)
+        return self._functions.setdefault(key, func_profile)
+
+    def intern_all(
+            self,
+            functions: Dict[str,
+                            FunctionProfile]) -> Dict[str, FunctionProfile]:
+        """Returns a copy of `functions` where each value is replaced by its
+        canonical instance."""
+        return {name: self.intern(fd) for name, fd in functions.items()}
+
+    def get_function_id(self, function_name: str) -> int:
+        """Returns the dense ID of `function_name`, assigning a new one if
+        the name has not been seen before."""
+        return self.function_ids.setdefault(function_name,
+                                            len(self.function_ids))
+
+    def to_bitset(self, function_names: Iterable[str]) -> FunctionBitset:
+        """Converts a collection of function names to a bitset."""
+        return FunctionBitset(
+            self.get_function_id(name) for name in function_names)
+
+
+def propagate_functions_reached(
+        all_functions: Dict[str, FunctionProfile],
+        propagated_functions: Optional[Dict[str,
+                                            FunctionProfile]] = None) -> None:
+    """Sets `functions_reached` of each function in `all_functions` to all
+    functions transitively reached from it, and `function_depth` to the length
+    of the longest call chain starting at the function.
+
+    The call graph is condensed into its strongly connected components, which
+    are emitted in reverse topological order. The functions reached are then
+    computed once per component from the already computed components it calls
+    into, rather than by a separate traversal from every function. Functions
+    of a component reach each other and share the same depth, where a cycle
+    counts as a single call.
+
+    Callees not in `all_functions` but in `propagated_functions` are
+    considered already propagated and are not traversed again.
+    """
+    if propagated_functions is None:
+        propagated_functions = dict()
+
+    names = list(all_functions)
+    index = {name: idx for idx, name in enumerate(names)}
+    callees = [[
+        index[callee] for callee in all_functions[name].functions_reached
+        if callee in index
+    ] for name in names]
+
+    # Iterative Tarjan to identify strongly connected components.
+    component_of = [-1] * len(names)
+    lowlink = [0] * len(names)
+    order = [-1] * len(names)
+    on_stack = [False] * len(names)
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+    for root in range(len(names)):
+        if order[root] != -1:
+            continue
+        order[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        worklist = [(root, iter(callees[root]))]
+        while worklist:
+            node, node_callees = worklist[-1]
+            for child in node_callees:
+                if order[child] == -1:
+                    order[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    worklist.append((child, iter(callees[child])))
+                    break
+                if on_stack[child]:
+                    lowlink[node] = min(lowlink[node], order[child])
+            else:
+                worklist.pop()
+                if worklist:
+                    parent = worklist[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component_of[member] = len(components)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    # Components are emitted after every component they call into, so each
+    # component can be resolved from the results of its callees.
+    component_depth: List[int] = []
+    for component_idx, component in enumerate(components):
+        reached: Set[str] = set()
+        depth = 0
+        is_cycle = False
+        for member in component:
+            for callee in all_functions[names[member]].functions_reached:
+                callee_idx = index.get(callee)
+                if callee_idx is None:
+                    reached.add(callee)
+                    propagated_fd = propagated_functions.get(callee)
+                    if propagated_fd is None:
+                        depth = max(depth, 1)
+                    else:
+                        reached.update(propagated_fd.functions_reached)
+                        depth = max(depth, propagated_fd.function_depth + 1)
+                elif component_of[callee_idx] == component_idx:
+                    is_cycle = True
+                    depth = max(depth, 1)
+                else:
+                    callee_fd = all_functions[callee]
+                    reached.add(callee)
+                    reached.update(callee_fd.functions_reached)
+                    depth = max(depth,
+                                component_depth[component_of[callee_idx]] + 1)
+        if is_cycle:
+            reached.update(names[member] for member in component)
+
+        component_depth.append(depth)
+        for member in component:
+            fd = all_functions[names[member]]
+            fd.functions_reached = list(reached)
+            fd.function_depth = depth
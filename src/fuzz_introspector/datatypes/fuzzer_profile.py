@@ -57,8 +57,21 @@ class FuzzerProfile:
         self._target_lang = target_lang
         self.introspector_data_file = cfg_file
 
+        # Key of the profile in the profile cache, if loaded using the cache.
+        self.cache_key: Optional[str] = None
+
         self.functions_reached_by_fuzzer: List[str] = []
         self.functions_reached_by_fuzzer_runtime: List[str] = []
+        self.functions_propagated = False
+
+        # Bitset representation of the reached functions. These are set by
+        # set_reachability_bitsets once the profile is fully accummulated.
+        self._function_ids: Optional[Dict[str, int]] = None
+        self.reached_bitset: Optional[function_profile.FunctionBitset] = None
+        self.reached_runtime_bitset: Optional[
+            function_profile.FunctionBitset] = None
+        self.reached_combined_bitset: Optional[
+            function_profile.FunctionBitset] = None
 
         # Load calltree file
         self.fuzzer_callsite_calltree = cfg_load.data_file_read_calltree(
@@ -260,6 +273,8 @@ class FuzzerProfile:
         :returns: `True` if the fuzzer statically reaches the function. `False`
                   otherwise.
         """
+        if self.reached_bitset is not None:
+            return self._bitset_has_func(self.reached_bitset, func_name)
         return func_name in self.functions_reached_by_fuzzer
 
     def reaches_func_runtime(self, func_name: str) -> bool:
@@ -272,6 +287,9 @@ class FuzzerProfile:
         :returns: `True` if the fuzzer reaches the function in runtime. `False`
                   otherwise.
         """
+        if self.reached_runtime_bitset is not None:
+            return self._bitset_has_func(self.reached_runtime_bitset,
+                                         func_name)
         return func_name in self.functions_reached_by_fuzzer_runtime
 
     def reaches_func_combined(self, func_name: str) -> bool:
@@ -285,9 +303,34 @@ class FuzzerProfile:
         :returns: `True` if the fuzzer reaches the function statically or in
                   runtime. `False` otherwise.
         """
-        return (func_name in self.functions_reached_by_fuzzer
+        if self.reached_combined_bitset is not None:
+            return self._bitset_has_func(self.reached_combined_bitset,
+                                         func_name)
+        return (self.reaches_func(func_name)
                 or self.reaches_func_runtime(func_name))
 
+    def set_reachability_bitsets(
+            self,
+            function_store: function_profile.FunctionProfileStore) -> None:
+        """Indexes the statically, dynamically and combined reached functions
+        of this fuzzer as bitsets over the function IDs of `function_store`.
+        After this, the reaches_func* queries are answered from the bitsets.
+        """
+        self._function_ids = function_store.function_ids
+        self.reached_bitset = function_store.to_bitset(
+            self.functions_reached_by_fuzzer)
+        self.reached_runtime_bitset = function_store.to_bitset(
+            self.functions_reached_by_fuzzer_runtime)
+        self.reached_combined_bitset = (self.reached_bitset
+                                        | self.reached_runtime_bitset)
+
+    def _bitset_has_func(self, bitset: function_profile.FunctionBitset,
+                         func_name: str) -> bool:
+        if self._function_ids is None:
+            return False
+        func_id = self._function_ids.get(func_name)
+        return func_id is not None and func_id in bitset
+
     def correlate_executable_name(self, correlation_dict) -> None:
         for elem in correlation_dict['pairings']:
             if os.path.basename(self.introspector_data_file
@@ -307,49 +350,28 @@ class FuzzerProfile:
 
     def _propagate_functions_reached(self) -> None:
         """Accummulates all functions reached by a given fuzzer. This is
-        achieved by iterating the outgoing edges of each function recursively
+        achieved by condensing the call graph of the fuzzer's functions, see
+        :py:func:`function_profile.propagate_functions_reached`. Skipped if
+        already done project-wide by :py:func:`propagate_functions_reached`.
         """
-        new_all_class_functions: Dict[
-            str, function_profile.FunctionProfile] = dict()
-
-        for func, func_profile in self.all_class_functions.items():
-            worklist = []
-            max_depth = 0
-            for func_reached in func_profile.functions_reached:
-                worklist.append((func_reached, 1))
-            visited = set()
-
-            while len(worklist) > 0:
-                elem, depth = worklist.pop()
-                max_depth = max(depth, max_depth)
-
-                if elem in visited:
-                    continue
-                visited.add(elem)
-
-                # Check if we have done this function already.
-                try:
-                    fd = new_all_class_functions[elem]
-                    visited.update(set(fd.functions_reached))
-                    tmp_depth = fd.function_depth + depth
-                    max_depth = max(max_depth, tmp_depth)
-                    continue
-                except KeyError:
-                    pass
-
-                # Otherwise traverse the functions reached.
-                try:
-                    for func_reached2 in self.all_class_functions[
-                            elem].functions_reached:
-                        worklist.append((func_reached2, depth + 1))
-                except KeyError:
-                    pass
-
-            # Save the work
-            new_all_class_functions[func] = func_profile
-            new_all_class_functions[func].functions_reached = list(visited)
-            new_all_class_functions[func].function_depth = max_depth
-        self.all_class_functions = new_all_class_functions
+        if self.functions_propagated:
+            return
+        function_profile.propagate_functions_reached(self.all_class_functions)
+        self.functions_propagated = True
+
+    def intern_functions(
+            self,
+            function_store: function_profile.FunctionProfileStore) -> None:
+        """Replaces the function profiles of this fuzzer with the canonical
+        instances in `function_store`, so functions are shared across all
+        fuzzers of the project rather than duplicated per fuzzer. The shared
+        function profiles must not be mutated in a fuzzer-specific manner.
+        """
+        self.all_class_functions = function_store.intern_all(
+            self.all_class_functions)
+        self.all_class_constructors = function_store.intern_all(
+            self.all_class_constructors)
+        self.dst_to_fd_cache = function_store.intern_all(self.dst_to_fd_cache)
 
     def _set_fd_cache(self):
         for _, fd in self.all_class_functions.items():
@@ -504,18 +526,20 @@ class FuzzerProfile:
         # Find C/CPP/Rust/Go entry point
         if self._target_lang == "c-cpp" or self.target_lang == "rust" or self.target_lang == "go":
             if self.entrypoint_function in self.all_class_functions:
-                self.functions_reached_by_fuzzer = (self.all_class_functions[
-                    self.entrypoint_function].functions_reached)
-                self.functions_reached_by_fuzzer.append(
-                    self.entrypoint_function)
+                # Copy the functions reached, as the function profile may be
+                # shared with other fuzzers.
+                self.functions_reached_by_fuzzer = list(
+                    self.all_class_functions[self.entrypoint_function].
+                    functions_reached) + [self.entrypoint_function]
                 return
 
         # Find Python entrypoint
         elif self._target_lang == "python":
             ep_key = f"{self.entrypoint_mod}.{self.entrypoint_fun}"
             reached = self.all_class_functions[ep_key].functions_reached
-            self.functions_reached_by_fuzzer = reached
-            self.functions_reached_by_fuzzer.append(self.entrypoint_function)
+            self.functions_reached_by_fuzzer = list(reached) + [
+                self.entrypoint_function
+            ]
             return
 
         # Find JVM entrypoint
@@ -526,9 +550,9 @@ class FuzzerProfile:
                     entrypoint = name
                     break
             if entrypoint:
-                self.functions_reached_by_fuzzer = (
-                    self.all_class_functions[entrypoint].functions_reached)
-                self.functions_reached_by_fuzzer.append(entrypoint)
+                reached = self.all_class_functions[
+                    entrypoint].functions_reached
+                self.functions_reached_by_fuzzer = list(reached) + [entrypoint]
                 return
 
     def _set_all_unreached_functions(self) -> None:
@@ -536,9 +560,10 @@ class FuzzerProfile:
         statically unreached. This is computed as the set difference between
         self.all_class_functions and self.functions_reached_by_fuzzer.
         """
+        functions_reached = set(self.functions_reached_by_fuzzer)
         self.functions_unreached_by_fuzzer = [
             f.function_name for f in self.all_class_functions.values()
-            if f.function_name not in self.functions_reached_by_fuzzer
+            if f.function_name not in functions_reached
         ]
 
     def _set_all_reached_functions_runtime(self) -> None:
@@ -663,3 +688,65 @@ class FuzzerProfile:
             if split_name[-1].isnumeric():
                 return True
         return False
+
+
+def propagate_functions_reached(
+    profiles: List[FuzzerProfile],
+    function_store: Optional[function_profile.FunctionProfileStore] = None
+) -> None:
+    """Accummulates the functions reached by each function once for all of
+    the given profiles, rather than once per profile.
+
+    The function profiles are interned across the profiles, in
+    `function_store` if given, and propagated on the project-wide call graph.
+    Functions shadowed by name in the project call graph, e.g. the entrypoint
+    of each fuzzer, are propagated per profile on top of the project-wide
+    results.
+    """
+    profiles = [
+        profile for profile in profiles if not profile.functions_propagated
+    ]
+    if function_store is None:
+        function_store = function_profile.FunctionProfileStore()
+    project_functions: Dict[str, function_profile.FunctionProfile] = dict()
+    for profile in profiles:
+        profile.intern_functions(function_store)
+        for name, fd in profile.all_class_functions.items():
+            project_functions.setdefault(name, fd)
+
+    function_profile.propagate_functions_reached(project_functions)
+
+    for profile in profiles:
+        shadowed_functions = {
+            name: fd
+            for name, fd in profile.all_class_functions.items()
+            if project_functions[name] is not fd
+        }
+        if shadowed_functions:
+            function_profile.propagate_functions_reached(
+                shadowed_functions, project_functions)
+        profile.functions_propagated = True
+
+
+def preload_coverage(profiles: List[FuzzerProfile],
+                     target_folder: str,
+                     jobs: int = 1) -> None:
+    """Parses the LLVM coverage reports used by the given profiles once,
+    ahead of accummulating the profiles. Reports shared by several profiles,
+    e.g. when no profile has a report of its own, are then only parsed once
+    rather than once per profile."""
+    coverage_reports: Dict[bool, Set[str]] = dict()
+    for profile in profiles:
+        if profile.target_lang == "c-cpp" and not os.getenv('FI_KERNEL_COV'):
+            is_rust = False
+        elif profile.target_lang == "rust":
+            is_rust = True
+        else:
+            continue
+        coverage_reports.setdefault(is_rust, set()).update(
+            code_coverage.get_llvm_coverage_reports(target_folder,
+                                                    profile.identifier))
+
+    for is_rust, reports in coverage_reports.items():
+        code_coverage.preload_llvm_coverage_reports(sorted(reports), is_rust,
+                                                    jobs)
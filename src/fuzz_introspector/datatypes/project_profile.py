@@ -16,9 +16,13 @@
 import os
 import logging
 
+from collections import defaultdict
+
 from typing import (
     Dict,
     List,
+    Optional,
+    Set,
     Tuple,
 )
 
@@ -37,8 +41,11 @@ class MergedProjectProfile:
     digesting data from all the fuzzers in the project.
     """
 
-    def __init__(self, profiles: List[fuzzer_profile.FuzzerProfile],
-                 language: str):
+    def __init__(self,
+                 profiles: List[fuzzer_profile.FuzzerProfile],
+                 language: str,
+                 function_store: Optional[
+                     function_profile.FunctionProfileStore] = None):
         self.name = None
         self.profiles = profiles
         self.all_functions: Dict[str,
@@ -51,6 +58,9 @@ class MergedProjectProfile:
         self.dst_to_fd_cache: Dict[str,
                                    function_profile.FunctionProfile] = dict()
         self.language = language
+        if function_store is None:
+            function_store = function_profile.FunctionProfileStore()
+        self.function_store = function_store
 
         logger.info(
             f"Creating merged profile of {len(self.profiles)} profiles")
@@ -67,10 +77,27 @@ class MergedProjectProfile:
                 if func_name not in self.functions_reached:
                     self.unreached_functions.add(func_name)
 
+        # Index the reachability of each fuzzer as bitsets, and collect for
+        # each function ID the fuzzers reaching it by walking the set bits of
+        # each fuzzer once.
+        logger.info("Indexing reachability of each fuzzer")
+        reached_by: Dict[int, Set[str]] = defaultdict(set)
+        reached_by_runtime: Dict[int, Set[str]] = defaultdict(set)
+        reached_by_combined: Dict[int, Set[str]] = defaultdict(set)
+        for profile in profiles:
+            profile.set_reachability_bitsets(self.function_store)
+            for func_id in profile.reached_bitset or ():
+                reached_by[func_id].add(profile.identifier)
+            for func_id in profile.reached_runtime_bitset or ():
+                reached_by_runtime[func_id].add(profile.identifier)
+            for func_id in profile.reached_combined_bitset or ():
+                reached_by_combined[func_id].add(profile.identifier)
+
         # Add all functions from the various profiles into the merged profile. Don't
         # add duplicates
         logger.info("Creating all_functions dictionary")
         excluded_functions = {"sanitizer", "llvm", "LLVMFuzzerTestOneInput"}
+        handled_functions: Set[int] = set()
         for profile in profiles:
             # Handles jvm constructors
             for fd in profile.all_class_constructors.values():
@@ -84,32 +111,23 @@ class MergedProjectProfile:
                        for to_exclude in excluded_functions):
                     continue
 
-                # populate hitcount and reached_by_fuzzers and whether it has been handled already
-                # Also populate the reached_by_fuzzers_runtime and reached_by_fuzzers_combined
-                for profile2 in profiles:
-                    # Statically reached functions
-                    if profile2.reaches_func(fd.function_name):
-                        fd.reached_by_fuzzers.append(profile2.identifier)
-
-                    # Dynamically reached functions
-                    if profile2.reaches_func_runtime(fd.function_name):
-                        fd.reached_by_fuzzers_runtime.append(
-                            profile2.identifier)
-
-                    # Statically or dynamically reached functions
-                    if profile2.reaches_func_combined(fd.function_name):
-                        fd.reached_by_fuzzers_combined.append(
-                            profile2.identifier)
+                # Function profiles may be shared amongst fuzzers, in which
+                # case each of them only needs to be digested once.
+                if id(fd) in handled_functions:
+                    continue
+                handled_functions.add(id(fd))
 
-                    if fd.function_name not in self.all_functions:
-                        self.all_functions[fd.function_name] = fd
+                if fd.function_name not in self.all_functions:
+                    self.all_functions[fd.function_name] = fd
 
-                # Deduplicate the reached_by_fuzzer* list
-                fd.reached_by_fuzzers = list(set(fd.reached_by_fuzzers))
+                # populate hitcount and reached_by_fuzzers, as well as
+                # reached_by_fuzzers_runtime and reached_by_fuzzers_combined
+                func_id = self.function_store.get_function_id(fd.function_name)
+                fd.reached_by_fuzzers = list(reached_by.get(func_id, ()))
                 fd.reached_by_fuzzers_runtime = list(
-                    set(fd.reached_by_fuzzers_runtime))
+                    reached_by_runtime.get(func_id, ()))
                 fd.reached_by_fuzzers_combined = list(
-                    set(fd.reached_by_fuzzers_combined))
+                    reached_by_combined.get(func_id, ()))
 
                 # Refine hitcount
                 fd.hitcount = len(fd.reached_by_fuzzers)
@@ -164,38 +182,16 @@ class MergedProjectProfile:
         for profile in profiles:
             if profile.coverage is None:
                 continue
-            for func_name in profile.coverage.covmap:
+            for func_name, line_coverage in profile.coverage.covmap.items():
                 if func_name not in self.runtime_coverage.covmap:
-                    self.runtime_coverage.covmap[
-                        func_name] = profile.coverage.covmap[func_name]
+                    self.runtime_coverage.covmap[func_name] = line_coverage
                 else:
                     # Merge by picking highest line numbers. Here we can assume they coverage
                     # maps have the same number of elements with the same line numbers but
                     # different hit counts.
-                    new_line_counts = list()
-                    for idx1 in range(
-                            len(self.runtime_coverage.covmap[func_name])):
-                        try:
-                            ln1, ht1 = self.runtime_coverage.covmap[func_name][
-                                idx1]
-                            ln2, ht2 = profile.coverage.covmap[func_name][idx1]
-                        except Exception:
-                            ln1, ht1 = self.runtime_coverage.covmap[func_name][
-                                idx1]
-                            ln2, ht2 = self.runtime_coverage.covmap[func_name][
-                                idx1]
-                        # It may be that line numbers are not the same for the same function
-                        # name across different fuzzers.
-                        # This *could* actually happen, and will often (almost always) happen for
-                        # LLVMFuzzerTestOneInput. In this case we just gracefully
-                        # continue and ignore issues.
-                        if ln1 != ln2:
-                            logger.info(
-                                f"Line numbers are different in the same function: "
-                                f"{func_name}:{ln1}:{ln2}, ignoring")
-                            continue
-                        new_line_counts.append((ln1, max(ht1, ht2)))
-                    self.runtime_coverage.covmap[func_name] = new_line_counts
+                    self.runtime_coverage.covmap[func_name] = (
+                        self.runtime_coverage.covmap[func_name].merge_max(
+                            line_coverage, func_name))
             # TODO (navidem): will need to merge branch coverages (branch_cov_map) if we need to
             # identify blockers based on all fuzz targets coverage
         self._set_basefolder()
@@ -17,23 +17,35 @@
 
 # pylint: disable=unnecessary-pass, unused-argument
 
-from typing import Any, Optional, Generic, TypeVar
+from typing import Any, Callable, Iterator, Optional, Generic, TypeVar
 
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Node, Parser
 import tree_sitter_cpp
 import tree_sitter_go
 import tree_sitter_java
 import tree_sitter_rust
 
 import copy
+import functools
+import hashlib
 import json
 import logging
+import multiprocessing
+import os
+import pickle
+import tempfile
 import yaml
 
+from fuzz_introspector import utils
+
 logger = logging.getLogger(name=__name__)
 
 T = TypeVar('T', bound='SourceCodeFile')
 
+# Parsers are cached per process and language, as they can be reused for
+# any number of files.
+_PARSERS: dict[str, Parser] = {}
+
 
 class SourceCodeFile():
     """Class for holding file-specific information."""
@@ -58,7 +70,7 @@ class SourceCodeFile():
         self.entrypoint = entrypoint
         self.tree_sitter_lang = self.LANGUAGE.get(language,
                                                   self.LANGUAGE['cpp'])
-        self.parser = Parser(self.tree_sitter_lang)
+        self.parser = get_parser(language)
         self.full_type_defs: list[dict[str, Any]] = []
         self.macro_blocks: list[dict[str, Any]] = []
 
@@ -69,15 +81,51 @@ class SourceCodeFile():
                 self.source_content = f.read()
 
         # Initialization ruotines
+        self._root: Optional[Node] = None
         self.load_tree()
 
         # Language specific process
         self.language_specific_process()
 
+    def __getstate__(self) -> dict[str, Any]:
+        # Tree-sitter objects cannot be pickled. The tree is parsed again
+        # if needed once the source code file is loaded.
+        state = self.__dict__.copy()
+        state['_root'] = None
+        del state['tree_sitter_lang']
+        del state['parser']
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.tree_sitter_lang = _get_language(self.language)
+        self.parser = get_parser(self.language)
+
+    @property
+    def root(self) -> Node:
+        """Root node of the source code, parsed again if the source code
+        file was pickled."""
+        if self._root is None:
+            self._root = self.parser.parse(self.source_content).root_node
+        return self._root
+
     def load_tree(self):
         """Load the the source code into a treesitter tree, and set
         the root node."""
-        self.root = self.parser.parse(self.source_content).root_node
+        self._root = self.parser.parse(self.source_content).root_node
+
+    def find_node(self, start_byte: int, end_byte: int,
+                  node_type: str) -> Node:
+        """Returns the node of the given type and byte range."""
+        node = self.root.descendant_for_byte_range(start_byte, end_byte)
+        while (node is not None and node.type != node_type
+               and node.byte_range == (start_byte, end_byte)):
+            node = node.parent
+        if (node is None or node.type != node_type
+                or node.byte_range != (start_byte, end_byte)):
+            raise ValueError(f'No {node_type} node at bytes {start_byte}-'
+                             f'{end_byte} of {self.source_file}')
+        return node
 
     def language_specific_process(self):
         """Dummy function to perform some specific processes in subclasses."""
@@ -92,13 +140,163 @@ class SourceCodeFile():
         return False
 
 
+class NodeWrapper():
+    """Base class for wrappers of a tree-sitter node of a source code file,
+    such as functions. The node is not pickled, so wrappers can be sent to
+    other processes and cached. It is found again in the tree of the source
+    code file the first time it is needed after loading."""
+    parent_source: Any
+    _root: Optional[Node]
+    _root_key: tuple[int, int, str]
+
+    @property
+    def root(self) -> Node:
+        """The wrapped node."""
+        if self._root is None:
+            self._root = self.parent_source.find_node(*self._root_key)
+        return self._root
+
+    @root.setter
+    def root(self, root: Node) -> None:
+        self._root = root
+        self._root_key = (root.start_byte, root.end_byte, root.type)
+
+    @property
+    def tree_sitter_lang(self) -> Language:
+        """The tree-sitter language of the source code file."""
+        return self.parent_source.tree_sitter_lang
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_root'] = None
+        return state
+
+    def function_source_code_as_text(self) -> str:
+        """Returns the source code the function."""
+        start_byte, end_byte, _ = self._root_key
+        return self.parent_source.source_content[start_byte:end_byte].decode(
+            encoding='utf-8', errors='ignore')
+
+
+def _is_same_value(value: Any, other: Any) -> bool:
+    """Checks if two report values are the same, without comparing the
+    content of objects shared by both."""
+    if value is other:
+        return True
+    if type(value) is not type(other):
+        return False
+    if isinstance(value, dict):
+        return (len(value) == len(other)
+                and all(key in other and _is_same_value(item, other[key])
+                        for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return len(value) == len(other) and all(
+            _is_same_value(item, other_item)
+            for item, other_item in zip(value, other))
+    return value == other
+
+
+class CallerIndex():
+    """Reverse call index of a list of functions, mapping the destination of
+    each callsite to the functions calling it. It is built in one pass over
+    all callsites, so the callsites of the functions must be extracted
+    first.
+
+    With `suffix_match`, a function is used by every function calling a
+    destination that ends with its name, as destinations may be more
+    qualified than the function names."""
+
+    def __init__(self, functions: list[Any], suffix_match: bool = False):
+        self.functions = functions
+        self.suffix_match = suffix_match
+
+        # Callers of each destination, once per callsite, and the positions
+        # of the distinct callers of each destination.
+        self.callsite_callers: dict[str, list[Any]] = {}
+        self.caller_positions: dict[str, list[int]] = {}
+        for position, func in enumerate(functions):
+            for callsite in func.base_callsites:
+                self.callsite_callers.setdefault(callsite[0], []).append(func)
+                positions = self.caller_positions.setdefault(callsite[0], [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+
+        self._suffix_uses: Optional[dict[str, int]] = None
+
+    def _build_suffix_uses(self) -> dict[str, int]:
+        """Counts the callers of every function name, matching all
+        destinations ending with the name."""
+        names = {func.name for func in self.functions}
+        callers: dict[str, set[int]] = {}
+        for destination, positions in self.caller_positions.items():
+            for idx in range(len(destination) + 1):
+                suffix = destination[idx:]
+                if suffix in names:
+                    callers.setdefault(suffix, set()).update(positions)
+        return {name: len(positions) for name, positions in callers.items()}
+
+    def get_callers(self, name: str) -> list[Any]:
+        """Returns the callers of `name`, once per callsite, in order."""
+        return self.callsite_callers.get(name, [])
+
+    def get_function_uses(self, name: str) -> int:
+        """Returns the number of functions calling `name`."""
+        if not self.suffix_match:
+            return len(self.caller_positions.get(name, []))
+
+        if self._suffix_uses is None:
+            self._suffix_uses = self._build_suffix_uses()
+        if name in self._suffix_uses:
+            return self._suffix_uses[name]
+        if any(func.name == name for func in self.functions):
+            return 0
+
+        # Not a function name of the index
+        callers: set[int] = set()
+        for destination, positions in self.caller_positions.items():
+            if destination.endswith(name):
+                callers.update(positions)
+        return len(callers)
+
+
+# State of the callsite extraction shared with the forked worker processes
+_CALLSITE_STATE: dict[str, Any] = {}
+
+
+def _extract_callsites_worker(indices: list[int]) -> list[tuple[Any, ...]]:
+    """Extracts the callsites of the functions at `indices`, and returns the
+    attributes the extraction set for each of them."""
+    functions = _CALLSITE_STATE['functions']
+    extract = _CALLSITE_STATE['extract']
+    results = []
+    for idx in indices:
+        extract(functions[idx])
+        results.append(
+            tuple(
+                getattr(functions[idx], attribute)
+                for attribute in _CALLSITE_STATE['attributes']))
+    return results
+
+
 class Project(Generic[T]):
     """Wrapper for doing analysis of a collection of source files."""
 
-    def __init__(self, source_code_files: list[T]):
+    # Whether callsite destinations ending with a function name count as
+    # uses of the function.
+    SUFFIX_MATCH_CALLSITES = False
+
+    # Attributes of functions set by the callsite extraction
+    CALLSITE_ATTRIBUTES = ('base_callsites', 'detailed_callsites', 'var_map')
+
+    def __init__(self, source_code_files: list[T], jobs: Optional[int] = None):
         self.report: dict[str, Any] = {}
         self.source_code_files = source_code_files
+        self.jobs = jobs
         self.all_functions: list[Any] = []
+        self.caller_index: Optional[CallerIndex] = None
+
+        # Rendered YAML of the top-level values of dumped reports
+        self._rendered_report_values: dict[str, tuple[Any, str]] = {}
 
     def generate_report(self,
                         entry_function: str = '',
@@ -161,7 +359,7 @@ class Project(Generic[T]):
         logger.info('Generating report')
         self.generate_report(entry_function, harness_name, harness_source)
         logger.info('Report generated')
-        new_report = copy.deepcopy(self.report)
+        new_report = dict(self.report)
         new_report['Fuzzer filename'] = harness_source
 
         logger.info('Dumping project-wide logic.')
@@ -174,9 +372,28 @@ class Project(Generic[T]):
 
         if dump_output:
             with open(report_name, 'w', encoding='utf-8') as f:
-                f.write(yaml.safe_dump(new_report))
+                f.write(self.render_report(new_report))
         logger.info('Dumped')
 
+    def render_report(self, report: dict[str, Any]) -> str:
+        """Renders a report as YAML, identically to `yaml.safe_dump`. The
+        top-level values are rendered one by one, and the rendering of a
+        value is reused when the next report holds the same value. This way
+        the module logic shared by all harnesses is serialised once. Values
+        of rendered reports must not be changed in place."""
+        if not report:
+            return yaml.safe_dump(report)
+
+        rendered = []
+        for key in sorted(report):
+            value = report[key]
+            cached = self._rendered_report_values.get(key)
+            if cached is None or not _is_same_value(cached[0], value):
+                cached = (value, yaml.safe_dump({key: value}))
+                self._rendered_report_values[key] = cached
+            rendered.append(cached[1])
+        return ''.join(rendered)
+
     def extract_calltree(self,
                          source_file: str = '',
                          source_code: Optional[SourceCodeFile] = None,
@@ -186,8 +403,53 @@ class Project(Generic[T]):
                          line_number: int = -1,
                          other_props: Optional[dict[str, Any]] = None) -> str:
         """Extracts calltree string of a calltree so that FI core can use it."""
+        return ''.join(
+            self.iter_calltree(source_file, source_code, function,
+                               visited_functions, depth, line_number,
+                               other_props))
+
+    def iter_calltree(
+            self,
+            source_file: str = '',
+            source_code: Optional[SourceCodeFile] = None,
+            function: Optional[str] = None,
+            visited_functions: Optional[set[str]] = None,
+            depth: int = 0,
+            line_number: int = -1,
+            other_props: Optional[dict[str, Any]] = None) -> Iterator[str]:
+        """Yields the lines of the calltree of a function in pre-order. The
+        calltree is walked with an explicit stack, so it is not limited by
+        the recursion limit and lines can be written as they are yielded."""
+        if not visited_functions:
+            visited_functions = set()
+
+        stack: list[tuple[Any, ...]] = [(source_file, source_code, function,
+                                         depth, line_number, other_props)]
+        while stack:
+            (source_file, source_code, function, depth, line_number,
+             other_props) = stack.pop()
+            line, callsites = self._extract_calltree_node(
+                source_file, source_code, function, visited_functions, depth,
+                line_number, other_props)
+            if line:
+                yield line
+
+            # Callees are walked in callsite order
+            for cs_source_file, cs, cs_line, cs_props in reversed(callsites):
+                stack.append(
+                    (cs_source_file, None, cs, depth + 1, cs_line, cs_props))
+
+    def _extract_calltree_node(
+        self, source_file: str, source_code: Optional[SourceCodeFile],
+        function: Optional[str], visited_functions: set[str], depth: int,
+        line_number: int, other_props: Optional[dict[str, Any]]
+    ) -> tuple[str, list[tuple[str, str, int, Optional[dict[str, Any]]]]]:
+        """Returns the calltree line of a function and the callsites to
+        walk from it, as (source file, function, line number, properties)
+        tuples. Functions of which the callsites are returned are added to
+        `visited_functions`."""
         # Dummy function for subclasses
-        return ''
+        return '', []
 
     def get_reachable_functions(
             self,
@@ -208,28 +470,153 @@ class Project(Generic[T]):
 
         return harnesses
 
+    def get_caller_index(self) -> CallerIndex:
+        """Returns the caller index of all functions of the project. The
+        index is rebuilt if the functions of the project changed."""
+        if (self.caller_index is None
+                or self.caller_index.functions is not self.all_functions):
+            self.caller_index = CallerIndex(self.all_functions,
+                                            self.SUFFIX_MATCH_CALLSITES)
+        return self.caller_index
+
     def get_cross_references(self, src_func: Any) -> list[Any]:
         """Gets list of functions that reference src_func"""
         # TODO specify type after generalisation of FunctionDefinition
-        xrefs = []
-        for func in self.all_functions:
-            if func.sig == src_func:
-                continue
-
-            for callsite in func.base_callsites:
-                if callsite[0] == src_func.name:
-                    xrefs.append(func)
-
-        return xrefs
+        return [
+            func for func in self.get_caller_index().get_callers(src_func.name)
+            if func.sig != src_func
+        ]
 
     def get_cross_references_by_name(self, function_name) -> list[Any]:
         """Get cross reference functions by a target function name."""
-        xrefs = []
-        for func in self.all_functions:
-            for callsite in func.base_callsites:
-                if callsite[0] == function_name:
-                    xrefs.append(func)
-        return xrefs
+        return self.get_caller_index().get_callers(function_name)[:]
+
+    def calculate_function_depths(
+            self, functions: list[Any],
+            resolve_callsite: Callable[[str], Optional[Any]]) -> None:
+        """Sets the function depth of all functions in one pass over the
+        call graph. Callsite destinations are resolved to functions with
+        `resolve_callsite`.
+
+        The depth of a function is the length of the longest chain of
+        calls from it. Mutually recursive functions share their depth, a
+        recursive call counting as one level of depth. Calls to a function
+        with the same name as the caller are recursive calls."""
+        resolved: dict[str, Optional[Any]] = {}
+        recursive: set[int] = set()
+
+        def _get_callees(func: Any) -> list[Any]:
+            callees = []
+            for callsite, _ in func.base_callsites:
+                if callsite not in resolved:
+                    resolved[callsite] = resolve_callsite(callsite)
+                callee = resolved[callsite]
+                if callee is None:
+                    continue
+                if callee.name == func.name:
+                    recursive.add(id(func))
+                else:
+                    callees.append(callee)
+            return callees
+
+        # Iterative Tarjan, strongly connected components are completed
+        # after all the components they call.
+        indices: dict[int, int] = {}
+        lowlinks: dict[int, int] = {}
+        depths: dict[int, int] = {}
+        callees_of: dict[int, list[Any]] = {}
+        scc_stack: list[Any] = []
+        on_stack: set[int] = set()
+
+        for root in functions:
+            if id(root) in indices:
+                continue
+
+            work = [(root, 0)]
+            while work:
+                func, callee_idx = work.pop()
+                func_id = id(func)
+                if callee_idx == 0:
+                    indices[func_id] = lowlinks[func_id] = len(indices)
+                    callees_of[func_id] = _get_callees(func)
+                    scc_stack.append(func)
+                    on_stack.add(func_id)
+
+                callees = callees_of[func_id]
+                if callee_idx < len(callees):
+                    work.append((func, callee_idx + 1))
+                    callee_id = id(callees[callee_idx])
+                    if callee_id not in indices:
+                        work.append((callees[callee_idx], 0))
+                    elif callee_id in on_stack:
+                        lowlinks[func_id] = min(lowlinks[func_id],
+                                                indices[callee_id])
+                    continue
+
+                if work:
+                    caller_id = id(work[-1][0])
+                    lowlinks[caller_id] = min(lowlinks[caller_id],
+                                              lowlinks[func_id])
+                if lowlinks[func_id] != indices[func_id]:
+                    continue
+
+                # Pop the component and compute its depth
+                component = []
+                while True:
+                    member = scc_stack.pop()
+                    on_stack.discard(id(member))
+                    component.append(member)
+                    if member is func:
+                        break
+                component_ids = {id(member) for member in component}
+                depth = 0
+                for member in component:
+                    if id(member) in recursive:
+                        depth = max(depth, 1)
+                    for callee in callees_of[id(member)]:
+                        if id(callee) in component_ids:
+                            depth = max(depth, 1)
+                        else:
+                            depth = max(depth, depths[id(callee)] + 1)
+                for member in component:
+                    depths[id(member)] = depth
+                    member.function_depth = depth
+
+    def extract_callsites(self, functions: list[Any],
+                          extract: Callable[[Any], None]) -> None:
+        """Runs `extract` on all functions to set their callsites, with
+        `self.jobs` forked worker processes. The functions of a source file
+        are extracted by the same worker, which parses the source file
+        again if needed, and only the extracted callsites are sent back."""
+        function_indices: dict[int, list[int]] = {}
+        for idx, func in enumerate(functions):
+            function_indices.setdefault(id(func.parent_source), []).append(idx)
+        tasks = list(function_indices.values())
+
+        jobs = self.jobs if self.jobs is not None else os.cpu_count() or 1
+        jobs = min(jobs, len(tasks))
+        if jobs <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+            for func in functions:
+                extract(func)
+            return
+
+        logger.info('Extracting callsites of %d functions with %d jobs',
+                    len(functions), jobs)
+        _CALLSITE_STATE['functions'] = functions
+        _CALLSITE_STATE['extract'] = extract
+        _CALLSITE_STATE['attributes'] = self.CALLSITE_ATTRIBUTES
+        try:
+            chunksize = max(1, len(tasks) // (jobs * 4))
+            with multiprocessing.get_context('fork').Pool(jobs) as pool:
+                results = pool.imap(_extract_callsites_worker, tasks,
+                                    chunksize)
+                for indices, values in zip(tasks, results):
+                    for idx, func_values in zip(indices, values):
+                        for attribute, value in zip(self.CALLSITE_ATTRIBUTES,
+                                                    func_values):
+                            setattr(functions[idx], attribute, value)
+        finally:
+            _CALLSITE_STATE.clear()
 
     def find_function_by_name(self, target_function_name, only_exact_match):
         """Helper function to find the matching function."""
@@ -257,3 +644,193 @@ class Project(Generic[T]):
                     return function
 
         return None
+
+
+def get_parser(language: str) -> Parser:
+    """Returns the cached tree-sitter parser of this process for the
+    given language."""
+    if language not in SourceCodeFile.LANGUAGE:
+        language = 'cpp'
+
+    parser = _PARSERS.get(language)
+    if not parser:
+        parser = Parser(SourceCodeFile.LANGUAGE[language])
+        _PARSERS[language] = parser
+
+    return parser
+
+
+def _get_language(language: str) -> Language:
+    """Returns the tree-sitter language of a frontend language."""
+    return SourceCodeFile.LANGUAGE.get(language,
+                                       SourceCodeFile.LANGUAGE['cpp'])
+
+
+def get_source_cache_key(source_cls: type[SourceCodeFile], language: str,
+                         source_file: str, entrypoint: str) -> str:
+    """Returns the key of the cache entry of a source file. The entry itself
+    holds the fingerprint of the source file it was created from."""
+    hasher = hashlib.sha256()
+    hasher.update(f'{utils.get_tool_version()}:{source_cls.__module__}.'
+                  f'{source_cls.__qualname__}:{language}:{entrypoint}:'
+                  f'{os.path.abspath(source_file)}'.encode())
+    return f'source-{hasher.hexdigest()}'
+
+
+def load_cached_source_code_file(cache_dir: str, cache_key: str,
+                                 source_file: str) -> Any:
+    """Loads a source code file from the cache directory, if it exists and
+    the source file is unchanged. The source file is unchanged if its size
+    and modification time match the cache entry, or otherwise if the hash of
+    its content matches. Cached source code files hold no tree-sitter
+    objects, so they are loaded without parsing the source file."""
+    cache_file = os.path.join(cache_dir, f'{cache_key}.pickle')
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        source_stat = os.stat(source_file)
+        with open(cache_file, 'rb') as f:
+            size, mtime_ns, digest, data = pickle.load(f)
+        if size != source_stat.st_size:
+            return None
+
+        if mtime_ns != source_stat.st_mtime_ns:
+            with open(source_file, 'rb') as f:
+                source_content = f.read()
+            if hashlib.sha256(source_content).hexdigest() != digest:
+                return None
+            # Same content with a new modification time, e.g. a fresh
+            # checkout. Refresh the entry to skip hashing next time.
+            save_cached_source_code_file(cache_dir, cache_key,
+                                         source_stat.st_mtime_ns,
+                                         source_content, data)
+
+        return pickle.loads(data)
+    except Exception as e:
+        logger.info('Failed to load cached source file %s: %s', source_file, e)
+        return None
+
+
+def save_cached_source_code_file(cache_dir: str, cache_key: str, mtime_ns: int,
+                                 source_content: bytes, data: bytes) -> None:
+    """Stores a pickled source code file in the cache directory, together
+    with the fingerprint of its source file. The entry is written to a
+    temporary file first, so concurrent readers never see a partially
+    written entry."""
+    entry = (len(source_content), mtime_ns,
+             hashlib.sha256(source_content).hexdigest(), data)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, os.path.join(cache_dir, f'{cache_key}.pickle'))
+    except Exception as e:
+        logger.info('Failed to cache source file %s: %s', cache_key, e)
+        if os.path.isfile(tmp_file):
+            os.remove(tmp_file)
+
+
+def _load_source_code_file(
+        source_file: str, source_cls: type[T], language: str, entrypoint: str,
+        ignored_errors: tuple[type[Exception], ...],
+        cache_dir: Optional[str]) -> Optional[tuple[T, bytes]]:
+    """Creates the source code file abstraction of a source file. Returns
+    the source code file and its pickled form, which is stored in the cache
+    directory if one is given."""
+    # The modification time is read before the file, so a concurrent change
+    # is never recorded with the previous content.
+    mtime_ns = os.stat(source_file).st_mtime_ns if cache_dir else 0
+    try:
+        source_code = source_cls(language, source_file, entrypoint)
+    except ignored_errors:
+        return None
+
+    data = pickle.dumps(source_code, protocol=pickle.HIGHEST_PROTOCOL)
+    if cache_dir:
+        save_cached_source_code_file(
+            cache_dir,
+            get_source_cache_key(source_cls, language, source_file,
+                                 entrypoint), mtime_ns,
+            source_code.source_content, data)
+    return source_code, data
+
+
+def _load_source_code_file_worker(source_file: str,
+                                  **kwargs: Any) -> Optional[bytes]:
+    """Worker for loading a single source code file. Returns the pickled
+    source code file, which holds no tree-sitter objects."""
+    result = _load_source_code_file(source_file, **kwargs)
+    if result is None:
+        return None
+    return result[1]
+
+
+def load_source_code_files(source_cls: type[T],
+                           language: str,
+                           source_files: list[str],
+                           entrypoint: str = '',
+                           jobs: Optional[int] = None,
+                           ignored_errors: tuple[type[Exception], ...] = (),
+                           cache_dir: Optional[str] = None) -> list[T]:
+    """Parses and processes all source files, in parallel if more than
+    one job is used. The default number of jobs is the number of CPUs.
+
+    If `cache_dir` is set, source files unchanged since a previous run are
+    loaded from the cache directory and only the others are parsed.
+
+    Source code files loaded by worker processes or from the cache hold the
+    extracted data only, and their trees are parsed again when needed.
+    """
+    source_codes: list[Optional[T]] = [None] * len(source_files)
+    to_load = []
+    for idx, source_file in enumerate(source_files):
+        if cache_dir:
+            source_codes[idx] = load_cached_source_code_file(
+                cache_dir,
+                get_source_cache_key(source_cls, language, source_file,
+                                     entrypoint), source_file)
+        if source_codes[idx] is None:
+            to_load.append(idx)
+    if cache_dir:
+        logger.info('Loaded %d of %d source files from cache',
+                    len(source_files) - len(to_load), len(source_files))
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(to_load))
+
+    if jobs <= 1:
+        for idx in to_load:
+            # Only pickle the source code file if it is cached.
+            if cache_dir:
+                result = _load_source_code_file(source_files[idx], source_cls,
+                                                language, entrypoint,
+                                                ignored_errors, cache_dir)
+                if result:
+                    source_codes[idx] = result[0]
+                continue
+            try:
+                source_codes[idx] = source_cls(language, source_files[idx],
+                                               entrypoint)
+            except ignored_errors:
+                continue
+    else:
+        logger.info('Loading %d source files with %d jobs', len(to_load), jobs)
+        worker = functools.partial(_load_source_code_file_worker,
+                                   source_cls=source_cls,
+                                   language=language,
+                                   entrypoint=entrypoint,
+                                   ignored_errors=ignored_errors,
+                                   cache_dir=cache_dir)
+        chunksize = max(1, len(to_load) // (jobs * 4))
+        with multiprocessing.Pool(jobs) as pool:
+            results = pool.imap(worker, [source_files[idx] for idx in to_load],
+                                chunksize)
+            for idx, data in zip(to_load, results):
+                if data is not None:
+                    source_codes[idx] = pickle.loads(data)
+
+    return [
+        source_code for source_code in source_codes if source_code is not None
+    ]
@@ -17,19 +17,82 @@
 
 from typing import Any, Optional
 
-from tree_sitter import Language, Node
+from tree_sitter import Language, Node, Query
 
 import os
-import copy
+import functools
 import logging
 
-from fuzz_introspector.frontends.datatypes import SourceCodeFile, Project
+from bisect import bisect_left, bisect_right
+
+from fuzz_introspector.frontends.datatypes import (SourceCodeFile, Project,
+                                                   NodeWrapper,
+                                                   load_source_code_files)
 
 logger = logging.getLogger(name=__name__)
 
 # For caching function nodes to increase processing speed
 _function_node_cache: dict[tuple[str, str, bool], 'FunctionDefinition'] = {}
 
+# Nodes processed when walking the tree of a source file
+_TREE_NODES_QUERY = """[
+    ( function_definition ) ( preproc_function_def ) ( namespace_definition )
+    ( enum_specifier ) ( preproc_def ) ( struct_specifier ) ( union_specifier )
+    ( type_definition ) ( preproc_include ) ( preproc_ifdef ) ( preproc_if )
+] @node"""
+
+# Nodes that may hold a callsite or a variable declaration
+_CALLSITE_NODES_QUERY = """[
+    ( call_expression ) ( new_expression ) ( declaration )
+] @node"""
+
+# Nodes counted for the cyclomatic complexity of a function
+_BRANCH_NODE_TYPES = {
+    'if_statement', 'switch_statement', 'do_statement', 'while_statement',
+    'for_statement', 'for_range_loop', 'try_statement', 'seh_try_statement',
+    'throw_statement', 'goto_statement', 'co_return_statement',
+    'co_yield_statement', 'break_statement', 'continue_statement', '&&', '||'
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_query(tree_sitter_lang: Language, query_str: str) -> Query:
+    """Returns the compiled query, compiling each query only once."""
+    return tree_sitter_lang.query(query_str)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_body_query(tree_sitter_lang: Language) -> Query:
+    """Returns the query capturing all nodes needed for the metrics and
+    assert statements of a function body: branch nodes, statement nodes,
+    case statements and call expressions."""
+    patterns = set()
+    for kind_id in range(tree_sitter_lang.node_kind_count):
+        if not tree_sitter_lang.node_kind_is_visible(kind_id):
+            continue
+        kind = tree_sitter_lang.node_kind_for_id(kind_id)
+        if not kind:
+            continue
+        if (kind in _BRANCH_NODE_TYPES or 'statement' in kind
+                or kind == 'call_expression'):
+            if tree_sitter_lang.node_kind_is_named(kind_id):
+                patterns.add(f'( {kind} )')
+            else:
+                patterns.add(f'"{kind}"')
+    return tree_sitter_lang.query(f'[ {" ".join(sorted(patterns))} ] @node')
+
+
+def _get_captured_nodes(query: Query, node: Node) -> list[Node]:
+    """Returns the nodes captured by the query in the order of a depth-first
+    walk of the tree. The order of the captures returned by tree-sitter is
+    not stable, so the nodes are sorted by position, enclosing nodes first."""
+    nodes = [
+        captured for captures in query.captures(node).values()
+        for captured in captures
+    ]
+    nodes.sort(key=lambda captured: (captured.start_byte, -captured.end_byte))
+    return nodes
+
 
 class CppSourceCodeFile(SourceCodeFile):
     """Class for holding file-specific information."""
@@ -90,15 +153,42 @@ class CppSourceCodeFile(SourceCodeFile):
         return False
 
     def process_tree(self, node: Node, namespace: str = ''):
-        """Process the node from the parsed tree."""
+        """Process the node from the parsed tree. The nodes to process are
+        captured with a single query and visited in the order of a
+        depth-first walk of the tree, without recursing over every node."""
+        # Group the captured nodes by the closest captured node holding
+        # them. Captures are sorted in tree order, so the enclosing nodes of
+        # a capture are those on the stack that it starts in.
+        nested_nodes: dict[int, list[Node]] = {node.id: []}
+        enclosing_nodes = [node]
+        tree_query = _get_query(self.tree_sitter_lang, _TREE_NODES_QUERY)
+        for child in _get_captured_nodes(tree_query, node):
+            if child.id == node.id:
+                continue
+            while (len(enclosing_nodes) > 1
+                   and child.start_byte >= enclosing_nodes[-1].end_byte):
+                enclosing_nodes.pop()
+            nested_nodes[enclosing_nodes[-1].id].append(child)
+            nested_nodes[child.id] = []
+            enclosing_nodes.append(child)
+
         # TODO handles namespace for all nodes
         # TODO Add more C++ specific type defintions and macros
-        for child in node.children:
-            if child.type in ['function_definition', 'preproc_function_def']:
+        # Each processed node is walked for nested items afterwards, and
+        # namespaces are walked both within and outside their namespace.
+        to_visit: list[tuple[bool, Node, str]] = [(True, node, namespace)]
+        while to_visit:
+            walk, child, namespace = to_visit.pop()
+            if walk:
+                for nested_node in reversed(nested_nodes[child.id]):
+                    to_visit.append((True, nested_node, namespace))
+                    to_visit.append((False, nested_node, namespace))
+            elif child.type in ['function_definition', 'preproc_function_def']:
                 self._process_function_node(child, namespace)
             elif child.type == 'namespace_definition':
                 # Only valid for Cpp projects
-                self._process_namespace_node(child, namespace)
+                to_visit.append(
+                    (True, child, self._get_namespace(child, namespace)))
             elif child.type == 'enum_specifier':
                 self._process_enum(child, namespace)
             elif child.type == 'preproc_def':
@@ -114,9 +204,6 @@ class CppSourceCodeFile(SourceCodeFile):
             elif child.type in ['preproc_ifdef', 'preproc_if']:
                 self._process_macro_block(child, namespace, [])
 
-            # Ensure recursive into nested items
-            self.process_tree(child, namespace)
-
     def store_full_type_defs(self) -> None:
         """Helper to gather all custom type definitions."""
         self.full_type_defs.extend(self.struct_defs)
@@ -127,12 +214,13 @@ class CppSourceCodeFile(SourceCodeFile):
 
     def _process_function_node(self, node: Node, namespace: str) -> None:
         """Internal helper for processing function node."""
-        func = FunctionDefinition(node, self.tree_sitter_lang, self, namespace)
+        func = FunctionDefinition(node, self, namespace)
         if func.valid:
             self.func_defs.append(func)
 
-    def _process_namespace_node(self, node: Node, namespace: str) -> None:
-        """Recursive internal helper for processing namespace definition."""
+    def _get_namespace(self, node: Node, namespace: str) -> str:
+        """Internal helper for getting the namespace of the items in a
+        namespace definition."""
         new_namespace = node.child_by_field_name('name')
         if new_namespace:
             # Nested namespace
@@ -153,8 +241,7 @@ class CppSourceCodeFile(SourceCodeFile):
                     if namespace.startswith('::'):
                         namespace = namespace[2:]
 
-        # Continue to process the tree of the namespace
-        self.process_tree(node, namespace)
+        return namespace
 
     def _process_enum(self, enum: Node, namespace: str) -> None:
         """Internal helper for processing enum definition."""
@@ -164,25 +251,25 @@ class CppSourceCodeFile(SourceCodeFile):
             # Skip anonymous enum or forward declaration
             return
 
-        enum_item_query = self.tree_sitter_lang.query('( enumerator ) @en')
+        enum_item_query = _get_query(self.tree_sitter_lang,
+                                     '( enumerator ) @en')
         enumerator_list = []
-        for _, enumerators in enum_item_query.captures(enum_body).items():
-            for enumerator in enumerators:
-                item_dict = {}
-                enum_item_name = enumerator.child_by_field_name('name')
-                enum_item_value = enumerator.child_by_field_name('value')
-
-                if not enum_item_name or not enum_item_name.text:
-                    # Skip anonymous enum items
-                    continue
-                item_dict['name'] = enum_item_name.text.decode(
-                    encoding='utf-8', errors='ignore')
+        for enumerator in _get_captured_nodes(enum_item_query, enum_body):
+            item_dict = {}
+            enum_item_name = enumerator.child_by_field_name('name')
+            enum_item_value = enumerator.child_by_field_name('value')
 
-                if enum_item_value and enum_item_value.text:
-                    item_dict['value'] = enum_item_value.text.decode(
-                        encoding='utf-8', errors='ignore')
+            if not enum_item_name or not enum_item_name.text:
+                # Skip anonymous enum items
+                continue
+            item_dict['name'] = enum_item_name.text.decode(encoding='utf-8',
+                                                           errors='ignore')
 
-                enumerator_list.append(item_dict)
+            if enum_item_value and enum_item_value.text:
+                item_dict['value'] = enum_item_value.text.decode(
+                    encoding='utf-8', errors='ignore')
+
+            enumerator_list.append(item_dict)
 
         self.enum_defs.append({
             'name':
@@ -381,86 +468,88 @@ class CppSourceCodeFile(SourceCodeFile):
 
     def _process_macro_block(self, macro: Node, namespace: str,
                              conditions: list[dict[str, str]]) -> None:
-        """Recursive function to process macro nodes and extract all #elif
-        and #else macro sub-branches."""
-        # if it is the #elif or #else branches, previous condition must be reversed.
-        if conditions:
-            if conditions[-1]['type'] == 'ifdef':
-                conditions[-1]['type'] = 'ifndef'
-            elif conditions[-1]['type'] == 'ifndef':
-                conditions[-1]['type'] = 'ifdef'
-            else:
-                conditions[-1]['type'] = 'not'
-
-        if macro.type == 'preproc_ifdef':
-            var_name = macro.child_by_field_name('name')
+        """Process macro nodes and extract all #elif and #else macro
+        sub-branches, walking the chain of branches iteratively."""
+        while True:
+            # if it is the #elif or #else branches, previous condition must
+            # be reversed.
+            if conditions:
+                if conditions[-1]['type'] == 'ifdef':
+                    conditions[-1]['type'] = 'ifndef'
+                elif conditions[-1]['type'] == 'ifndef':
+                    conditions[-1]['type'] = 'ifdef'
+                else:
+                    conditions[-1]['type'] = 'not'
 
-            # Skip invalid macro
-            if not var_name or not var_name.text:
-                return
+            if macro.type == 'preproc_ifdef':
+                var_name = macro.child_by_field_name('name')
 
-            if macro and macro.text and macro.text.decode(
-                    encoding='utf-8', errors='ignore').startswith('#ifdef'):
-                type = 'ifdef'
-            else:
-                type = 'ifndef'
-            conditions.append({
-                'type':
-                type,
-                'condition':
-                var_name.text.decode(encoding='utf-8', errors='ignore'),
-            })
-        elif macro.type in ['preproc_if', 'preproc_elif']:
-            condition = macro.child_by_field_name('condition')
+                # Skip invalid macro
+                if not var_name or not var_name.text:
+                    return
 
-            # Skip invalid macro
-            if not condition or not condition.text:
-                return
+                if macro and macro.text and macro.text.decode(
+                        encoding='utf-8',
+                        errors='ignore').startswith('#ifdef'):
+                    type = 'ifdef'
+                else:
+                    type = 'ifndef'
+                conditions.append({
+                    'type':
+                    type,
+                    'condition':
+                    var_name.text.decode(encoding='utf-8', errors='ignore'),
+                })
+            elif macro.type in ['preproc_if', 'preproc_elif']:
+                condition = macro.child_by_field_name('condition')
 
-            conditions.append({
-                'type':
-                'if',
-                'condition':
-                condition.text.decode(encoding='utf-8', errors='ignore'),
-            })
+                # Skip invalid macro
+                if not condition or not condition.text:
+                    return
 
-        # Extract #else #elif branches
-        alternative = macro.child_by_field_name('alternative')
+                conditions.append({
+                    'type':
+                    'if',
+                    'condition':
+                    condition.text.decode(encoding='utf-8', errors='ignore'),
+                })
 
-        if alternative:
-            # Have #elif or #else branches
-            self.macro_blocks.append({
-                'conditions': conditions,
-                'pos': {
-                    'source_file': self.source_file,
-                    'line_start': macro.start_point.row,
-                    'line_end': alternative.start_point.row,
-                }
-            })
-        else:
-            # No more #elif or #else branches
-            self.macro_blocks.append({
-                'conditions': conditions,
-                'pos': {
-                    'source_file': self.source_file,
-                    'line_start': macro.start_point.row,
-                    'line_end': macro.end_point.row,
-                }
-            })
-            return
+            # Extract #else #elif branches
+            alternative = macro.child_by_field_name('alternative')
+
+            if alternative:
+                # Have #elif or #else branches
+                self.macro_blocks.append({
+                    'conditions': conditions,
+                    'pos': {
+                        'source_file': self.source_file,
+                        'line_start': macro.start_point.row,
+                        'line_end': alternative.start_point.row,
+                    }
+                })
+            else:
+                # No more #elif or #else branches
+                self.macro_blocks.append({
+                    'conditions': conditions,
+                    'pos': {
+                        'source_file': self.source_file,
+                        'line_start': macro.start_point.row,
+                        'line_end': macro.end_point.row,
+                    }
+                })
+                return
 
-        # Recursively extract more #else or #elseif branches
-        self._process_macro_block(alternative, namespace,
-                                  copy.deepcopy(conditions))
+            # Continue with the #else or #elseif branch
+            macro = alternative
+            conditions = [dict(condition) for condition in conditions]
 
 
-class FunctionDefinition():
+class FunctionDefinition(NodeWrapper):
     """Wrapper for a function definition"""
 
-    def __init__(self, root: Node, tree_sitter_lang: Language,
-                 source_code: CppSourceCodeFile, namespace: str):
+    def __init__(self, root: Node, source_code: CppSourceCodeFile,
+                 namespace: str):
         self.root = root
-        self.tree_sitter_lang = tree_sitter_lang
         self.parent_source = source_code
         self.namespace_or_class = namespace
         self.valid = True
@@ -483,53 +572,24 @@ class FunctionDefinition():
         self.base_callsites: list[tuple[str, int]] = []
         self.detailed_callsites: list[dict[str, str]] = []
         self.var_map: dict[str, str] = {}
-        self.depth = -1
         self.assert_stmts: list[dict[str, Any]] = []
 
         # Extract information from tree-sitter node
         self._extract_information()
 
-    def function_source_code_as_text(self) -> str:
-        """Returns the source code the function."""
-        if self.root and self.root.text:
-            return self.root.text.decode(encoding='utf-8', errors='ignore')
-
-        return ''
-
     def extract_callsites(self, project):
         """Gets the callsites of the function."""
         if not self.base_callsites:
             callsites = []
-            cursor = self.root.walk()
-            visited = set()
-            node = self.root
-
-            while True:
-                if node.id not in visited:
-                    visited.add(node.id)
-                    try:
-                        callsites.extend(self._process_callsites(
-                            node, project))
-                    except UnicodeDecodeError:
-                        logger.debug('Error decoding statement.')
-
-                # Find next child
-                if cursor.goto_first_child():
-                    node = cursor.node
-                    continue
-
-                # Find next sibiling or parents if no more children
-                while not cursor.goto_next_sibling():
-                    if not cursor.goto_parent():
-                        node = None
-                        break
-                    node = cursor.node
-
-                if node is None:
-                    break
-
-                # Move to next node to process (sibiling or parent)
-                node = cursor.node
+            callsite_query = _get_query(self.tree_sitter_lang,
+                                        _CALLSITE_NODES_QUERY)
+            # Declarations must be processed before the calls following
+            # them, as they set the types of the variables called.
+            for node in _get_captured_nodes(callsite_query, self.root):
+                try:
+                    callsites.extend(self._process_callsites(node, project))
+                except UnicodeDecodeError:
+                    logger.debug('Error decoding statement.')
 
             callsites = sorted(set(callsites), key=lambda x: x[1])
             self.base_callsites = [(x[0], x[2]) for x in callsites]
@@ -730,10 +790,7 @@ class FunctionDefinition():
                     self.var_map[self.arg_names[-1]] = self.arg_types[-1]
 
         # Handles other fields
-        self._process_complexity()
-        self._process_icount()
-        self._process_bbcount()
-        self._process_assert_stmts()
+        self._process_body()
 
     def _extract_pointer_array_from_type(
             self, param_name: Node) -> tuple[int, int, Node]:
@@ -761,74 +818,47 @@ class FunctionDefinition():
 
         return (pointer_count, array_count, param_name)
 
-    def _process_complexity(self):
-        """Gets complexity measure based on counting branch nodes in a
-        function."""
-
-        branch_nodes = [
-            'if_statement', 'switch_statement', 'do_statement',
-            'while_statement', 'for_statement', 'for_range_loop',
-            'try_statement', 'seh_try_statement', 'throw_statement',
-            'goto_statement', 'co_return_statement', 'co_yield_statement',
-            'break_statement', 'continue_statement', '&&', '||'
-        ]
-
-        def _traverse_node_complexity(node: Node):
-            count = 0
-            if node.type in branch_nodes:
-                count += 1
-            for item in node.children:
-                count += _traverse_node_complexity(item)
-            return count
-
-        self.complexity += _traverse_node_complexity(self.root)
-
-    def _process_icount(self):
-        """Get a pseudo measurement of instruction count."""
-
-        def _traverse_node_instr_count(node: Node) -> int:
-            count = 0
-            if 'statement' in node.type:
-                count += 1
-            for item in node.children:
-                count += _traverse_node_instr_count(item)
-            return count
-
-        self.icount += _traverse_node_instr_count(self.root)
-
-    def _process_bbcount(self):
-        """Get the approximate number of basic blocks in a function"""
+    def _process_body(self):
+        """Gets the complexity, the pseudo instruction count, the approximate
+        number of basic blocks and the assert statements of the function,
+        from a single query over the nodes of the function."""
         self.bbcount = 1
 
-        if_query = self.tree_sitter_lang.query('( if_statement ) @fi')
-        if_res = if_query.captures(self.root)
-        for _, if_exprs in if_res.items():
-            self.bbcount += len(if_exprs)
-
-        case_query = self.tree_sitter_lang.query('( case_statement ) @ci')
-        case_res = case_query.captures(self.root)
-        for _, case_exprs in case_res.items():
-            self.bbcount += len(case_exprs)
-
-    def _process_assert_stmts(self):
-        """Gets a list of assert statements in the function."""
-        call_query = self.tree_sitter_lang.query('( call_expression ) @ce')
-        call_res = call_query.captures(self.root)
-        for _, call_exprs in call_res.items():
-            for call_expr in call_exprs:
-                func_call = call_expr.child_by_field_name('function')
-                args = call_expr.child_by_field_name('arguments')
-                if func_call and func_call.text.decode(
-                        encoding='utf-8', errors='ignore') == 'assert':
-                    self.assert_stmts.append({
-                        'condition':
-                        args.text.decode(encoding='utf-8', errors='ignore'),
-                        'pos': {
-                            'source_file': self.parent_source.source_file,
-                            'line_start': call_expr.start_point.row,
-                            'line_end': call_expr.end_point.row,
-                        }
-                    })
+        body_query = _get_body_query(self.tree_sitter_lang)
+        for node in _get_captured_nodes(body_query, self.root):
+            node_type = node.type
+
+            # Complexity based on counting branch nodes
+            if node_type in _BRANCH_NODE_TYPES:
+                self.complexity += 1
+
+            # Pseudo measurement of instruction count
+            if 'statement' in node_type:
+                self.icount += 1
+
+            if node_type in ['if_statement', 'case_statement']:
+                self.bbcount += 1
+            elif node_type == 'call_expression':
+                self._process_assert_stmt(node)
+
+    def _process_assert_stmt(self, call_expr: Node):
+        """Stores the call expression if it is an assert statement."""
+        func_call = call_expr.child_by_field_name('function')
+        args = call_expr.child_by_field_name('arguments')
+        if not func_call or not func_call.text or not args or not args.text:
+            return
+
+        if func_call.text.decode(encoding='utf-8',
+                                 errors='ignore') == 'assert':
+            self.assert_stmts.append({
+                'condition':
+                args.text.decode(encoding='utf-8', errors='ignore'),
+                'pos': {
+                    'source_file': self.parent_source.source_file,
+                    'line_start': call_expr.start_point.row,
+                    'line_end': call_expr.end_point.row,
+                }
+            })
 
     def _process_invoke(self, expr: Node,
                         project) -> list[tuple[str, int, int]]:
@@ -858,7 +888,7 @@ class FunctionDefinition():
                 # Find the matching function in our project
                 matched_func = get_function_node(
                     target_name,
-                    project.all_functions,
+                    project.symbol_index,
                     namespace=self.namespace_or_class)
                 if matched_func:
                     logger.debug('Matched function: %s', matched_func.name)
@@ -870,7 +900,7 @@ class FunctionDefinition():
                                                              errors='ignore')
                         matched_func2 = get_function_node(
                             target_name2,
-                            project.all_functions,
+                            project.symbol_index,
                             namespace=self.namespace_or_class)
                         if matched_func2:
                             logger.debug('Matched function: %s',
@@ -887,11 +917,8 @@ class FunctionDefinition():
             # Handles in scope invocation
             if '::' not in target_name and self.namespace_or_class:
                 full_target_name = f'{self.namespace_or_class}::{target_name}'
-                for tmp_func in project.all_functions:
-                    if tmp_func.name == full_target_name:
-                        # if full_target_name in project.all_functions:
-                        target_name = full_target_name
-                        break
+                if project.get_function_from_name(full_target_name):
+                    target_name = full_target_name
 
             if func and func.start_point:
                 callsites.append((target_name, func.byte_range[1],
@@ -902,8 +929,34 @@ class FunctionDefinition():
     def _process_field_expr_return_type(self, field_expr: Node,
                                         project) -> tuple[Optional[str], str]:
         """Helper for determining the return type of a field expression
-        in a chained call and its full qualified name."""
+        in a chained call and its full qualified name. The field expressions
+        of the chain are processed iteratively, from the innermost one."""
+        field_exprs = [field_expr]
+        while True:
+            arg = field_exprs[-1].child_by_field_name('argument')
+            if not arg or arg.type != 'field_expression':
+                break
+            field_exprs.append(arg)
+
+        object_type: Optional[str] = None
+        full_name = ''
+        for expr in reversed(field_exprs):
+            object_type, full_name = self._process_field_expr_name(
+                expr, full_name)
+
         ret_type = None
+        if object_type:
+            node = get_function_node(full_name, project.symbol_index)
+            if node:
+                ret_type = node.return_type
+
+        return (ret_type, full_name)
+
+    def _process_field_expr_name(self, field_expr: Node,
+                                 arg_name: str) -> tuple[Optional[str], str]:
+        """Helper for determining the object type and full qualified name
+        of a single field expression, given the full qualified name of its
+        argument if the argument is a field expression itself."""
         object_type = None
 
         arg = field_expr.child_by_field_name('argument')
@@ -923,7 +976,7 @@ class FunctionDefinition():
 
         # Chained field access
         if arg.type == 'field_expression':
-            _, object_type = self._process_field_expr_return_type(arg, project)
+            object_type = arg_name
 
         # Internal call
         elif arg.type == 'this':
@@ -940,17 +993,12 @@ class FunctionDefinition():
             # (c, sd.stack);""
             # We give up here.
             logger.debug('Cant analyse this.')
-            return ('', '')
-
-        if object_type:
-            if object_type != 'void':
-                full_name = f'{object_type}::{full_name}'
+            return (None, '')
 
-            node = get_function_node(full_name, project.all_functions)
-            if node:
-                ret_type = node.return_type
+        if object_type and object_type != 'void':
+            full_name = f'{object_type}::{full_name}'
 
-        return (ret_type, full_name)
+        return (object_type, full_name)
 
     def _process_callsites(self, stmt: Node,
                            project) -> list[tuple[str, int, int]]:
@@ -1065,19 +1113,206 @@ class FunctionDefinition():
         return callsites
 
 
+class FunctionSymbolIndex():
+    """Project-level index of function definitions, built once after
+    parsing, for the name and location based lookups of the project. All
+    lookups return the first matching function in project order, i.e. the
+    order of the source files and of the functions within them."""
+
+    def __init__(self, source_code_files: list[CppSourceCodeFile]):
+        self.functions: list[FunctionDefinition] = []
+        self.positions: dict[int, int] = {}
+
+        # Name and qualified name to the first definition, and to the
+        # source files defining them with their first definition each.
+        self.by_name: dict[str, FunctionDefinition] = {}
+        self.sources_by_name: dict[str, list[tuple[CppSourceCodeFile,
+                                                   FunctionDefinition]]] = {}
+        self.sources_by_qualified_name: dict[str, list[tuple[
+            CppSourceCodeFile, FunctionDefinition]]] = {}
+
+        # Functions of each source file ordered by start line, with the
+        # running maximum of their end lines, for line lookups.
+        self.file_functions: dict[str, list[FunctionDefinition]] = {}
+        self.file_start_lines: dict[str, list[int]] = {}
+        self.file_max_end_lines: dict[str, list[int]] = {}
+
+        for source_code in source_code_files:
+            for func in source_code.func_defs:
+                self.positions[id(func)] = len(self.functions)
+                self.functions.append(func)
+                self.by_name.setdefault(func.name, func)
+                if func.namespace_or_class:
+                    qualified_name = f'{func.namespace_or_class}::{func.name}'
+                else:
+                    qualified_name = func.name
+                self._add_source(self.sources_by_name, func.name, source_code,
+                                 func)
+                self._add_source(self.sources_by_qualified_name,
+                                 qualified_name, source_code, func)
+                self.file_functions.setdefault(source_code.source_file,
+                                               []).append(func)
+
+        for source_file, funcs in self.file_functions.items():
+            funcs.sort(key=lambda x: x.start_line)
+            max_end_lines = []
+            max_end_line = 0
+            for func in funcs:
+                max_end_line = max(max_end_line, func.end_line)
+                max_end_lines.append(max_end_line)
+            self.file_start_lines[source_file] = [
+                func.start_line for func in funcs
+            ]
+            self.file_max_end_lines[source_file] = max_end_lines
+
+        # Reversed names and source files, sorted, so that all entries with
+        # the same suffix form a contiguous range.
+        self._name_suffix_index = self._build_suffix_index(
+            [func.name for func in self.functions])
+        self._file_suffix_index = self._build_suffix_index(
+            list(self.file_functions))
+        self._suffix_matches: dict[str, Optional[FunctionDefinition]] = {}
+
+        # Names joined in project order, for substring lookups.
+        self._joined_names = '\0'.join(func.name for func in self.functions)
+        self._name_offsets = []
+        offset = 0
+        for func in self.functions:
+            self._name_offsets.append(offset)
+            offset += len(func.name) + 1
+
+    @staticmethod
+    def _add_source(index: dict[str, list[tuple[CppSourceCodeFile,
+                                                FunctionDefinition]]],
+                    name: str, source_code: CppSourceCodeFile,
+                    func: FunctionDefinition) -> None:
+        """Records the first definition of a name in a source file."""
+        sources = index.setdefault(name, [])
+        if not sources or sources[-1][0] is not source_code:
+            sources.append((source_code, func))
+
+    @staticmethod
+    def _build_suffix_index(keys: list[str]) -> tuple[list[str], list[int]]:
+        """Returns the sorted reversed keys and their original positions."""
+        key_order = sorted(range(len(keys)), key=lambda i: keys[i][::-1])
+        return [keys[i][::-1] for i in key_order], key_order
+
+    @staticmethod
+    def _get_suffix_range(suffix_index: tuple[list[str], list[int]],
+                          suffix: str) -> list[int]:
+        """Returns the positions of all keys ending with `suffix`."""
+        reversed_keys, key_order = suffix_index
+        reversed_suffix = suffix[::-1]
+        start = bisect_left(reversed_keys, reversed_suffix)
+        end = bisect_left(reversed_keys, reversed_suffix + chr(0x10ffff),
+                          start)
+        return key_order[start:end]
+
+    def get_position(self, func: FunctionDefinition) -> int:
+        """Returns the position of a function in project order."""
+        return self.positions[id(func)]
+
+    def find_by_name(self, name: str) -> Optional[FunctionDefinition]:
+        """Returns the first function with the given name."""
+        return self.by_name.get(name)
+
+    def find_by_suffix(self, suffix: str) -> Optional[FunctionDefinition]:
+        """Returns the first function whose name ends with `suffix`."""
+        if suffix not in self._suffix_matches:
+            positions = self._get_suffix_range(self._name_suffix_index, suffix)
+            self._suffix_matches[suffix] = (self.functions[min(positions)]
+                                            if positions else None)
+        return self._suffix_matches[suffix]
+
+    def find_by_substring(self,
+                          substring: str) -> Optional[FunctionDefinition]:
+        """Returns the first function whose name contains `substring`."""
+        if not self.functions:
+            return None
+        offset = self._joined_names.find(substring)
+        while offset != -1:
+            # Skip occurrences spanning the separator of two names
+            idx = bisect_right(self._name_offsets, offset) - 1
+            func = self.functions[idx]
+            if offset + len(substring) <= (self._name_offsets[idx] +
+                                           len(func.name)):
+                return func
+            offset = self._joined_names.find(substring, offset + 1)
+        return None
+
+    def find_by_source_suffix_line(self, source_suffix: str,
+                                   line: int) -> Optional[FunctionDefinition]:
+        """Returns the first function of a source file ending with
+        `source_suffix` whose definition spans the given line."""
+        source_files = list(self.file_functions)
+        match_position = -1
+        for file_position in self._get_suffix_range(self._file_suffix_index,
+                                                    source_suffix):
+            source_file = source_files[file_position]
+            funcs = self.file_functions[source_file]
+            max_end_lines = self.file_max_end_lines[source_file]
+            idx = bisect_right(self.file_start_lines[source_file], line) - 1
+            while idx >= 0 and max_end_lines[idx] >= line:
+                if funcs[idx].end_line >= line:
+                    position = self.get_position(funcs[idx])
+                    if match_position == -1 or position < match_position:
+                        match_position = position
+                idx -= 1
+
+        if match_position == -1:
+            return None
+        return self.functions[match_position]
+
+    def find_source_with_func_def(
+            self, name: str
+    ) -> Optional[tuple[CppSourceCodeFile, FunctionDefinition]]:
+        """Returns the source file defining `name` and its definition, if
+        exactly one source file defines it. A qualified name match is
+        preferred over a name match, which is preferred over a match of the
+        last name component. Same as calling
+        `CppSourceCodeFile.get_function_node` on all source files."""
+        exact_matches = self.sources_by_qualified_name.get(name, [])
+        if len(exact_matches) == 1:
+            return exact_matches[0]
+
+        matches = (exact_matches + self.sources_by_name.get(name, []) +
+                   self.sources_by_name.get(name.split('::')[-1], []))
+        if matches and all(source_code is matches[0][0]
+                           for source_code, _ in matches):
+            return matches[0]
+
+        return None
+
+
 class CppProject(Project[CppSourceCodeFile]):
     """Wrapper for doing analysis of a collection of source files."""
 
-    def __init__(self, source_code_files: list[CppSourceCodeFile]):
-        super().__init__(source_code_files)
+    SUFFIX_MATCH_CALLSITES = True
+
+    def __init__(self,
+                 source_code_files: list[CppSourceCodeFile],
+                 jobs: Optional[int] = None):
+        super().__init__(source_code_files, jobs)
         self.internal_func_list: list[dict[str, Any]] = []
+        self.symbol_index = FunctionSymbolIndex(source_code_files)
 
     def get_function_from_name(self, function_name):
-        for func in self.all_functions:
-            if func.name == function_name:
-                return func
+        return self.symbol_index.find_by_name(function_name)
 
-        return None
+    def find_function_by_name(self, target_function_name, only_exact_match):
+        """Helper function to find the matching function."""
+        function = self.symbol_index.find_by_name(target_function_name)
+        if function or only_exact_match:
+            return function
+
+        return self.symbol_index.find_by_substring(target_function_name)
+
+    def get_function_by_source_suffix_line(self, target_source_file,
+                                           target_source_line):
+        """Helper function to find the matchin function by source
+        file and source file."""
+        return self.symbol_index.find_by_source_suffix_line(
+            target_source_file, target_source_line)
 
     def generate_report(self,
                         entry_function: str = '',
@@ -1116,29 +1351,32 @@ class CppProject(Project[CppSourceCodeFile]):
 
         # Process all project functions
         if not self.internal_func_list:
+            # Extracting callsites of functions
+            logger.debug('Extracing callsites')
+            self.extract_callsites(self.all_functions,
+                                   lambda func: func.extract_callsites(self))
+            logger.debug('Done extracting callsites')
+
+            # Calculating function depths
+            logger.debug('Calculating function depths')
+            self.calculate_function_depths(self.all_functions,
+                                           self._find_function_def)
+            logger.debug('Done calculating function depths')
+
             func_list = []
+            caller_index = self.get_caller_index()
             for func in self.all_functions:
                 logger.debug('Iterating %s', func.name)
-
-                # Extracting callsites of functions
-                logger.debug('Extracing callsites')
-                func.extract_callsites(self)
                 callsites = func.base_callsites
                 reached = set()
                 for cs_dst, _ in callsites:
                     reached.add(cs_dst)
-                logger.debug('Done extracting callsites')
 
                 # Calculating function uses
                 logger.debug('Calculating function uses')
-                func_uses = self._calculate_function_uses(func.name)
+                func_uses = caller_index.get_function_uses(func.name)
                 logger.debug('Done calculating function uses')
 
-                # Calculating function depth
-                logger.debug('Calculating function depth')
-                func_depth = self._calculate_function_depth(func)
-                logger.debug('Done calculating function depth')
-
                 # Storing function information
                 func_dict: dict[str, Any] = {}
                 func_dict['functionName'] = func.name
@@ -1165,14 +1403,14 @@ class CppProject(Project[CppSourceCodeFile]):
                 func_dict['assertStmts'] = func.assert_stmts
                 func_dict['Callsites'] = func.detailed_callsites
                 func_dict['functionUses'] = func_uses
-                func_dict['functionDepth'] = func_depth
+                func_dict['functionDepth'] = func.function_depth
                 func_dict['functionsReached'] = list(reached)
 
                 logger.debug('Done')
                 func_list.append(func_dict)
-            self.internal_func_list = copy.deepcopy(func_list)
+            self.internal_func_list = func_list
         else:
-            func_list = copy.deepcopy(self.internal_func_list)
+            func_list = self.internal_func_list
 
         if func_list:
             self.report['All functions'] = {}
@@ -1183,26 +1421,20 @@ class CppProject(Project[CppSourceCodeFile]):
         self.report['Fuzzer filename'] = harness_source
         _function_node_cache.clear()
 
-    def extract_calltree(self,
-                         source_file: str = '',
-                         source_code: Optional[SourceCodeFile] = None,
-                         function: Optional[str] = None,
-                         visited_functions: Optional[set[str]] = None,
-                         depth: int = 0,
-                         line_number: int = -1,
-                         other_props: Optional[dict[str, Any]] = None) -> str:
-        """Extracts calltree string of a calltree so that FI core can use it."""
+    def _extract_calltree_node(
+        self, source_file: str, source_code: Optional[SourceCodeFile],
+        function: Optional[str], visited_functions: set[str], depth: int,
+        line_number: int, other_props: Optional[dict[str, Any]]
+    ) -> tuple[str, list[tuple[str, str, int, Optional[dict[str, Any]]]]]:
+        """Returns the calltree line of a function and its callsites."""
         # pylint: disable=unused-argument
 
         # Create calltree from a given function
         # Find the function in the source code
         logger.debug('Extracting calltree for %s', str(function))
-        if not visited_functions:
-            visited_functions = set()
-
         if not function:
             logger.debug('No function')
-            return ''
+            return '', []
 
         if not source_code:
             result = self._find_source_with_func_def(function)
@@ -1216,7 +1448,7 @@ class CppProject(Project[CppSourceCodeFile]):
                 func_node = source_code.get_function_node(function)
             else:
                 logger.debug('Extracting node using lookup table.')
-                func_node = get_function_node(function, self.all_functions)
+                func_node = get_function_node(function, self.symbol_index)
 
             if func_node:
                 logger.debug('Found function node: %s', func_node.name)
@@ -1226,7 +1458,7 @@ class CppProject(Project[CppSourceCodeFile]):
                 func_name = function
         else:
             logger.debug('Could not find function')
-            return ''
+            return '', []
 
         line_to_print = '  ' * depth
         line_to_print += func_name
@@ -1248,20 +1480,12 @@ class CppProject(Project[CppSourceCodeFile]):
             if not source_code:
                 logger.debug('Not source code')
             logger.debug('Function visited or no function node')
-            return line_to_print
+            return line_to_print, []
 
         visited_functions.add(function)
         logger.debug('Iterating %s callsites', len(func_node.base_callsites))
-        for cs, line in func_node.base_callsites:
-            logger.debug('Callsite: %s', cs)
-            line_to_print += self.extract_calltree(
-                source_file=source_code.source_file,
-                function=cs,
-                visited_functions=visited_functions,
-                depth=depth + 1,
-                line_number=line)
-        logger.debug('Done')
-        return line_to_print
+        return line_to_print, [(source_code.source_file, cs, line, None)
+                               for cs, line in func_node.base_callsites]
 
     def get_reachable_functions(
             self,
@@ -1287,7 +1511,7 @@ class CppProject(Project[CppSourceCodeFile]):
 
         func_node = None
         if function:
-            func_node = get_function_node(function, self.all_functions)
+            func_node = get_function_node(function, self.symbol_index)
             if func_node:
                 func_name = func_node.name
                 prefix = func_node.namespace_or_class
@@ -1315,113 +1539,43 @@ class CppProject(Project[CppSourceCodeFile]):
 
         return visited_functions
 
-    def _calculate_function_uses(self, target_name: str) -> int:
-        """Calculate how many functions called the target function."""
-        func_use_count = 0
-
-        for source_file in self.source_code_files:
-            for function in source_file.func_defs:
-                found = False
-                for callsite in function.base_callsites:
-                    if callsite[0] == target_name:
-                        found = True
-                        break
-                    if callsite[0].endswith(target_name):
-                        found = True
-                        break
-                if found:
-                    func_use_count += 1
-
-        return func_use_count
-
-    def _calculate_function_depth(self,
-                                  target_function: FunctionDefinition) -> int:
-        """Calculate function depth of the target function."""
-
-        def _recursive_function_depth(function: FunctionDefinition) -> int:
-            if function.depth != -1:
-                return function.depth
-
-            callsites = function.base_callsites
-            if len(callsites) == 0:
-                return 0
-
-            depth = 0
-            visited.append(function.name)
-            for callsite in callsites:
-                target = self._find_source_with_func_def(callsite[0])
-                if target and target[1].name in visited:
-                    depth = max(depth, 1)
-                elif target:
-                    depth = max(depth,
-                                _recursive_function_depth(target[1]) + 1)
-                    function.depth = depth
-                else:
-                    visited.append(callsite[0])
-
-            return depth
-
-        visited: list[str] = []
-        func_depth = _recursive_function_depth(target_function)
-
-        return func_depth
-
     def _find_source_with_func_def(
             self, name: str
     ) -> Optional[tuple[CppSourceCodeFile, FunctionDefinition]]:
         """Finds the source code with a given function."""
-
-        return_func = None
-        source_codes_with_target = []
-        for source_code in self.source_code_files:
-            func = source_code.get_function_node(name, exact=True)
-            if func:
-                return_func = func
-                source_codes_with_target.append(source_code)
-
-        if len(source_codes_with_target) == 1 and return_func:
-            # We hav have, in this case it's trivial.
-            return (source_codes_with_target[0], return_func)
-
-        return_func = None
-        source_codes_with_target = []
-        for source_code in self.source_code_files:
-            func = source_code.get_function_node(name, exact=False)
-            if func:
-                return_func = func
-                source_codes_with_target.append(source_code)
-
-        if len(source_codes_with_target) == 1 and return_func:
-            # We hav have, in this case it's trivial.
-            return (source_codes_with_target[0], return_func)
-
         # TODO Handle multiple match (matching the namespace and class also
+        return self.symbol_index.find_source_with_func_def(name)
 
+    def _find_function_def(self, name: str) -> Optional[FunctionDefinition]:
+        """Finds the function definition of a given function."""
+        result = self._find_source_with_func_def(name)
+        if result:
+            return result[1]
         return None
 
 
 def load_treesitter_trees(source_files: list[str],
-                          is_log: bool = True) -> CppProject:
+                          is_log: bool = True,
+                          jobs: Optional[int] = None,
+                          cache_dir: Optional[str] = None) -> CppProject:
     """Creates treesitter trees for all files in a given list of
-    source files."""
-    results = []
-
-    for code_file in source_files:
-        if not os.path.isfile(code_file):
-            continue
-
-        try:
-            source_cls = CppSourceCodeFile('c++', code_file)
-        except RecursionError:
-            continue
-
-        if is_log:
+    source files. Unchanged source files are loaded from `cache_dir`, if
+    set."""
+    source_files = [
+        code_file for code_file in source_files if os.path.isfile(code_file)
+    ]
+    results = load_source_code_files(CppSourceCodeFile,
+                                     'c++',
+                                     source_files,
+                                     jobs=jobs,
+                                     cache_dir=cache_dir)
+
+    if is_log:
+        for source_cls in results:
             if source_cls.has_libfuzzer_harness():
-                logger.info('harness: %s', code_file)
+                logger.info('harness: %s', source_cls.source_file)
 
-        results.append(source_cls)
-
-    return CppProject(results)
+    return CppProject(results, jobs)
 
 
 def analyse_source_code(source_content: str) -> CppSourceCodeFile:
@@ -1433,7 +1587,7 @@ def analyse_source_code(source_content: str) -> CppSourceCodeFile:
 
 
 def get_function_node(target_name: str,
-                      function_list: list[FunctionDefinition],
+                      symbol_index: FunctionSymbolIndex,
                       one_layer_only: bool = False,
                       namespace: str = '') -> Optional[FunctionDefinition]:
     """Helper to retrieve the RustFunction object of a function."""
@@ -1443,19 +1597,19 @@ def get_function_node(target_name: str,
         return _function_node_cache[cache_key]
 
     logger.debug('Finding match for %s', target_name)
-    for function in function_list:
-        if target_name == function.name:
-            logger.debug('Found exact match')
-            _function_node_cache[cache_key] = function
-            return function
+    function = symbol_index.find_by_name(target_name)
+    if function:
+        logger.debug('Found exact match')
+        _function_node_cache[cache_key] = function
+        return function
 
     if namespace:
         logger.debug('Finding function within namespace %s', namespace)
-        for function in function_list:
-            if namespace + '::' + target_name == function.name:
-                logger.debug('Found namespace match')
-                _function_node_cache[cache_key] = function
-                return function
+        function = symbol_index.find_by_name(namespace + '::' + target_name)
+        if function:
+            logger.debug('Found namespace match')
+            _function_node_cache[cache_key] = function
+            return function
 
     # Exact match
     # if target_name in function_map:
@@ -1479,11 +1633,11 @@ def get_function_node(target_name: str,
 
     for count in range(len(name_split)):
         logger.debug('Testing %s', '::'.join(name_split[count:]))
-        for func in function_list:
-            if func.name.endswith('::'.join(name_split[count:])):
-                logger.debug('Found match: %s', func.name)
-                _function_node_cache[cache_key] = func
-                return func
+        func = symbol_index.find_by_suffix('::'.join(name_split[count:]))
+        if func:
+            logger.debug('Found match: %s', func.name)
+            _function_node_cache[cache_key] = func
+            return func
 
     logger.debug('Found no matching function node')
     return None
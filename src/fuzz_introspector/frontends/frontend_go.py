@@ -17,11 +17,13 @@
 
 from typing import Any, Optional
 
-from tree_sitter import Language, Node
+from tree_sitter import Node
 
 import logging
 
-from fuzz_introspector.frontends.datatypes import Project, SourceCodeFile
+from fuzz_introspector.frontends.datatypes import (CallerIndex, NodeWrapper,
+                                                   Project, SourceCodeFile,
+                                                   load_source_code_files)
 
 logger = logging.getLogger(name=__name__)
 
@@ -62,8 +64,7 @@ class GoSourceCodeFile(SourceCodeFile):
         function_res = func_query.captures(self.root)
         for _, funcs in function_res.items():
             for func in funcs:
-                self.functions.append(
-                    FunctionMethod(func, self.tree_sitter_lang, self, True))
+                self.functions.append(FunctionMethod(func, self, True))
 
     def _set_method_declaration(self):
         """Internal helper for retrieving all methods."""
@@ -73,8 +74,7 @@ class GoSourceCodeFile(SourceCodeFile):
         function_res = func_query.captures(self.root)
         for _, funcs in function_res.items():
             for func in funcs:
-                self.methods.append(
-                    FunctionMethod(func, self.tree_sitter_lang, self, False))
+                self.methods.append(FunctionMethod(func, self, False))
 
     def _set_imports(self):
         """Internal helper for retrieving all imports."""
@@ -157,18 +157,30 @@ class GoSourceCodeFile(SourceCodeFile):
 class GoProject(Project[GoSourceCodeFile]):
     """Wrapper for doing analysis of a collection of source files."""
 
-    def __init__(self, source_code_files: list[GoSourceCodeFile]):
-        super().__init__(source_code_files)
+    def __init__(self,
+                 source_code_files: list[GoSourceCodeFile],
+                 jobs: Optional[int] = None):
+        super().__init__(source_code_files, jobs)
 
-        full_functions_methods = [
+        self.full_functions_methods = [
             item for src in source_code_files
             for item in src.functions + src.methods
         ]
         self.functions_methods_map = {
             item.name: item
-            for item in full_functions_methods
+            for item in self.full_functions_methods
         }
 
+    def _extract_function_callsites(self, func_def: 'FunctionMethod'):
+        """Extracts the local variable types and callsites of a function."""
+        func_def.extract_local_variable_type(self.functions_methods_map)
+        # Need a second pass because the processing may out of order
+        # That could affect some local variable types that are
+        # relying on other variables
+        func_def.extract_local_variable_type(self.functions_methods_map)
+
+        func_def.extract_callsites(self.functions_methods_map)
+
     def generate_report(self,
                         entry_function: str = '',
                         harness_name: str = '',
@@ -193,17 +205,16 @@ class GoProject(Project[GoSourceCodeFile]):
                 source_code.get_defined_function_names(),
             })
 
+        self.extract_callsites(self.full_functions_methods,
+                               self._extract_function_callsites)
+
+        # Function uses need the callsites of all functions
+        caller_index = CallerIndex(list(self.functions_methods_map.values()))
+        self.calculate_function_depths(self.full_functions_methods,
+                                       self.functions_methods_map.get)
+        for source_code in self.source_code_files:
             functions_methods = source_code.functions + source_code.methods
             for func_def in functions_methods:
-                func_def.extract_local_variable_type(
-                    self.functions_methods_map)
-                # Need a second pass because the processing may out of order
-                # That could affect some local variable types that are
-                # relying on other variables
-                func_def.extract_local_variable_type(
-                    self.functions_methods_map)
-
-                func_def.extract_callsites(self.functions_methods_map)
                 func_dict: dict[str, Any] = {}
                 func_dict['functionName'] = func_def.name
                 func_dict['functionSourceFile'] = source_code.source_file
@@ -224,9 +235,8 @@ class GoProject(Project[GoSourceCodeFile]):
                 func_dict['BranchProfiles'] = []
                 func_dict['Callsites'] = func_def.detailed_callsites
                 func_dict['functionUses'] = func_def.get_function_uses(
-                    list(self.functions_methods_map.values()))
-                func_dict['functionDepth'] = func_def.get_function_depth(
-                    list(self.functions_methods_map.values()))
+                    caller_index)
+                func_dict['functionDepth'] = func_def.function_depth
                 func_dict['constantsTouched'] = []
                 func_dict['BBCount'] = 0
                 func_dict['signature'] = func_def.sig
@@ -247,26 +257,20 @@ class GoProject(Project[GoSourceCodeFile]):
 
         self.report = report
 
-    def extract_calltree(self,
-                         source_file: str = '',
-                         source_code: Optional[SourceCodeFile] = None,
-                         function: Optional[str] = None,
-                         visited_functions: Optional[set[str]] = None,
-                         depth: int = 0,
-                         line_number: int = -1,
-                         other_props: Optional[dict[str, Any]] = None) -> str:
-        """Extracts calltree string of a calltree so that FI core can use it."""
+    def _extract_calltree_node(
+        self, source_file: str, source_code: Optional[SourceCodeFile],
+        function: Optional[str], visited_functions: set[str], depth: int,
+        line_number: int, other_props: Optional[dict[str, Any]]
+    ) -> tuple[str, list[tuple[str, str, int, Optional[dict[str, Any]]]]]:
+        """Returns the calltree line of a function and its callsites."""
         # pylint: disable=unused-argument
-        if not visited_functions:
-            visited_functions = set()
-
         if not function:
             if not source_code:
-                return ''
+                return '', []
             function = source_code.get_entry_function_name()
 
         if not function:
-            return ''
+            return '', []
 
         line_to_print = '  ' * depth
         line_to_print += function
@@ -281,24 +285,18 @@ class GoProject(Project[GoSourceCodeFile]):
 
         line_to_print += '\n'
         if not source_code:
-            return line_to_print
+            return line_to_print, []
 
         func = source_code.get_function_node(function)
         if not func:
-            return line_to_print
+            return line_to_print, []
 
         if function in visited_functions:
-            return line_to_print
+            return line_to_print, []
 
         visited_functions.add(function)
-        for cs, line in func.base_callsites:
-            line_to_print += self.extract_calltree(
-                source_code.source_file,
-                function=cs,
-                visited_functions=visited_functions,
-                depth=depth + 1,
-                line_number=line)
-        return line_to_print
+        return line_to_print, [(source_code.source_file, cs, line, None)
+                               for cs, line in func.base_callsites]
 
     def get_reachable_functions(
             self,
@@ -348,13 +346,12 @@ class GoProject(Project[GoSourceCodeFile]):
         return None
 
 
-class FunctionMethod():
+class FunctionMethod(NodeWrapper):
     """Wrapper for a General Declaration for function/method"""
 
-    def __init__(self, root: Node, tree_sitter_lang: Language,
-                 source_code: GoSourceCodeFile, is_function: bool):
+    def __init__(self, root: Node, source_code: GoSourceCodeFile,
+                 is_function: bool):
         self.root = root
-        self.tree_sitter_lang = tree_sitter_lang
         self.parent_source = source_code
         self.is_function = is_function
 
@@ -387,59 +384,13 @@ class FunctionMethod():
         # Process icount
         self._process_icount()
 
-    def function_source_code_as_text(self) -> str:
-        """Returns the source code the function."""
-        if self.root and self.root.text:
-            return self.root.text.decode(encoding='utf-8', errors='ignore')
-
-        return ''
-
-    def get_function_uses(self,
-                          all_funcs_meths: list['FunctionMethod']) -> int:
+    def get_function_uses(self, caller_index: CallerIndex) -> int:
         """Calculate how many function called this function."""
         if not self.function_uses:
-            for func in all_funcs_meths:
-                found = False
-                for callsite in func.base_callsites:
-                    if callsite[0] == self.name:
-                        found = True
-                        break
-                if found:
-                    self.function_uses += 1
+            self.function_uses = caller_index.get_function_uses(self.name)
 
         return self.function_uses
 
-    def get_function_depth(self,
-                           all_funcs_meths: list['FunctionMethod']) -> int:
-        """Calculate function depth of this function."""
-
-        if self.function_depth:
-            return self.function_depth
-
-        visited: list[str] = []
-        func_meth_dict = {f.name: f for f in all_funcs_meths}
-
-        def _recursive_function_depth(func_meth: FunctionMethod) -> int:
-            callsites = func_meth.base_callsites
-            if len(callsites) == 0:
-                return 0
-
-            visited.append(func_meth.name)
-            depth = 0
-            for callsite in callsites:
-                target = func_meth_dict.get(callsite[0])
-                if callsite[0] in visited:
-                    depth = max(depth, 1)
-                elif target:
-                    depth = max(depth, _recursive_function_depth(target) + 1)
-                else:
-                    visited.append(callsite[0])
-
-            return depth
-
-        self.function_depth = _recursive_function_depth(self)
-        return self.function_depth
-
     def _process_properties(self):
         """Process properties."""
 
@@ -800,25 +751,30 @@ class FunctionMethod():
         callsites = sorted(callsites, key=lambda x: x[1][0])
         self.base_callsites = [(x[0], x[2]) for x in callsites]
         # Process detailed callsites
+        self.detailed_callsites = []
         for dst, src_line in self.base_callsites:
             src_loc = f'{self.parent_source.source_file}:{src_line},1'
             self.detailed_callsites.append({'Src': src_loc, 'Dst': dst})
 
 
 def load_treesitter_trees(source_files: list[str],
-                          is_log: bool = True) -> GoProject:
+                          is_log: bool = True,
+                          jobs: Optional[int] = None,
+                          cache_dir: Optional[str] = None) -> GoProject:
     """Creates treesitter trees for all files in a given list of source
-    files."""
-    results = []
-
-    for code_file in source_files:
-        source_cls = GoSourceCodeFile('go', code_file)
-        if is_log:
+    files. Unchanged source files are loaded from `cache_dir`, if set."""
+    results = load_source_code_files(GoSourceCodeFile,
+                                     'go',
+                                     source_files,
+                                     jobs=jobs,
+                                     cache_dir=cache_dir)
+
+    if is_log:
+        for source_cls in results:
             if source_cls.has_libfuzzer_harness():
-                logger.info('harness: %s', code_file)
-        results.append(source_cls)
+                logger.info('harness: %s', source_cls.source_file)
 
-    return GoProject(results)
+    return GoProject(results, jobs)
 
 
 def analyse_source_code(source_content: str) -> GoSourceCodeFile:
@@ -17,11 +17,13 @@
 
 from typing import Any, Optional
 
-from tree_sitter import Language, Node
+from tree_sitter import Node
 
 import logging
 
-from fuzz_introspector.frontends.datatypes import Project, SourceCodeFile
+from fuzz_introspector.frontends.datatypes import (NodeWrapper, Project,
+                                                   SourceCodeFile,
+                                                   load_source_code_files)
 
 logger = logging.getLogger(name=__name__)
 
@@ -111,8 +113,7 @@ class JvmSourceCodeFile(SourceCodeFile):
         """Internal helper for retrieving all classes."""
         for node in self.root.children:
             if node.type in ['class_declaration', 'interface_declaration']:
-                self.classes.append(
-                    JavaClassInterface(node, self.tree_sitter_lang, self))
+                self.classes.append(JavaClassInterface(node, self))
 
     def _set_import_declaration(self):
         """Internal helper for retrieving all import."""
@@ -214,7 +215,7 @@ class JvmSourceCodeFile(SourceCodeFile):
         return False
 
 
-class JavaMethod():
+class JavaMethod(NodeWrapper):
     """Wrapper for a General Declaration for method"""
 
     def __init__(self,
@@ -224,7 +225,6 @@ class JavaMethod():
                  is_default_constructor: bool = False):
         self.root = root
         self.class_interface = class_interface
-        self.tree_sitter_lang = self.class_interface.tree_sitter_lang
         self.parent_source: Optional[
             JvmSourceCodeFile] = self.class_interface.parent_source
         self.is_constructor = is_constructor
@@ -260,7 +260,6 @@ class JavaMethod():
         self.is_entry_method = False
 
         # Other properties
-        self.stmts: list[Node] = []
         self.var_map: dict[str, str] = {}
 
         if not self.is_default_constructor:
@@ -270,13 +269,6 @@ class JavaMethod():
             # Process statements
             self._process_statements()
 
-    def function_source_code_as_text(self) -> str:
-        """Returns the source code the function."""
-        if self.root and self.root.text:
-            return self.root.text.decode(encoding='utf-8', errors='ignore')
-
-        return ''
-
     def post_process_full_qualified_name(self):
         """Post process the full qualified name for types."""
         # Refine argument types
@@ -361,13 +353,6 @@ class JavaMethod():
                 self.return_type = child.text.decode(encoding='utf-8',
                                                      errors='ignore')
 
-            # Process body and store statment nodes
-            elif child.type in ['block', 'constructor_body']:
-                for stmt in child.children:
-                    if stmt.type not in ['{', '}'
-                                         ] and 'comment' not in stmt.type:
-                        self.stmts.append(stmt)
-
             # Process exceptions
             elif child.type == 'throws':
                 for exception in child.children:
@@ -376,9 +361,22 @@ class JavaMethod():
                             exception.text.decode(encoding='utf-8',
                                                   errors='ignore'))
 
+    def _get_statements(self) -> list[Node]:
+        """Returns the statement nodes of the method body."""
+        stmts = []
+        if not self.is_default_constructor:
+            for child in self.root.children:
+                if child.type in ['block', 'constructor_body']:
+                    for stmt in child.children:
+                        if stmt.type not in ['{', '}'
+                                             ] and 'comment' not in stmt.type:
+                            stmts.append(stmt)
+
+        return stmts
+
     def _process_statements(self):
         """Loop through all statements and process them."""
-        for stmt in self.stmts:
+        for stmt in self._get_statements():
             self._process_complexity(stmt)
             self._process_icount(stmt)
 
@@ -831,10 +829,10 @@ class JavaMethod():
 
         if not self.base_callsites:
             callsites = []
-            for stmt in self.stmts:
+            for stmt in self._get_statements():
                 callsites.extend(self._process_callsites(stmt, classes)[1])
             if self.is_constructor:
-                for stmt in self.class_interface.constructor_callsites:
+                for stmt in self.class_interface.get_constructor_callsites():
                     callsites.extend(self._process_callsites(stmt, classes)[1])
             callsites = sorted(set(callsites), key=lambda x: x[1])
             self.base_callsites = [(x[0], x[2]) for x in callsites]
@@ -845,17 +843,15 @@ class JavaMethod():
                 self.detailed_callsites.append({'Src': src_loc, 'Dst': dst})
 
 
-class JavaClassInterface():
+class JavaClassInterface(NodeWrapper):
     """Wrapper for a General Declaration for java classes"""
 
     def __init__(self,
                  root: Node,
-                 tree_sitter_lang: Language,
                  source_code: JvmSourceCodeFile,
                  parent: Optional['JavaClassInterface'] = None):
         self.root = root
         self.parent = parent
-        self.tree_sitter_lang = tree_sitter_lang
         self.parent_source = source_code
 
         if self.parent:
@@ -873,7 +869,6 @@ class JavaClassInterface():
         self.class_fields: dict[str, str] = {}
         self.super_class = 'Object'
         self.super_interfaces: list[str] = []
-        self.constructor_callsites: list[Node] = []
 
         # Process the class/interface tree
         inner_class_nodes = self._process_node()
@@ -885,6 +880,27 @@ class JavaClassInterface():
         if not self._has_constructor_defined():
             self.methods.append(JavaMethod(self.root, self, True, True))
 
+    def get_constructor_callsites(self) -> list[Node]:
+        """Returns the field declarator nodes of the class, which hold the
+        callsites of the field initialisers run by the constructors."""
+        callsites: list[Node] = []
+        for child in self.root.children:
+            if child.type not in ['class_body', 'interface_body']:
+                continue
+
+            for body in child.children:
+                if body.type != 'field_declaration':
+                    continue
+
+                type_node = body.child_by_field_name('type')
+                if not type_node or not type_node.text:
+                    continue
+
+                callsites.extend(field for field in body.children
+                                 if field.type == 'variable_declarator')
+
+        return callsites
+
     def add_package_to_class_name(self, name: str) -> Optional[str]:
         """Helper for finding a specific class name."""
         if self.name == f'{self.package}.{name.rsplit(".")[-1]}':
@@ -994,7 +1010,6 @@ class JavaClassInterface():
                         ]
                         for field in fields:
                             # Process field_name
-                            self.constructor_callsites.append(field)
                             name_node = field.child_by_field_name('name')
 
                         if name_node and name_node.text and field_type:
@@ -1014,8 +1029,7 @@ class JavaClassInterface():
         """Internal helper to recursively process inner classes"""
         for node in inner_class_nodes:
             self.inner_classes.append(
-                JavaClassInterface(node, self.tree_sitter_lang,
-                                   self.parent_source, self))
+                JavaClassInterface(node, self.parent_source, self))
 
     def _has_constructor_defined(self) -> bool:
         """Helper method to determine if any constructor is defined."""
@@ -1070,8 +1084,10 @@ class JavaClassInterface():
 class JvmProject(Project[JvmSourceCodeFile]):
     """Wrapper for doing analysis of a collection of source files."""
 
-    def __init__(self, source_code_files: list[JvmSourceCodeFile]):
-        super().__init__(source_code_files)
+    def __init__(self,
+                 source_code_files: list[JvmSourceCodeFile],
+                 jobs: Optional[int] = None):
+        super().__init__(source_code_files, jobs)
         self.all_classes = []
         for source_code in self.source_code_files:
             self.all_classes.extend(source_code.classes)
@@ -1114,11 +1130,18 @@ class JvmProject(Project[JvmSourceCodeFile]):
             project_methods.extend(methods.values())
 
         # Extract callsites of methods
-        for method in project_methods:
-            method.extract_callsites(all_classes)
+        self.extract_callsites(
+            project_methods,
+            lambda method: method.extract_callsites(all_classes))
+
+        # Store method list to all_functions for the project
+        self.all_functions = project_methods[:]
 
         # Process all project methods
         method_list = []
+        caller_index = self.get_caller_index()
+        method_map = {method.name: method for method in project_methods}
+        self.calculate_function_depths(project_methods, method_map.get)
         for method in project_methods:
             method_dict: dict[str, Any] = {}
 
@@ -1145,10 +1168,9 @@ class JvmProject(Project[JvmSourceCodeFile]):
             method_dict['returnType'] = method.return_type
             method_dict['BranchProfiles'] = []
             method_dict['Callsites'] = method.detailed_callsites
-            method_dict['functionUses'] = self.calculate_method_uses(
-                method.name, project_methods)
-            method_dict['functionDepth'] = self.calculate_method_depth(
-                method, project_methods)
+            method_dict['functionUses'] = caller_index.get_function_uses(
+                method.name)
+            method_dict['functionDepth'] = method.function_depth
             method_dict['constantsTouched'] = []
             method_dict['BBCount'] = 0
             method_dict['signature'] = method.sig
@@ -1186,9 +1208,6 @@ class JvmProject(Project[JvmSourceCodeFile]):
             report['All functions'] = {}
             report['All functions']['Elements'] = method_list
 
-        # Store method list to all_functions for the project
-        self.all_functions = project_methods[:]
-
         # Store report to avoid regeneration
         self.report = report
 
@@ -1201,61 +1220,12 @@ class JvmProject(Project[JvmSourceCodeFile]):
 
         return None
 
-    def calculate_method_uses(self, target_name: str,
-                              all_methods: list[JavaMethod]) -> int:
-        """Calculate how many method called the target method."""
-        method_use_count = 0
-        for method in all_methods:
-            found = False
-            for callsite in method.base_callsites:
-                if callsite[0] == target_name:
-                    found = True
-                    break
-            if found:
-                method_use_count += 1
-
-        return method_use_count
-
-    def calculate_method_depth(self, target_method: JavaMethod,
-                               all_methods: list[JavaMethod]) -> int:
-        """Calculate method depth of the target method."""
-
-        def _recursive_method_depth(method: JavaMethod) -> int:
-            callsites = method.base_callsites
-            if len(callsites) == 0:
-                return 0
-
-            depth = 0
-            visited.append(method.name)
-            for callsite in callsites:
-                target = method_dict.get(callsite[0])
-                if callsite[0] in visited:
-                    depth = max(depth, 1)
-                elif target:
-                    depth = max(depth, _recursive_method_depth(target) + 1)
-                else:
-                    visited.append(callsite[0])
-
-            return depth
-
-        visited: list[str] = []
-        method_dict = {method.name: method for method in all_methods}
-        method_depth = _recursive_method_depth(target_method)
-
-        return method_depth
-
-    def extract_calltree(self,
-                         source_file: str = '',
-                         source_code: Optional[SourceCodeFile] = None,
-                         function: Optional[str] = None,
-                         visited_functions: Optional[set[str]] = None,
-                         depth: int = 0,
-                         line_number: int = -1,
-                         other_props: Optional[dict[str, Any]] = None) -> str:
-        """Extracts calltree string of a calltree so that FI core can use it."""
-        if not visited_functions:
-            visited_functions = set()
-
+    def _extract_calltree_node(
+        self, source_file: str, source_code: Optional[SourceCodeFile],
+        function: Optional[str], visited_functions: set[str], depth: int,
+        line_number: int, other_props: Optional[dict[str, Any]]
+    ) -> tuple[str, list[tuple[str, str, int, Optional[dict[str, Any]]]]]:
+        """Returns the calltree line of a function and its callsites."""
         if function and '].' not in function:
             function = None
 
@@ -1269,7 +1239,7 @@ class JvmProject(Project[JvmSourceCodeFile]):
                 function = source_code.get_entry_method_name(True)
 
         if not function:
-            return ''
+            return '', []
 
         line_to_print = '  ' * depth
         line_to_print += function
@@ -1280,27 +1250,20 @@ class JvmProject(Project[JvmSourceCodeFile]):
         line_to_print += '\n'
 
         if not source_code or not isinstance(source_code, JvmSourceCodeFile):
-            return line_to_print
+            return line_to_print, []
 
         function_node = source_code.get_method_node(function)
         if not function_node:
-            return line_to_print
+            return line_to_print, []
 
         callsites = function_node.base_callsites
 
         if function in visited_functions:
-            return line_to_print
+            return line_to_print, []
 
         visited_functions.add(function)
-        for cs, line in callsites:
-            line_to_print += self.extract_calltree(
-                source_code.source_file,
-                function=cs,
-                visited_functions=visited_functions,
-                depth=depth + 1,
-                line_number=line)
-
-        return line_to_print
+        return line_to_print, [(source_code.source_file, cs, line, None)
+                               for cs, line in callsites]
 
     def get_source_codes_with_harnesses(self) -> list[JvmSourceCodeFile]:
         return super().get_source_codes_with_harnesses()
@@ -1352,19 +1315,25 @@ class JvmProject(Project[JvmSourceCodeFile]):
 
 def load_treesitter_trees(source_files: list[str],
                           entrypoint: str,
-                          is_log: bool = True) -> JvmProject:
+                          is_log: bool = True,
+                          jobs: Optional[int] = None,
+                          cache_dir: Optional[str] = None) -> JvmProject:
     """Creates treesitter trees for all files in a given list of
-    source files."""
-    results = []
-
-    for code_file in source_files:
-        source_cls = JvmSourceCodeFile('jvm', code_file, entrypoint)
-        if is_log:
+    source files. Unchanged source files are loaded from `cache_dir`, if
+    set."""
+    results = load_source_code_files(JvmSourceCodeFile,
+                                     'jvm',
+                                     source_files,
+                                     entrypoint,
+                                     jobs=jobs,
+                                     cache_dir=cache_dir)
+
+    if is_log:
+        for source_cls in results:
             if source_cls.has_libfuzzer_harness():
-                logger.info('harness: %s', code_file)
-        results.append(source_cls)
+                logger.info('harness: %s', source_cls.source_file)
 
-    return JvmProject(results)
+    return JvmProject(results, jobs)
 
 
 def analyse_source_code(source_content: str) -> JvmSourceCodeFile:
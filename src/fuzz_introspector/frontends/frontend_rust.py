@@ -17,7 +17,7 @@
 
 from typing import Any, Optional
 
-from tree_sitter import Language, Node
+from tree_sitter import Node
 
 import logging
 import yaml
@@ -54,8 +54,7 @@ class RustSourceCodeFile(datatypes.SourceCodeFile):
 
             # Handle general functions
             if node.type == 'function_item':
-                self.functions.append(
-                    RustFunction(node, self.tree_sitter_lang, self, prefix))
+                self.functions.append(RustFunction(node, self, prefix))
 
             # Handle impl methods
             elif node.type == 'impl_item':
@@ -75,9 +74,7 @@ class RustSourceCodeFile(datatypes.SourceCodeFile):
                 for impl in impl_body.children:
                     # Handle general methods in this impl
                     if impl.type == 'function_item':
-                        self.functions.append(
-                            RustFunction(impl, self.tree_sitter_lang, self,
-                                         prefix))
+                        self.functions.append(RustFunction(impl, self, prefix))
 
                     # Handles inner impl
                     elif impl.type == 'impl_item':
@@ -100,9 +97,7 @@ class RustSourceCodeFile(datatypes.SourceCodeFile):
                 for mod in mod_body.children:
                     # Handle general function in this mod
                     if mod.type == 'function_item':
-                        self.functions.append(
-                            RustFunction(mod, self.tree_sitter_lang, self,
-                                         prefix))
+                        self.functions.append(RustFunction(mod, self, prefix))
                     # Handles inner impl
                     elif mod.type == 'impl_item':
                         self._set_function_method_declaration(mod, prefix)
@@ -132,16 +127,14 @@ class RustSourceCodeFile(datatypes.SourceCodeFile):
                 for trait in trait_body.children:
                     # Handle general methods in this trait
                     if trait.type == 'function_item':
-                        self.functions.append(
-                            RustFunction(trait, self.tree_sitter_lang, self,
-                                         prefix))
+                        self.functions.append(RustFunction(
+                            trait, self, prefix))
 
             # Handling for fuzzing harness entry point macro invocation
             elif node.type == 'expression_statement':
                 for macro in node.children:
                     if macro.type == 'macro_invocation':
                         rust_function = RustFunction(macro,
-                                                     self.tree_sitter_lang,
                                                      self,
                                                      prefix,
                                                      is_macro=True)
@@ -162,11 +155,7 @@ class RustSourceCodeFile(datatypes.SourceCodeFile):
 
             # Handling macro definition
             elif node.type == 'macro_definition':
-                rust_function = RustFunction(node,
-                                             self.tree_sitter_lang,
-                                             self,
-                                             prefix,
-                                             is_macro=True)
+                rust_function = RustFunction(node, self, prefix, is_macro=True)
                 self.functions.append(rust_function)
             # TODO handle static_item / const_item
 
@@ -229,17 +218,15 @@ class RustSourceCodeFile(datatypes.SourceCodeFile):
         return None
 
 
-class RustFunction():
+class RustFunction(datatypes.NodeWrapper):
     """Wrapper for a General Declaration for function"""
 
     def __init__(self,
                  root: Node,
-                 tree_sitter_lang: Language,
                  source_code: RustSourceCodeFile,
                  prefix: list[str],
                  is_macro: bool = False):
         self.root = root
-        self.tree_sitter_lang = tree_sitter_lang
         self.parent_source = source_code
         self.prefix = prefix
         self.is_macro = is_macro
@@ -261,8 +248,6 @@ class RustFunction():
         self.base_callsites: list[tuple[str, int]] = []
         self.detailed_callsites: list[dict[str, str]] = []
         self.is_entry_method = False
-        self.stmts: list[Node] = []
-        self.fuzzing_token_tree = None
         self.var_map: dict[str, str] = {}
 
         # Process method declaration
@@ -280,13 +265,6 @@ class RustFunction():
         # Process instr count
         self._process_icount()
 
-    def function_source_code_as_text(self) -> str:
-        """Returns the source code the function."""
-        if self.root and self.root.text:
-            return self.root.text.decode(encoding='utf-8', errors='ignore')
-
-        return ''
-
     def _process_declaration(self):
         """Internal helper to process the function/method declaration."""
         # Process name
@@ -327,13 +305,10 @@ class RustFunction():
         body = self.root.child_by_field_name('body')
         if body:
             for stmt in body.children:
-                if 'expression' in stmt.type or 'declaration' in stmt.type:
-                    self.stmts.append(stmt)
-                elif stmt.type == 'function_item':
+                if stmt.type == 'function_item':
                     # Handle inner function:
                     self.parent_source.functions.append(
-                        RustFunction(stmt, self.tree_sitter_lang,
-                                     self.parent_source, self.name))
+                        RustFunction(stmt, self.parent_source, self.name))
 
     def _process_macro_declaration(self):
         """Internal helper to process the macro declaration for fuzzing
@@ -346,26 +321,46 @@ class RustFunction():
                 if self.name == 'fuzz_target':
                     self.is_entry_method = True
 
-            # Store token tree
-            elif child.type == 'token_tree':
+    def _get_statements(self) -> list[Node]:
+        """Returns the statement nodes of the function body."""
+        stmts = []
+        body = None if self.is_macro else self.root.child_by_field_name('body')
+        if body:
+            for stmt in body.children:
+                if 'expression' in stmt.type or 'declaration' in stmt.type:
+                    stmts.append(stmt)
+
+        return stmts
+
+    def _get_fuzzing_token_tree(self) -> Optional[Node]:
+        """Parses the token tree of the macro, if any."""
+        fuzzing_token_tree = None
+        if not self.is_macro:
+            return fuzzing_token_tree
+
+        for child in self.root.children:
+            # Parse token tree
+            if child.type == 'token_tree':
                 for token_tree in child.children:
-                    if token_tree.type == 'token_tree':
+                    if token_tree.type == 'token_tree' and token_tree.text:
                         content = token_tree.text.decode(encoding='utf-8',
                                                          errors='ignore')
                         if content.startswith('{'):
                             cbytes = content.encode('utf-8')
                             root = self.parent_source.parser.parse(cbytes)
-                            self.fuzzing_token_tree = root.root_node
+                            fuzzing_token_tree = root.root_node
 
             elif child.type == 'macro_rule':
-                token_tree = child.child_by_field_name('right')
-                if token_tree:
-                    content = token_tree.text.decode(encoding='utf-8',
-                                                     errors='ignore')
+                rule_tree = child.child_by_field_name('right')
+                if rule_tree and rule_tree.text:
+                    content = rule_tree.text.decode(encoding='utf-8',
+                                                    errors='ignore')
                     if content.startswith('{'):
                         cbytes = content.encode('utf-8')
                         root = self.parent_source.parser.parse(cbytes)
-                        self.fuzzing_token_tree = root.root_node
+                        fuzzing_token_tree = root.root_node
+
+        return fuzzing_token_tree
 
     def _process_variables(self):
         """Process variable declaration and store them for reference."""
@@ -403,11 +398,8 @@ class RustFunction():
                 count += _traverse_node_complexity(item)
             return count
 
-        if self.fuzzing_token_tree:
-            self.complexity += _traverse_node_complexity(
-                self.fuzzing_token_tree)
-        else:
-            self.complexity += _traverse_node_complexity(self.root)
+        self.complexity += _traverse_node_complexity(
+            self._get_fuzzing_token_tree() or self.root)
 
     def _process_icount(self):
         """Get a pseudo measurement of instruction count."""
@@ -420,10 +412,8 @@ class RustFunction():
                 count += _traverse_node_instr_count(item)
             return count
 
-        if self.fuzzing_token_tree:
-            self.icount += _traverse_node_instr_count(self.fuzzing_token_tree)
-        else:
-            self.icount += _traverse_node_instr_count(self.root)
+        self.icount += _traverse_node_instr_count(
+            self._get_fuzzing_token_tree() or self.root)
 
     def extract_callsites(self, functions: dict[str, 'RustFunction']):
         """Extract callsites."""
@@ -599,10 +589,11 @@ class RustFunction():
 
         if not self.base_callsites:
             callsites = []
-            if self.fuzzing_token_tree:
-                callsites.extend(_process_token_tree(self.fuzzing_token_tree))
+            fuzzing_token_tree = self._get_fuzzing_token_tree()
+            if fuzzing_token_tree:
+                callsites.extend(_process_token_tree(fuzzing_token_tree))
             else:
-                for stmt in self.stmts:
+                for stmt in self._get_statements():
                     callsites.extend(_process_callsites(stmt))
             callsites = sorted(set(callsites), key=lambda x: x[1])
 
@@ -624,8 +615,12 @@ class RustFunction():
 class RustProject(datatypes.Project[RustSourceCodeFile]):
     """Wrapper for doing analysis of a collection of source files."""
 
-    def __init__(self, source_code_files: list[RustSourceCodeFile]):
-        super().__init__(source_code_files)
+    SUFFIX_MATCH_CALLSITES = True
+
+    def __init__(self,
+                 source_code_files: list[RustSourceCodeFile],
+                 jobs: Optional[int] = None):
+        super().__init__(source_code_files, jobs)
 
     def generate_report(self,
                         entry_function: str = '',
@@ -668,9 +663,15 @@ class RustProject(datatypes.Project[RustSourceCodeFile]):
         # Process all project functions
         func_list = []
         self.all_functions = list(self.all_functions_dict.values())
+        self.extract_callsites(
+            self.all_functions,
+            lambda func: func.extract_callsites(self.all_functions_dict))
+
+        caller_index = self.get_caller_index()
+        self.calculate_function_depths(
+            self.all_functions, lambda name: get_function_node(
+                name, self.all_functions_dict, True))
         for func in self.all_functions:
-            func.extract_callsites(self.all_functions_dict)
-
             func_dict: dict[str, Any] = {}
             func_dict['functionName'] = func.name
             func_dict['functionSourceFile'] = func.parent_source.source_file
@@ -690,10 +691,9 @@ class RustProject(datatypes.Project[RustSourceCodeFile]):
             func_dict['returnType'] = func.return_type
             func_dict['BranchProfiles'] = []
             func_dict['Callsites'] = func.detailed_callsites
-            func_dict['functionUses'] = self.calculate_function_uses(
-                func.name, self.all_functions)
-            func_dict['functionDepth'] = self.calculate_function_depth(
-                func, self.all_functions_dict)
+            func_dict['functionUses'] = caller_index.get_function_uses(
+                func.name)
+            func_dict['functionDepth'] = func.function_depth
             func_dict['constantsTouched'] = []
             func_dict['BBCount'] = 0
             func_dict['signature'] = func.sig
@@ -737,62 +737,13 @@ class RustProject(datatypes.Project[RustSourceCodeFile]):
 
         return None
 
-    def calculate_function_uses(self, target_name: str,
-                                all_functions: list[RustFunction]) -> int:
-        """Calculate how many functions called the target function."""
-        func_use_count = 0
-        for function in all_functions:
-            found = False
-            for callsite in function.base_callsites:
-                if callsite[0] == target_name:
-                    found = True
-                    break
-                if callsite[0].endswith(target_name):
-                    found = True
-                    break
-            if found:
-                func_use_count += 1
-
-        return func_use_count
-
-    def calculate_function_depth(
-            self, target_function: RustFunction,
-            all_functions: dict[str, RustFunction]) -> int:
-        """Calculate function depth of the target function."""
-
-        def _recursive_function_depth(function: RustFunction) -> int:
-            callsites = function.base_callsites
-            if len(callsites) == 0:
-                return 0
-
-            depth = 0
-            visited.append(function.name)
-            for callsite in callsites:
-                target = get_function_node(callsite[0], all_functions, True)
-                if target and target.name in visited:
-                    depth = max(depth, 1)
-                elif target:
-                    depth = max(depth, _recursive_function_depth(target) + 1)
-                else:
-                    visited.append(callsite[0])
-
-            return depth
-
-        visited: list[str] = []
-        func_depth = _recursive_function_depth(target_function)
-
-        return func_depth
-
-    def extract_calltree(self,
-                         source_file: str = '',
-                         source_code: Optional[
-                             datatypes.SourceCodeFile] = None,
-                         function: Optional[str] = None,
-                         visited_functions: Optional[set[str]] = None,
-                         depth: int = 0,
-                         line_number: int = -1,
-                         other_props: Optional[dict[str, Any]] = None) -> str:
-        """Extracts calltree string of a calltree so that FI core can use it."""
+    def _extract_calltree_node(
+        self, source_file: str,
+        source_code: Optional[datatypes.SourceCodeFile],
+        function: Optional[str], visited_functions: set[str], depth: int,
+        line_number: int, other_props: Optional[dict[str, Any]]
+    ) -> tuple[str, list[tuple[str, str, int, Optional[dict[str, Any]]]]]:
+        """Returns the calltree line of a function and its callsites."""
         func_node = None
 
         if other_props:
@@ -800,21 +751,25 @@ class RustProject(datatypes.Project[RustSourceCodeFile]):
         else:
             is_macro = False
 
-        if not visited_functions:
-            visited_functions = set()
-
         if not source_code and function:
             source_code = self._find_source_with_function(function)
 
         if not function and source_code:
             if not isinstance(source_code, RustSourceCodeFile):
-                return ''
+                return '', []
 
             func_node = source_code.get_entry_function()
             if func_node:
                 function = func_node.name
 
         if function:
+            if not func_node and isinstance(source_code, RustSourceCodeFile):
+                # The project functions only hold the entry function of the
+                # harness the report was last generated for.
+                entry_func = source_code.get_entry_function()
+                if entry_func and entry_func.name == function:
+                    func_node = entry_func
+
             if not func_node:
                 func_node = get_function_node(function,
                                               self.all_functions_dict)
@@ -827,7 +782,7 @@ class RustProject(datatypes.Project[RustSourceCodeFile]):
                 func_node = None
                 func_name = function
         else:
-            return ''
+            return '', []
 
         line_to_print = '  ' * depth
         line_to_print += func_name
@@ -839,25 +794,16 @@ class RustProject(datatypes.Project[RustSourceCodeFile]):
 
         if (function in visited_functions or not func_node or not source_code
                 or not function):
-            return line_to_print
+            return line_to_print, []
 
         callsites = func_node.base_callsites
         visited_functions.add(function)
 
-        for cs, line in callsites:
-            is_macro = bool(func_node and func_node.is_macro
-                            and func_node.name != 'fuzz_target')
-            other_props = {}
-            other_props['is_macro'] = is_macro
-            line_to_print += self.extract_calltree(
-                source_code.source_file,
-                function=cs,
-                visited_functions=visited_functions,
-                depth=depth + 1,
-                line_number=line,
-                other_props=other_props)
-
-        return line_to_print
+        is_macro = bool(func_node and func_node.is_macro
+                        and func_node.name != 'fuzz_target')
+        return line_to_print, [(source_code.source_file, cs, line, {
+            'is_macro': is_macro
+        }) for cs, line in callsites]
 
     def get_reachable_functions(
             self,
@@ -910,19 +856,24 @@ class RustProject(datatypes.Project[RustSourceCodeFile]):
 
 
 def load_treesitter_trees(source_files: list[str],
-                          is_log: bool = True) -> RustProject:
+                          is_log: bool = True,
+                          jobs: Optional[int] = None,
+                          cache_dir: Optional[str] = None) -> RustProject:
     """Creates treesitter trees for all files in a given list of
-    source files."""
-    results = []
-
-    for code_file in source_files:
-        source_cls = RustSourceCodeFile('rust', code_file)
-        if is_log:
+    source files. Unchanged source files are loaded from `cache_dir`, if
+    set."""
+    results = datatypes.load_source_code_files(RustSourceCodeFile,
+                                               'rust',
+                                               source_files,
+                                               jobs=jobs,
+                                               cache_dir=cache_dir)
+
+    if is_log:
+        for source_cls in results:
             if source_cls.has_libfuzzer_harness():
-                logger.info('harness: %s', code_file)
-        results.append(source_cls)
+                logger.info('harness: %s', source_cls.source_file)
 
-    return RustProject(results)
+    return RustProject(results, jobs)
 
 
 def analyse_source_code(source_content: str) -> RustSourceCodeFile:
@@ -15,12 +15,13 @@
 ################################################################################
 """Entrypoint for tree-sitter frontends."""
 
+import itertools
+import multiprocessing
 import os
 import yaml
-import pathlib
 import logging
 
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from fuzz_introspector.frontends import frontend_c_cpp
 from fuzz_introspector.frontends import frontend_go
@@ -29,6 +30,7 @@ from fuzz_introspector.frontends import frontend_rust
 from fuzz_introspector.frontends.datatypes import Project
 
 from fuzz_introspector import constants
+from fuzz_introspector import utils
 
 logger = logging.getLogger(name=__name__)
 
@@ -37,34 +39,82 @@ EXCLUDE_DIRECTORIES = [
     'fuzztest', 'build'
 ]
 
+# Project and harnesses of the ongoing calltree extraction. These are set
+# before the pool is created, so forked workers inherit them instead of
+# having the project pickled to them.
+_CALLTREE_STATE: dict[str, Any] = {}
+
+
+def _dump_calltree_worker(task: tuple[int, str, str]) -> str:
+    """Extracts the calltree of a harness and writes it to the target
+    file. `task` holds the index of the harness, its entry function and
+    the target file."""
+    idx, entry_function, target = task
+    project = _CALLTREE_STATE['project']
+    harness = _CALLTREE_STATE['harnesses'][idx]
+
+    logger.info('Extracting calltree for %s', harness.source_file)
+    with open(target, 'w', encoding='utf-8') as f:
+        f.write('Call tree\n')
+        f.writelines(
+            project.iter_calltree(harness.source_file, harness,
+                                  entry_function))
+    return target
+
+
+def _dump_calltrees(project: Project, harnesses: list[Any],
+                    tasks: list[tuple[int, str,
+                                      str]], jobs: Optional[int]) -> None:
+    """Extracts and writes the calltrees of the harnesses using a pool of
+    `jobs` forked worker processes. The project is only read from at this
+    point, and each calltree is written to its own file, so the output does
+    not depend on the order the workers complete in."""
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(tasks)))
+
+    _CALLTREE_STATE['project'] = project
+    _CALLTREE_STATE['harnesses'] = harnesses
+    try:
+        if jobs > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            logger.info('Extracting %d calltrees with %d jobs', len(tasks),
+                        jobs)
+            with multiprocessing.get_context('fork').Pool(jobs) as pool:
+                for target in pool.imap_unordered(_dump_calltree_worker,
+                                                  tasks):
+                    logger.info('Calltree extracted to %s', target)
+        else:
+            for task in tasks:
+                target = _dump_calltree_worker(task)
+                logger.info('Calltree extracted to %s', target)
+    finally:
+        _CALLTREE_STATE.clear()
+
 
 def capture_source_files_in_tree(directory_tree: str,
                                  language: str) -> list[str]:
     """Captures source code files in a given directory."""
-    language_files = []
     language_extensions = constants.LANGUAGE_EXTENSIONS.get(
         language.lower(), [])
 
-    for dirpath, _, filenames in os.walk(directory_tree):
-        # Skip some non project directories
-        if any(exclude in dirpath for exclude in EXCLUDE_DIRECTORIES):
-            continue
-
-        for filename in filenames:
-            if pathlib.Path(filename).suffix in language_extensions:
-                language_files.append(os.path.join(dirpath, filename))
-    return language_files
-
-
-def analyse_folder(
-        language: str = '',
-        directory: str = '',
-        entrypoint: str = '',
-        out='',
-        module_only=False,
-        dump_output=True,
-        files_to_include: Optional[list[str]] = None) -> tuple[Project, Any]:
-    """Runs a full frontend analysis on a given directory"""
+    # Skip some non project directories
+    file_index = utils.get_file_index(directory_tree, EXCLUDE_DIRECTORIES)
+    return file_index.get_files_with_extensions(language_extensions)
+
+
+def analyse_folder(language: str = '',
+                   directory: str = '',
+                   entrypoint: str = '',
+                   out='',
+                   module_only=False,
+                   dump_output=True,
+                   files_to_include: Optional[list[str]] = None,
+                   jobs: Optional[int] = None,
+                   cache_dir: Optional[str] = None) -> tuple[Project, Any]:
+    """Runs a full frontend analysis on a given directory. The source files
+    are loaded, and the calltrees of the harnesses extracted, with `jobs`
+    worker processes. If `cache_dir` is set, only source files changed
+    since the previous run are parsed."""
 
     if not files_to_include:
         files_to_include = []
@@ -86,21 +136,30 @@ def analyse_folder(
         if not project.get_source_codes_with_harnesses():
             module_only = True
 
-        project = frontend_c_cpp.load_treesitter_trees(source_files)
+        project = frontend_c_cpp.load_treesitter_trees(source_files,
+                                                       jobs=jobs,
+                                                       cache_dir=cache_dir)
     elif language == constants.LANGUAGES.GO:
         logger.info('Going Go route')
         logger.info('Loading tree-sitter trees and create base project')
-        project = frontend_go.load_treesitter_trees(source_files)
+        project = frontend_go.load_treesitter_trees(source_files,
+                                                    jobs=jobs,
+                                                    cache_dir=cache_dir)
     elif language == constants.LANGUAGES.JAVA:
         logger.info('Going JVM route')
         logger.info('Loading tree-sitter trees and create base project')
         if not entrypoint:
             entrypoint = 'fuzzerTestOneInput'
-        project = frontend_jvm.load_treesitter_trees(source_files, entrypoint)
+        project = frontend_jvm.load_treesitter_trees(source_files,
+                                                     entrypoint,
+                                                     jobs=jobs,
+                                                     cache_dir=cache_dir)
     elif language == constants.LANGUAGES.RUST:
         logger.info('Going Rust route')
         logger.info('Loading tree-sitter trees and create base project')
-        project = frontend_rust.load_treesitter_trees(source_files)
+        project = frontend_rust.load_treesitter_trees(source_files,
+                                                      jobs=jobs,
+                                                      cache_dir=cache_dir)
     else:
         logger.error('Unsupported language: %s', language)
         return Project([]), []
@@ -142,8 +201,11 @@ def analyse_folder(
         target = os.path.join(out, 'macro_block_info.json')
         project.dump_macro_block_info(target, dump_output)
 
-    # Process calltree and method data
-    for harness in project.get_source_codes_with_harnesses():
+    # Process method data
+    harnesses = project.get_source_codes_with_harnesses()
+    harness_lists: list[tuple[dict[str, Any], Iterable[str]]] = []
+    calltree_tasks: list[tuple[int, str, str]] = []
+    for idx, harness in enumerate(harnesses):
         if language == 'go':
             entry_function = harness.get_entry_function_name()
         else:
@@ -152,23 +214,27 @@ def analyse_folder(
         harness_name = harness.source_file.split('/')[-1].split('.')[0]
 
         # Functions/Methods data
-        logger.info('Dump methods for %s', harness_name)
-        target = os.path.join(out, f'fuzzerLogFile-{harness_name}.data.yaml')
-        project.dump_module_logic(target,
-                                  entry_function=entry_function,
-                                  harness_name=harness_name,
-                                  harness_source=harness.source_file,
-                                  dump_output=dump_output)
-
-        # Calltree
-        logger.info('Extracting calltree for %s', harness_name)
-        calltree = project.extract_calltree(harness.source_file, harness,
-                                            entry_function)
-        logger.info('Calltree extracted')
         if dump_output:
-            target = os.path.join(out, f'fuzzerLogFile-{harness_name}.data')
-            with open(target, 'w', encoding='utf-8') as f:
-                f.write(f'Call tree\n{calltree}')
+            logger.info('Dump methods for %s', harness_name)
+            target = os.path.join(out,
+                                  f'fuzzerLogFile-{harness_name}.data.yaml')
+            project.dump_module_logic(target,
+                                      entry_function=entry_function,
+                                      harness_name=harness_name,
+                                      harness_source=harness.source_file,
+                                      dump_output=dump_output)
+            calltree_tasks.append(
+                (idx, entry_function,
+                 os.path.join(out, f'fuzzerLogFile-{harness_name}.data')))
+        else:
+            # The calltree is read lazily when the profile is loaded
+            report = project.get_report(entry_function, harness_name,
+                                        harness.source_file)
+            calltree_lines = itertools.chain(['Call tree\n'],
+                                             project.iter_calltree(
+                                                 harness.source_file, harness,
+                                                 entry_function))
+            harness_lists.append((report, calltree_lines))
 
         for textcov in textcov_reports:
             cov_name = textcov.replace('.covreport', '')
@@ -180,6 +246,11 @@ def analyse_folder(
                     f'fuzzerLogFile-{harness_name}.data'
                 })
 
+    # Calltrees
+    if calltree_tasks:
+        _dump_calltrees(project, harnesses, calltree_tasks, jobs)
+
+    if harnesses:
         # Type definition
         target = os.path.join(out, 'full_type_defs.json')
         project.dump_type_definition(target, dump_output)
@@ -193,4 +264,6 @@ def analyse_folder(
                   'w') as f:
             f.write(yaml.dump({'pairings': pairings}))
 
+    if harness_lists:
+        return project, harness_lists
     return project, None
@@ -13,7 +13,13 @@
 # limitations under the License.
 """ Utility functions """
 
+import concurrent.futures
+import contextlib
 import cxxfilt
+import functools
+import heapq
+import importlib.metadata
+import itertools
 import rust_demangler
 import logging
 import json
@@ -22,16 +28,37 @@ import re
 import shutil
 import yaml
 import pathlib
+import time
 
 from bs4 import BeautifulSoup
 
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional, Union
 
 from fuzz_introspector import constants
 
 logger = logging.getLogger(name=__name__)
 
 
+@contextlib.contextmanager
+def time_stage(stage_name: str) -> Iterator[None]:
+    """Logs the wall-clock time spent in the wrapped stage."""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        logger.info('[timing] %s took %.2fs', stage_name,
+                    time.perf_counter() - start_time)
+
+
+def get_tool_version() -> str:
+    """Returns the installed version of Fuzz Introspector, used to invalidate
+    cached analysis results."""
+    try:
+        return importlib.metadata.version('fuzz-introspector')
+    except importlib.metadata.PackageNotFoundError:
+        return 'unknown'
+
+
 def longest_common_prefix(strs: list[str]) -> str:
     """
     Dummy wrapper function for os.path.commonpath(paths: list[str]) -> str
@@ -62,6 +89,174 @@ def safe_decode(data) -> Optional[str]:
     return None
 
 
+# Listing of a directory: its modification time in nanoseconds, the names
+# of its files and the names of the subdirectories that are walked into.
+DirectoryListing = tuple[int, list[str], list[str]]
+
+
+class FileIndex():
+    """The files in a directory tree, listed in the order `os.walk` visits
+    them and bucketed by file extension."""
+
+    def __init__(self, root: str, listings: list[tuple[str,
+                                                       DirectoryListing]]):
+        self.root = root
+        self.listings = listings
+        self.files: list[str] = []
+        self._extension_buckets: dict[str, list[int]] = {}
+        for dirpath, (_, filenames, _) in listings:
+            dir_prefix = os.path.join(dirpath, '')
+            for filename in filenames:
+                # Same as `pathlib.PurePath(filename).suffix`, without
+                # creating a path object per file.
+                dot_idx = filename.rfind('.')
+                if 0 < dot_idx < len(filename) - 1:
+                    extension = filename[dot_idx:]
+                else:
+                    extension = ''
+                self._extension_buckets.setdefault(extension,
+                                                   []).append(len(self.files))
+                self.files.append(dir_prefix + filename)
+
+    def get_files_with_extensions(self,
+                                  extensions: Iterable[str]) -> list[str]:
+        """Returns the files with any of the given extensions, in walk
+        order."""
+        buckets = [
+            self._extension_buckets[extension] for extension in set(extensions)
+            if extension in self._extension_buckets
+        ]
+        return [self.files[idx] for idx in heapq.merge(*buckets)]
+
+
+# Directories modified this close to being listed are listed again on the
+# next lookup, as a change within the same filesystem timestamp tick does not
+# show up in their modification time.
+_RACY_MTIME_NS = 2 * 10**9
+
+# Directory listings of all trees indexed during the run, per set of
+# excluded directory patterns, and the file indexes built from them.
+_DIRECTORY_LISTINGS: dict[tuple[str, ...], dict[str, DirectoryListing]] = {}
+_FILE_INDEXES: dict[tuple[str, tuple[str, ...]], FileIndex] = {}
+
+
+def _is_excluded_directory(dirpath: str, exclude_dirs: tuple[str,
+                                                             ...]) -> bool:
+    """Checks if a directory holds any of the excluded patterns. The path is
+    matched with a trailing separator, so patterns such as `/build/` match
+    the directory itself."""
+    dirpath += '/'
+    return any(exclude in dirpath for exclude in exclude_dirs)
+
+
+def _list_directory(
+        dirpath: str, exclude_dirs: tuple[str, ...],
+        listings: dict[str, DirectoryListing]) -> Optional[DirectoryListing]:
+    """Lists a directory, reusing the previous listing if the directory has
+    not been modified since. Symlinked and excluded subdirectories are not
+    walked into, and unreadable directories are skipped like `os.walk`
+    does."""
+    try:
+        mtime = os.stat(dirpath).st_mtime_ns
+    except OSError:
+        return None
+    listing = listings.get(dirpath)
+    if listing is not None and listing[0] == mtime:
+        return listing
+
+    list_time = time.time_ns()
+    filenames = []
+    subdirs = []
+    try:
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    filenames.append(entry.name)
+                    continue
+                try:
+                    is_symlink = entry.is_symlink()
+                except OSError:
+                    is_symlink = False
+                if not is_symlink and not _is_excluded_directory(
+                        entry.path, exclude_dirs):
+                    subdirs.append(entry.name)
+    except OSError:
+        return None
+
+    if mtime >= list_time - _RACY_MTIME_NS:
+        mtime = -1
+    return mtime, filenames, subdirs
+
+
+def _walk_directory(
+    dirpath: str, exclude_dirs: tuple[str, ...],
+    listings: dict[str,
+                   DirectoryListing]) -> list[tuple[str, DirectoryListing]]:
+    """Lists the directories of a tree in `os.walk` order."""
+    walked = []
+    to_visit = [dirpath]
+    while to_visit:
+        dirpath = to_visit.pop()
+        listing = _list_directory(dirpath, exclude_dirs, listings)
+        if listing is None:
+            continue
+        walked.append((dirpath, listing))
+        to_visit.extend(
+            os.path.join(dirpath, subdir) for subdir in reversed(listing[2]))
+    return walked
+
+
+def get_file_index(
+    root: Union[str, os.PathLike[str]], exclude_dirs: Iterable[str] = ()
+) -> FileIndex:
+    """Returns the index of the files in a directory tree. Directories whose
+    path holds any of `exclude_dirs` are not walked into, and the top-level
+    directories are walked in parallel.
+
+    Indexes are cached for the rest of the run and shared between everything
+    looking at the same tree. A cached index is checked against the
+    modification times of its directories, so only directories changed since
+    are listed again."""
+    root = os.fspath(root)
+    root = root.rstrip('/') or root
+    exclude_dirs = tuple(exclude_dirs)
+    listings = _DIRECTORY_LISTINGS.setdefault(exclude_dirs, {})
+
+    walked = []
+    root_listing = None
+    if not _is_excluded_directory(root, exclude_dirs):
+        root_listing = _list_directory(root, exclude_dirs, listings)
+    if root_listing is not None:
+        walked.append((root, root_listing))
+        subdirs = [os.path.join(root, subdir) for subdir in root_listing[2]]
+        if len(subdirs) > 1:
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                subtrees = list(
+                    executor.map(_walk_directory, subdirs,
+                                 itertools.repeat(exclude_dirs),
+                                 itertools.repeat(listings)))
+        else:
+            subtrees = [
+                _walk_directory(subdir, exclude_dirs, listings)
+                for subdir in subdirs
+            ]
+        for subtree in subtrees:
+            walked.extend(subtree)
+    listings.update(walked)
+
+    # Unchanged directories keep their listing objects, so comparing the
+    # walks of an unchanged tree is cheap.
+    file_index = _FILE_INDEXES.get((root, exclude_dirs))
+    if file_index is None or file_index.listings != walked:
+        file_index = FileIndex(root, walked)
+        _FILE_INDEXES[(root, exclude_dirs)] = file_index
+    return file_index
+
+
 def get_all_files_in_tree_with_regex(basedir: str,
                                      regex_str: str) -> list[str]:
     """
@@ -69,12 +264,10 @@ def get_all_files_in_tree_with_regex(basedir: str,
     the provided suffix. Walks the entire tree of basedir.
     """
     r = re.compile(regex_str)
-    data_files = []
-    for root, _, files in os.walk(basedir):
-        for f in files:
-            if r.match(f):
-                data_files.append(os.path.join(root, f))
-    return data_files
+    return [
+        path for path in get_file_index(basedir).files
+        if r.match(os.path.basename(path))
+    ]
 
 
 def data_file_read_yaml(filename: str) -> Optional[dict[Any, Any]]:
@@ -144,6 +337,7 @@ def data_file_read_yaml(filename: str) -> Optional[dict[Any, Any]]:
     return content
 
 
+@functools.lru_cache(maxsize=None)
 def demangle_cpp_func(funcname: str) -> str:
     try:
         demangled: str = cxxfilt.demangle(funcname.replace(' ', ''))
@@ -152,6 +346,7 @@ def demangle_cpp_func(funcname: str) -> str:
         return funcname
 
 
+@functools.lru_cache(maxsize=None)
 def demangle_rust_func(funcname: str) -> str:
     """Demangle the mangled rust function names."""
     # Ignore all non-mangled rust function names
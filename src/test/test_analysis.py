@@ -0,0 +1,73 @@
+# Copyright 2025 Fuzz Introspector Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test analysis.py"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../")
+
+from fuzz_introspector import analysis, cfg_load  # noqa: E402
+from fuzz_introspector.datatypes import function_profile  # noqa: E402
+
+
+def _get_function_profile(name, total_cyclomatic_complexity):
+    fd = function_profile.FunctionProfile({
+        'functionName': name,
+        'functionSourceFile': '/src/test.c',
+        'linkageType': None,
+        'functionLinenumber': 1,
+        'functionLinenumberEnd': 2,
+        'returnType': 'void',
+        'argCount': 0,
+        'argTypes': [],
+        'argNames': [],
+        'BBCount': 1,
+        'ICount': 1,
+        'EdgeCount': 1,
+        'CyclomaticComplexity': 1,
+        'functionsReached': [],
+        'functionUses': 0,
+        'functionDepth': 0,
+        'constantsTouched': [],
+        'BranchProfiles': [],
+        'Callsites': [],
+    })
+    fd.total_cyclomatic_complexity = total_cyclomatic_complexity
+    return fd
+
+
+def test_update_forward_reds():
+    """Test forward reds and blocked functions of calltree nodes"""
+    # (function name, depth, hitcount) of each node in the calltree.
+    nodes = [('entry', 0, 10), ('a', 1, 10), ('b', 2, 0), ('c', 3, 0),
+             ('d', 3, 0), ('e', 1, 5), ('f', 2, 0), ('g', 2, 0)]
+    all_callsites = []
+    for name, depth, hitcount in nodes:
+        node = cfg_load.CalltreeCallsite(name, '/src/test.c', depth, 1, None)
+        node.cov_hitcount = hitcount
+        all_callsites.append(node)
+    dst_to_fd_cache = {
+        'b': _get_function_profile('b', 2),
+        'c': _get_function_profile('c', 5),
+        'd': _get_function_profile('d', 5),
+        'g': _get_function_profile('g', 0),
+    }
+
+    analysis.update_forward_reds(all_callsites, dst_to_fd_cache)
+
+    forward_reds = [(node.cov_forward_reds, node.cov_largest_blocked_func)
+                    for node in all_callsites]
+    assert forward_reds == [(0, ''), (3, 'c'), (0, 'none'), (0, 'none'),
+                            (0, 'none'), (2, ''), (0, 'none'), (0, 'none')]
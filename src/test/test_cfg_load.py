@@ -70,3 +70,18 @@ def test_cfg_nodes(tmpdir, sample_cfg1):
     assert all_callsites[3].depth == 2
     assert all_callsites[4].depth == 2
     assert all_callsites[5].depth == 2
+
+
+def test_cfg_deep_calltree():
+    """Test calltrees deeper than the recursion limit are handled"""
+    depth = sys.getrecursionlimit() + 100
+    cfg_lines = ["Call tree"]
+    for idx in range(depth):
+        cfg_lines.append(f"{'  ' * idx}func{idx} /src/test.c linenumber={idx}")
+
+    # Read the calltree from an iterable of lines as well as a string.
+    for cfg in (iter(line + "\n" for line in cfg_lines), "\n".join(cfg_lines)):
+        all_callsites = cfg_load.extract_all_callsites(_load_cfg(cfg))
+        assert len(all_callsites) == depth
+        assert [cs.depth for cs in all_callsites] == list(range(depth))
+        assert all_callsites[-1].src_function_name == f"func{depth - 2}"
@@ -92,6 +92,79 @@ def test_load_llvm_coverage():
         [3260, 36000000, 3260, 3510000, 1570000])
 
 
+def test_llvm_coverage_report_cache():
+    """Tests each .covreport file is parsed once and shared by profiles."""
+    code_coverage.clear_llvm_coverage_cache()
+    report = os.path.join(TEST_DATA_PATH, 'sample_cov.covreport')
+    code_coverage.preload_llvm_coverage_reports([report])
+
+    covmap, branch_cov_map = code_coverage.get_llvm_coverage_report(report)
+    assert covmap == code_coverage.parse_llvm_coverage_report(report)[0]
+
+    cov_profile1 = code_coverage.load_llvm_coverage(TEST_DATA_PATH, 'sample_cov')
+    cov_profile2 = code_coverage.load_llvm_coverage(TEST_DATA_PATH, 'sample_cov')
+    assert cov_profile1.covmap == covmap
+    assert cov_profile1.branch_cov_map == branch_cov_map
+    assert (cov_profile1.covmap['BZ2_bzCompress'] is
+            cov_profile2.covmap['BZ2_bzCompress'])
+    code_coverage.clear_llvm_coverage_cache()
+
+
+def test_llvm_coverage_undecodable_lines(tmpdir):
+    """Tests lines of a report that can not be decoded are skipped."""
+    report = os.path.join(tmpdir, 'undecodable.covreport')
+    with open(report, 'wb') as f:
+        f.write(b'parse:\n'
+                b'   10|      1|int parse(char *s) {\n'
+                b'   11|      2|  char *x = "\xff\\x";\n'
+                b'   12|      3|  return 0;\n')
+
+    covmap, _ = code_coverage.parse_llvm_coverage_report(report)
+    assert covmap['parse'] == [(10, 1), (12, 3)]
+
+
+def test_line_coverage():
+    """Tests summaries and merging of array backed line coverage."""
+    line_coverage = code_coverage.LineCoverage([(10, 0), (11, 5), (12, 2)])
+    assert len(line_coverage) == 3
+    assert line_coverage.lines_hit == 2
+    assert line_coverage[1] == (11, 5)
+    assert line_coverage == [(10, 0), (11, 5), (12, 2)]
+    assert line_coverage.get_line_hitcount(12) == 2
+    assert line_coverage.get_line_hitcount(13) == -1
+    assert line_coverage.get_max_hitcount() == 5
+
+    merged = line_coverage.merge_max(
+        code_coverage.LineCoverage([(10, 3), (11, 1), (12, 0)]))
+    assert merged == [(10, 3), (11, 5), (12, 2)]
+    assert merged.lines_hit == 3
+
+    # Lines with different line numbers are dropped, lines missing from the
+    # other coverage keep their hitcount.
+    merged = line_coverage.merge_max(
+        code_coverage.LineCoverage([(10, 3), (20, 1)]))
+    assert merged == [(10, 3), (12, 2)]
+    assert merged.lines_hit == 2
+
+
+def test_resolve_fuzz_key():
+    """Tests name resolution of functions in the coverage map."""
+    cov_profile = code_coverage.CoverageProfile()
+    cov_profile.covmap['crate::module::func'] = code_coverage.LineCoverage(
+        [(1, 1)])
+    cov_profile.covmap['foo(int)'] = code_coverage.LineCoverage([(2, 0)])
+
+    assert cov_profile.get_hit_details('module::func') == [(1, 1)]
+    assert cov_profile.get_hit_details('func') == [(1, 1)]
+    assert cov_profile.get_hit_details('_Z3fooi') == [(2, 0)]
+    assert cov_profile.get_hit_summary('foo (int)') == (1, 0)
+    assert cov_profile.get_hit_details('bar') == []
+
+    # Names resolved before are looked up again once functions are added.
+    cov_profile.covmap['other::bar'] = code_coverage.LineCoverage([(3, 2)])
+    assert cov_profile.get_hit_details('bar') == [(3, 2)]
+
+
 def write_coverage_file(tmpdir, coverage_file):
     # Write the coverage_file
     path = os.path.join(tmpdir, "jacoco.xml")
@@ -0,0 +1,134 @@
+# Copyright 2025 Fuzz Introspector Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test data_loader.py"""
+
+import os
+import copy
+import shutil
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../")
+
+from fuzz_introspector import data_loader  # noqa: E402
+from fuzz_introspector.datatypes import function_profile  # noqa: E402
+
+TEST_REPORT_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                'data', 'TestReport', 'test1')
+
+
+def test_load_all_profiles_with_cache(tmpdir):
+    """Test profiles are stored in and reused from the cache directory"""
+    cache_dir = os.path.join(tmpdir, 'cache')
+
+    profiles = data_loader.load_all_profiles(TEST_REPORT_PATH, 'c-cpp', False,
+                                             cache_dir)
+    assert len(profiles) == 1
+    assert profiles[0].cache_key is not None
+    cache_file = os.path.join(cache_dir, f'{profiles[0].cache_key}.pickle')
+    assert os.path.isfile(cache_file)
+
+    # Make sure the second load is served by the cache.
+    cached_profile = data_loader.load_cached_profile(cache_dir,
+                                                     profiles[0].cache_key)
+    assert cached_profile is not None
+    cached_profile.fuzzer_source_file = 'from-cache'
+    data_loader.save_cached_profile(cache_dir, profiles[0].cache_key,
+                                    cached_profile)
+
+    cached_profiles = data_loader.load_all_profiles(TEST_REPORT_PATH, 'c-cpp',
+                                                    False, cache_dir)
+    assert len(cached_profiles) == 1
+    assert cached_profiles[0].fuzzer_source_file == 'from-cache'
+    assert (set(cached_profiles[0].all_class_functions) == set(
+        profiles[0].all_class_functions))
+
+
+def test_profile_cache_key(tmpdir):
+    """Test the cache key changes with the content of the data files"""
+    data_file = os.path.join(tmpdir, 'fuzzerLogFile-test.data')
+    with open(data_file, 'w') as f:
+        f.write('Call tree\n')
+    with open(data_file + '.yaml', 'w') as f:
+        f.write('Fuzzer filename: test.c\n')
+
+    key1 = data_loader.get_profile_cache_key(data_file, 'c-cpp')
+    assert key1 == data_loader.get_profile_cache_key(data_file, 'c-cpp')
+    assert key1 != data_loader.get_profile_cache_key(data_file, 'jvm')
+
+    with open(data_file + '.yaml', 'a') as f:
+        f.write('# changed\n')
+    assert key1 != data_loader.get_profile_cache_key(data_file, 'c-cpp')
+
+    # Identical data files at other paths have keys of their own.
+    os.makedirs(os.path.join(tmpdir, 'copy'))
+    copy_file = os.path.join(tmpdir, 'copy', 'fuzzerLogFile-test.data')
+    shutil.copy(data_file, copy_file)
+    shutil.copy(data_file + '.yaml', copy_file + '.yaml')
+    assert (data_loader.get_profile_cache_key(copy_file, 'c-cpp') !=
+            data_loader.get_profile_cache_key(data_file, 'c-cpp'))
+
+
+def test_accummulated_cache_key(tmpdir):
+    """Test the accummulated cache key covers all profiles of the project"""
+    cache_dir = os.path.join(tmpdir, 'cache')
+    profile = data_loader.load_all_profiles(TEST_REPORT_PATH, 'c-cpp', False,
+                                            cache_dir)[0]
+    other_profile = copy.copy(profile)
+    other_profile.cache_key = 'other'
+
+    key1 = data_loader.get_accummulated_cache_key(profile, TEST_REPORT_PATH,
+                                                  [profile])
+    assert key1 is not None
+    assert key1 == data_loader.get_accummulated_cache_key(
+        profile, TEST_REPORT_PATH, [profile])
+    assert key1 != data_loader.get_accummulated_cache_key(
+        profile, TEST_REPORT_PATH, [profile, other_profile])
+
+    # Profiles loaded without the cache can not be identified.
+    other_profile.cache_key = None
+    assert data_loader.get_accummulated_cache_key(
+        profile, TEST_REPORT_PATH, [profile, other_profile]) is None
+
+
+def test_load_all_profiles_jobs():
+    """Test profiles loaded by a worker pool match in-process loading"""
+    profiles = data_loader.load_all_profiles(TEST_REPORT_PATH,
+                                             'c-cpp',
+                                             parallelise=False)
+    pool_profiles = data_loader.load_all_profiles(TEST_REPORT_PATH,
+                                                  'c-cpp',
+                                                  jobs=2)
+    assert len(pool_profiles) == len(profiles) == 1
+    assert (set(pool_profiles[0].all_class_functions) == set(
+        profiles[0].all_class_functions))
+
+
+def test_load_all_profiles_interned():
+    """Test functions are interned as the profiles are loaded"""
+    function_store = function_profile.FunctionProfileStore()
+    profiles = data_loader.load_all_profiles(TEST_REPORT_PATH,
+                                             'c-cpp',
+                                             parallelise=False,
+                                             function_store=function_store)
+    assert len(profiles) == 1
+    assert len(function_store) > 0
+    for func_profile in profiles[0].all_class_functions.values():
+        assert function_store.intern(func_profile) is func_profile
+
+
+def test_get_pool_chunksize():
+    """Test tasks are split in a few chunks per worker"""
+    assert data_loader.get_pool_chunksize(0, 4) == 1
+    assert data_loader.get_pool_chunksize(10, 4) == 1
+    assert data_loader.get_pool_chunksize(160, 4) == 10
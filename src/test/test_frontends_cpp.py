@@ -14,7 +14,12 @@
 """Unit testing script for the CPP frontend"""
 
 import os
-from fuzz_introspector.frontends import oss_fuzz  # noqa: E402
+import pickle
+import shutil
+import types
+import yaml
+from fuzz_introspector.frontends import (  # noqa: E402
+    datatypes, frontend_c_cpp, oss_fuzz)
 
 
 def test_tree_sitter_cpp_sample1():
@@ -164,3 +169,292 @@ def test_tree_sitter_cpp_sample7():
         'sample2.cpp']
     assert 'func1' in calltrees['sample1.cpp'] and 'func2' not in calltrees[
         'sample1.cpp']
+
+
+def test_tree_sitter_cpp_dump_module_logic(tmp_path):
+    project, _ = oss_fuzz.analyse_folder(
+        'c++',
+        'src/test/data/source-code/cpp/test-project-7',
+        'LLVMFuzzerTestOneInput',
+        dump_output=False,
+    )
+
+    # The shared module logic is rendered once for all harnesses
+    for harness in project.get_source_codes_with_harnesses():
+        target = tmp_path / os.path.basename(harness.source_file)
+        project.dump_module_logic(str(target), 'LLVMFuzzerTestOneInput',
+                                  harness.source_file, harness.source_file)
+        report = project.get_report('LLVMFuzzerTestOneInput',
+                                    harness.source_file, harness.source_file)
+        assert target.read_text() == yaml.safe_dump(report)
+        assert report['Fuzzer filename'] == harness.source_file
+
+
+def test_tree_sitter_cpp_in_memory_calltrees():
+    project, harness_lists = oss_fuzz.analyse_folder(
+        'c++',
+        'src/test/data/source-code/cpp/test-project-7',
+        'LLVMFuzzerTestOneInput',
+        dump_output=False,
+    )
+
+    # In-memory analysis streams the same calltrees
+    assert len(harness_lists) == 2
+    for report, calltree_lines in harness_lists:
+        harness = next(source_code
+                       for source_code in project.source_code_files
+                       if source_code.source_file == report['Fuzzer filename'])
+        calltree = project.extract_calltree(harness.source_file, harness,
+                                            'LLVMFuzzerTestOneInput')
+        assert ''.join(calltree_lines) == f'Call tree\n{calltree}'
+
+
+def test_tree_sitter_cpp_repeated_analysis():
+    """Analysing the same project again gives the same report."""
+    reports = []
+    for _ in range(3):
+        project, _ = oss_fuzz.analyse_folder(
+            'c++',
+            'src/test/data/source-code/cpp/test-project-1',
+            'LLVMFuzzerTestOneInput',
+            dump_output=False,
+        )
+        reports.append(project.get_report('LLVMFuzzerTestOneInput'))
+
+        # Member functions are resolved through the declared variable type
+        functions_reached = project.get_reachable_functions(
+            source_code=None,
+            function='LLVMFuzzerTestOneInput',
+            visited_functions=set())
+        assert 'OuterNamespace::MyClass::memberFunction' in functions_reached
+
+    assert reports[0] == reports[1] == reports[2]
+
+
+def test_tree_sitter_cpp_pickled_source_file():
+    """Pickled source code files hold no tree-sitter objects. The nodes of
+    the functions are found again once the source code file is loaded."""
+    source_code = frontend_c_cpp.CppSourceCodeFile(
+        'c++', 'src/test/data/source-code/cpp/test-project-1/sample.cpp')
+    loaded = pickle.loads(pickle.dumps(source_code))
+
+    assert loaded._root is None
+    assert len(loaded.func_defs) == len(source_code.func_defs)
+    for func, loaded_func in zip(source_code.func_defs, loaded.func_defs):
+        assert loaded_func.name == func.name
+        assert loaded_func._root is None
+        assert (loaded_func.function_source_code_as_text() ==
+                func.function_source_code_as_text())
+        assert loaded_func._root is None
+        assert loaded_func.root.byte_range == func.root.byte_range
+        assert loaded_func.root.type == func.root.type
+
+    project = frontend_c_cpp.CppProject([source_code])
+    loaded_project = frontend_c_cpp.CppProject([loaded])
+    for func, loaded_func in zip(source_code.func_defs, loaded.func_defs):
+        func.extract_callsites(project)
+        loaded_func.extract_callsites(loaded_project)
+        assert loaded_func.base_callsites == func.base_callsites
+
+
+def _get_sorted_functions(report):
+    """Returns the functions of a report in name order, with the lists
+    built from sets sorted."""
+    functions = []
+    for func in report['All functions']['Elements']:
+        func = dict(func)
+        func['functionsReached'] = sorted(func['functionsReached'])
+        functions.append(func)
+    return sorted(functions,
+                  key=lambda func: (func['functionName'],
+                                    func['functionSourceFile'],
+                                    func['functionLinenumber']))
+
+
+def test_tree_sitter_cpp_cache(tmp_path, monkeypatch):
+    """Unchanged source files are loaded from the cache directory without
+    parsing them, and changed source files are parsed again."""
+    project_dir = tmp_path / 'project'
+    cache_dir = tmp_path / 'cache'
+    shutil.copytree('src/test/data/source-code/cpp/test-project-1',
+                    project_dir)
+
+    reports = []
+    for run in range(2):
+        if run:
+            def _load_tree(self):
+                raise AssertionError(f'{self.source_file} parsed')
+
+            monkeypatch.setattr(datatypes.SourceCodeFile, 'load_tree',
+                                _load_tree)
+
+        project, _ = oss_fuzz.analyse_folder(
+            'c++',
+            str(project_dir),
+            'LLVMFuzzerTestOneInput',
+            dump_output=False,
+            cache_dir=str(cache_dir),
+        )
+        reports.append(project.get_report('LLVMFuzzerTestOneInput'))
+    monkeypatch.undo()
+
+    assert len(os.listdir(cache_dir)) == 2
+    assert (_get_sorted_functions(reports[0]) ==
+            _get_sorted_functions(reports[1]))
+
+    # Source file changed after caching
+    with open(project_dir / 'sample.cpp', 'a') as f:
+        f.write('\nint addedAfterCaching(int x) { return isPositive(x); }\n')
+
+    project, _ = oss_fuzz.analyse_folder(
+        'c++',
+        str(project_dir),
+        'LLVMFuzzerTestOneInput',
+        dump_output=False,
+        cache_dir=str(cache_dir),
+    )
+    report = project.get_report('LLVMFuzzerTestOneInput')
+    function_names = [
+        func['functionName'] for func in report['All functions']['Elements']
+    ]
+    assert 'addedAfterCaching' in function_names
+
+
+def test_tree_sitter_cpp_symbol_index():
+    project, _ = oss_fuzz.analyse_folder(
+        'c++',
+        'src/test/data/source-code/cpp/test-project-2',
+        'LLVMFuzzerTestOneInput',
+        dump_output=False,
+    )
+
+    # Name lookups
+    func = project.find_function_by_name('RecursiveNamespace::fibonacci',
+                                         True)
+    assert func and func.name == 'RecursiveNamespace::fibonacci'
+    assert project.find_function_by_name('fibonacci', True) is None
+    func = project.find_function_by_name('fibonacci', False)
+    assert func and func.name == 'RecursiveNamespace::fibonacci'
+
+    # Source file lookups
+    result = project._find_source_with_func_def(
+        'File2Namespace::functionInFile2')
+    assert result and result[0].source_file.endswith('crossfile.cpp')
+    assert project._find_source_with_func_def('missingFunction') is None
+
+    # Line lookups
+    func = project.get_function_by_source_suffix_line('recursive.cpp', 30)
+    assert func and func.name == 'RecursiveNamespace::fibonacci'
+    func = project.get_function_by_source_suffix_line('fuzzer.cpp', 19)
+    assert func and func.name == 'LLVMFuzzerTestOneInput'
+    assert project.get_function_by_source_suffix_line('fuzzer.cpp',
+                                                      40) is None
+
+
+def test_tree_sitter_cpp_caller_index():
+    project, _ = oss_fuzz.analyse_folder(
+        'c++',
+        'src/test/data/source-code/cpp/test-project-2',
+        'LLVMFuzzerTestOneInput',
+        dump_output=False,
+    )
+
+    # Function uses match all callsites ending with the function name
+    functions = project.report['All functions']['Elements']
+    for func in project.all_functions:
+        expected = len([
+            caller for caller in project.all_functions if any(
+                cs.endswith(func.name) for cs, _ in caller.base_callsites)
+        ])
+        func_dict = next(item for item in functions
+                         if item['functionName'] == func.name)
+        assert func_dict['functionUses'] == expected
+
+    func = project.find_function_by_name('RecursiveNamespace::fibonacci',
+                                         True)
+    assert func
+    callers = [
+        xref.name
+        for xref in project.get_cross_references_by_name(func.name)
+    ]
+    assert 'RecursiveNamespace::fibonacci' in callers
+    assert project.get_cross_references_by_name('missingFunction') == []
+
+
+def test_tree_sitter_cpp_function_depths():
+    project, _ = oss_fuzz.analyse_folder(
+        'c++',
+        'src/test/data/source-code/cpp/test-project-2',
+        'LLVMFuzzerTestOneInput',
+        dump_output=False,
+    )
+
+    depths = {
+        item['functionName']: item['functionDepth']
+        for item in project.report['All functions']['Elements']
+    }
+    assert depths['RecursiveNamespace::factorial'] == 1
+    assert depths['LLVMFuzzerTestOneInput'] == 2
+
+    # Long call chains and cycles
+    functions = [
+        types.SimpleNamespace(name=f'func{idx}',
+                              base_callsites=[(f'func{idx + 1}', 1)])
+        for idx in range(20000)
+    ]
+    functions[-1].base_callsites = [('func19990', 1)]
+    func_map = {func.name: func for func in functions}
+    project = datatypes.Project([])
+    project.calculate_function_depths(functions, func_map.get)
+    assert functions[-1].function_depth == 1
+    assert functions[19990].function_depth == 1
+    assert functions[0].function_depth == 19991
+
+
+def test_tree_sitter_cpp_parallel_calltrees(tmp_path):
+    """Calltrees extracted by worker processes must be identical to the
+    calltrees extracted in-process."""
+    outputs = []
+    for jobs in [1, 2]:
+        out = tmp_path / str(jobs)
+        out.mkdir()
+        oss_fuzz.analyse_folder(
+            'c++',
+            'src/test/data/source-code/cpp/test-project-7',
+            'LLVMFuzzerTestOneInput',
+            out=str(out),
+            jobs=jobs,
+        )
+        outputs.append({
+            path.name: path.read_text()
+            for path in out.iterdir() if path.suffix == '.data'
+        })
+
+    assert sorted(outputs[0]) == [
+        'fuzzerLogFile-sample1.data', 'fuzzerLogFile-sample2.data'
+    ]
+    assert outputs[0] == outputs[1]
+
+
+def test_tree_sitter_cpp_long_chains():
+    """Long chains of #elif branches and of field expressions are walked
+    iteratively rather than recursively."""
+    branches = 1100
+    source_code = frontend_c_cpp.analyse_source_code(
+        '#if A0\nint a0;\n' +
+        ''.join(f'#elif A{idx}\nint a{idx};\n'
+                for idx in range(1, branches)) + '#else\nint z;\n#endif\n')
+    assert len(source_code.macro_blocks) == branches + 1
+    assert source_code.macro_blocks[-1]['conditions'][-1] == {
+        'type': 'not',
+        'condition': f'A{branches - 1}'
+    }
+
+    source_code = frontend_c_cpp.analyse_source_code(
+        'struct S { S *next; void run(); };\n'
+        'void f(S *s) { s' + '->next' * 1100 + '->run(); }\n')
+    project = frontend_c_cpp.CppProject([source_code])
+    func = source_code.func_defs[-1]
+    func.extract_callsites(project)
+    assert len(func.base_callsites) == 1
+    assert func.base_callsites[0][0].endswith('::next::run')
@@ -208,3 +208,46 @@ def test_tree_sitter_rust_sample9():
 
     assert 'multiply_by_two' in functions_reached_two
     assert 'add_one' not in functions_reached_two
+
+
+def test_tree_sitter_rust_parallel_loading():
+    """Source files loaded by worker processes must give the same results
+    as source files loaded in-process, including the token trees of the
+    fuzzing macros that are parsed separately."""
+    reports = []
+    for jobs in [1, 2]:
+        project, _ = oss_fuzz.analyse_folder(
+            'rust',
+            'src/test/data/source-code/rust/test-project-1',
+            dump_output=False,
+            jobs=jobs,
+        )
+
+        harness = project.get_source_codes_with_harnesses()
+        assert len(harness) == 1
+
+        functions_reached = project.get_reachable_functions(harness[0].source_file, harness[0])
+        assert 'factorial' in functions_reached
+
+        reports.append(project.get_report('fuzz_target'))
+
+    assert reports[0] == reports[1]
+
+
+def test_tree_sitter_rust_harness_calltrees(tmp_path):
+    """Each harness calltree starts from the entry function of its own
+    harness."""
+    oss_fuzz.analyse_folder(
+        'rust',
+        'src/test/data/source-code/rust/test-project-9',
+        'fuzz_target',
+        out=str(tmp_path),
+        jobs=2,
+    )
+
+    calltree_one = (tmp_path / 'fuzzerLogFile-fuzzer_one.data').read_text()
+    calltree_two = (tmp_path / 'fuzzerLogFile-fuzzer_two.data').read_text()
+    assert 'add_one' in calltree_one
+    assert 'multiply_by_two' not in calltree_one
+    assert 'multiply_by_two' in calltree_two
+    assert 'add_one' not in calltree_two
@@ -20,7 +20,7 @@ import pytest
 sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../")
 
 from fuzz_introspector import code_coverage  # noqa: E402
-from fuzz_introspector.datatypes import fuzzer_profile  # noqa: E402
+from fuzz_introspector.datatypes import function_profile, fuzzer_profile  # noqa: E402
 
 TEST_DATA_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
 
@@ -157,3 +157,143 @@ def test_reaches_func(tmpdir, sample_cfg1):
     assert fp.reaches_func_combined('Random')
     assert fp.reaches_func_combined('def')
     assert not fp.reaches_func_combined('jkl')
+
+
+def test_intern_functions(tmpdir, sample_cfg1):
+    """test that function profiles are shared across fuzzer profiles"""
+    elem = [
+        generate_temp_elem("LLVMFuzzerTestOneInput", ["abc"]),
+        generate_temp_elem("abc", ["def"]),
+    ]
+    fp1 = base_cpp_profile(tmpdir, sample_cfg1, elem)
+    fp2 = base_cpp_profile(tmpdir, sample_cfg1, elem)
+    assert fp1.all_class_functions['abc'] is not fp2.all_class_functions['abc']
+
+    function_store = function_profile.FunctionProfileStore()
+    fp1.intern_functions(function_store)
+    fp2.intern_functions(function_store)
+
+    assert len(function_store) == 2
+    assert fp1.all_class_functions['abc'] is fp2.all_class_functions['abc']
+    assert (fp1.all_class_functions['LLVMFuzzerTestOneInput'] is
+            fp2.all_class_functions['LLVMFuzzerTestOneInput'])
+
+
+def test_set_all_reached_functions_shared(tmpdir, sample_cfg1):
+    """test that reached functions do not modify shared function profiles"""
+    elem = [
+        generate_temp_elem("LLVMFuzzerTestOneInput", ["abc"]),
+        generate_temp_elem("abc", []),
+    ]
+    fp1 = base_cpp_profile(tmpdir, sample_cfg1, elem)
+    fp2 = base_cpp_profile(tmpdir, sample_cfg1, elem)
+    function_store = function_profile.FunctionProfileStore()
+    fp1.intern_functions(function_store)
+    fp2.intern_functions(function_store)
+
+    fp1._set_all_reached_functions()
+    fp2._set_all_reached_functions()
+
+    entrypoint = fp1.all_class_functions['LLVMFuzzerTestOneInput']
+    assert entrypoint.functions_reached == ['abc']
+    assert fp1.functions_reached_by_fuzzer == [
+        'abc', 'LLVMFuzzerTestOneInput'
+    ]
+    assert fp2.functions_reached_by_fuzzer == [
+        'abc', 'LLVMFuzzerTestOneInput'
+    ]
+
+
+def test_reaches_func_bitsets(tmpdir, sample_cfg1):
+    """test reachability queries answered from bitsets"""
+    elem = [
+        generate_temp_elem("LLVMFuzzerTestOneInput", ["abc", "def"]),
+        generate_temp_elem("Random", ["stu", "vwx"])
+    ]
+    fp = base_cpp_profile(tmpdir, sample_cfg1, elem)
+    fp._set_all_reached_functions()
+    fp.coverage = code_coverage.load_llvm_coverage(TEST_DATA_PATH, 'reached_func')
+    fp._set_all_reached_functions_runtime()
+
+    function_store = function_profile.FunctionProfileStore()
+    fp.set_reachability_bitsets(function_store)
+
+    assert len(fp.reached_bitset) == len(set(fp.functions_reached_by_fuzzer))
+    assert fp.reaches_func('abc')
+    assert not fp.reaches_func('stu')
+    assert not fp.reaches_func('unknown')
+    assert fp.reaches_func_runtime('stu')
+    assert not fp.reaches_func_runtime('def')
+    assert fp.reaches_func_combined('def')
+    assert fp.reaches_func_combined('stu')
+    assert not fp.reaches_func_combined('jkl')
+
+
+def test_function_bitset():
+    """test the function bitset operations"""
+    bitset1 = function_profile.FunctionBitset([0, 3, 9, 64])
+    bitset2 = function_profile.FunctionBitset([3, 5])
+
+    assert len(bitset1) == 4
+    assert 9 in bitset1
+    assert 8 not in bitset1
+    assert 1000 not in bitset1
+    assert list(bitset1) == [0, 3, 9, 64]
+    assert list(bitset1 | bitset2) == [0, 3, 5, 9, 64]
+
+
+def test_propagate_functions_reached(tmpdir, sample_cfg1):
+    """test propagation of functions reached across recursive calls"""
+    elem = [
+        generate_temp_elem("LLVMFuzzerTestOneInput", ["abc"]),
+        generate_temp_elem("abc", ["def", "ext"]),
+        generate_temp_elem("def", ["ghi"]),
+        generate_temp_elem("ghi", ["def", "jkl"]),
+        generate_temp_elem("jkl", []),
+    ]
+    fp = base_cpp_profile(tmpdir, sample_cfg1, elem)
+    fp._propagate_functions_reached()
+
+    functions = fp.all_class_functions
+    assert set(functions['jkl'].functions_reached) == set()
+    assert functions['jkl'].function_depth == 0
+    assert set(functions['def'].functions_reached) == {'def', 'ghi', 'jkl'}
+    assert set(functions['ghi'].functions_reached) == {'def', 'ghi', 'jkl'}
+    assert functions['def'].function_depth == 1
+    assert set(functions['abc'].functions_reached) == {
+        'def', 'ghi', 'jkl', 'ext'
+    }
+    assert functions['abc'].function_depth == 2
+    assert functions['LLVMFuzzerTestOneInput'].function_depth == 3
+
+
+def test_propagate_functions_reached_project(tmpdir, sample_cfg1):
+    """test project-wide propagation of functions reached"""
+    elem = [
+        generate_temp_elem("LLVMFuzzerTestOneInput", ["abc"]),
+        generate_temp_elem("abc", ["def"]),
+        generate_temp_elem("def", []),
+    ]
+    fp1 = base_cpp_profile(tmpdir, sample_cfg1, elem)
+
+    # Second fuzzer with its own entrypoint
+    other_entrypoint = generate_temp_elem("LLVMFuzzerTestOneInput", ["def"])
+    other_entrypoint['functionSourceFile'] = '/src/wuffs/fuzz/other.c'
+    fp2 = fuzzer_profile.FuzzerProfile(
+        os.path.join(tmpdir, "test_file.data"), {
+            "Fuzzer filename": "/src/wuffs/fuzz/other.c",
+            "All functions": {
+                "Elements": [other_entrypoint] + elem[1:]
+            }
+        },
+        "c-cpp",
+        cfg_content=sample_cfg1)
+
+    fuzzer_profile.propagate_functions_reached([fp1, fp2])
+
+    assert fp1.functions_propagated and fp2.functions_propagated
+    assert fp1.all_class_functions['abc'] is fp2.all_class_functions['abc']
+    assert set(fp1.all_class_functions['LLVMFuzzerTestOneInput'].
+               functions_reached) == {'abc', 'def'}
+    assert set(fp2.all_class_functions['LLVMFuzzerTestOneInput'].
+               functions_reached) == {'def'}
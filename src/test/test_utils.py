@@ -242,3 +242,35 @@ def test_resolve_coverage_link(
     if (temp_file is not None):
         # Remove temp html_status.json file
         os.remove('temp_html_status.json')
+
+
+def test_get_file_index(tmp_path):
+    """Test the file index matches os.walk and follows changes in the tree"""
+    for path in ['a.c', 'src/b.cc', 'src/inner/c.c', 'src/inner/d.h',
+                 'build/e.c', 'src/build/f.c', 'tools/g.c', 'tools/.h']:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text('')
+    (tmp_path / 'link').symlink_to(tmp_path / 'src')
+
+    walked_files = []
+    for root, _, files in os.walk(str(tmp_path)):
+        if 'build' in root:
+            continue
+        walked_files.extend(os.path.join(root, f) for f in files)
+
+    file_index = utils.get_file_index(str(tmp_path), ['build'])
+    assert file_index.files == walked_files
+    assert file_index.get_files_with_extensions(['.c', '.h']) == [
+        f for f in walked_files if f.endswith(('c.c', 'd.h', 'a.c', 'g.c'))
+    ]
+
+    # Unchanged trees are served from the cache, and changed directories
+    # are listed again. Directories modified just before being listed are
+    # always listed again, so the tree is first made to look older.
+    for root, _, _ in os.walk(str(tmp_path)):
+        os.utime(root, ns=(0, 0))
+    file_index = utils.get_file_index(str(tmp_path), ['build'])
+    assert utils.get_file_index(str(tmp_path), ['build']) is file_index
+    (tmp_path / 'src' / 'inner' / 'h.c').write_text('')
+    assert str(tmp_path / 'src' / 'inner' / 'h.c') in utils.get_file_index(
+        str(tmp_path), ['build']).get_files_with_extensions(['.c'])
@@ -59,6 +59,12 @@ def create_app():
             print('Using remote version of webapp')
             routes.allow_shutdown = False
 
+    try:
+        routes.allow_admin = bool(os.environ['FUZZ_INTROSPECTOR_ADMIN'])
+        print('Admin endpoints are allowed')
+    except KeyError:
+        routes.allow_admin = False
+
     webapp.load_db()
 
     return app
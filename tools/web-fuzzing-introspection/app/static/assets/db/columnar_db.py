@@ -0,0 +1,141 @@
+# Copyright 2024 Fuzz Introspector Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Writer of the columnar function DB files read by the webapp.
+
+A columnar DB file holds a list of function dictionaries with one column
+per key. The layout of a file is:
+  - the magic bytes `FIDB`, the format version and the length of the
+    header, as little endian unsigned 32 bit integers;
+  - a JSON header with the number of rows, the type and offset of each
+    column and the offsets of the string table;
+  - the columns and the string table, each aligned to 8 bytes and in
+    little endian byte order.
+
+Columns are typed as `bool` (unsigned bytes), `int` (signed 64 bit
+integers), `float` (doubles), `str` or `json`. The latter two hold 32 bit
+ids into the string table, a `json` column storing the JSON encoding of its
+values. Rows without the key of a column hold the id `MISSING`, and numeric
+columns are stored as `json` columns if a row has no value for them.
+
+The string table holds the distinct strings of the file as 64 bit end
+offsets into UTF-8 encoded data.
+"""
+
+import sys
+import json
+import struct
+from array import array
+from typing import Any, Dict, List, Union
+
+FILE_EXTENSION = '.fidb'
+MAGIC = b'FIDB'
+VERSION = 1
+MISSING = 0xFFFFFFFF
+
+
+def _get_column_type(values: List[Any]) -> str:
+    """Gets the narrowest column type holding all values."""
+    if any(value is None for value in values):
+        return 'json'
+    if all(isinstance(value, bool) for value in values):
+        return 'bool'
+    if all(
+            isinstance(value, int) and not isinstance(value, bool)
+            for value in values):
+        return 'int'
+    if all(
+            isinstance(value, (int, float)) and not isinstance(value, bool)
+            for value in values):
+        return 'float'
+    if all(isinstance(value, str) for value in values):
+        return 'str'
+    return 'json'
+
+
+def _align(data: bytearray) -> None:
+    data.extend(b'\0' * (-len(data) % 8))
+
+
+def _to_bytes(column: Union['array[int]', 'array[float]']) -> bytes:
+    if sys.byteorder != 'little':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_columnar_db(function_list: List[Dict[str, Any]], path: str) -> None:
+    """Writes a list of function dictionaries as a columnar DB file."""
+    keys: Dict[str, None] = dict()
+    for function in function_list:
+        keys.update(dict.fromkeys(function))
+
+    string_ids: Dict[str, int] = dict()
+
+    def _get_string_id(string: str) -> int:
+        string_id = string_ids.get(string)
+        if string_id is None:
+            string_id = len(string_ids)
+            string_ids[string] = string_id
+        return string_id
+
+    columns = []
+    for key in keys:
+        values: List[Any] = [function.get(key) for function in function_list]
+        column_type = _get_column_type(values)
+        column: Union['array[int]', 'array[float]']
+        if column_type == 'bool':
+            column = array('B', values)
+        elif column_type == 'int':
+            column = array('q', values)
+        elif column_type == 'float':
+            column = array('d', values)
+        else:
+            column = array('I')
+            for function in function_list:
+                if key not in function:
+                    column.append(MISSING)
+                elif column_type == 'str':
+                    column.append(_get_string_id(function[key]))
+                else:
+                    value = json.dumps(function[key], separators=(',', ':'))
+                    column.append(_get_string_id(value))
+        columns.append((key, column_type, column))
+
+    # Lay out the columns and the string table after the header.
+    body = bytearray()
+    header: Dict[str, Any] = {'rows': len(function_list), 'columns': {}}
+    for key, column_type, column in columns:
+        header['columns'][key] = {'type': column_type, 'offset': len(body)}
+        body.extend(_to_bytes(column))
+        _align(body)
+
+    string_data = bytearray()
+    string_offsets = array('Q')
+    for string in string_ids:
+        string_data.extend(string.encode('utf-8'))
+        string_offsets.append(len(string_data))
+    header['strings'] = {'count': len(string_offsets), 'offsets': len(body)}
+    body.extend(_to_bytes(string_offsets))
+    header['strings']['data'] = len(body)
+    body.extend(string_data)
+
+    header_data = bytearray(json.dumps(header).encode('utf-8'))
+    prefix_len = len(MAGIC) + 8
+    header_data.extend(b' ' * (-(prefix_len + len(header_data)) % 8))
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<II', VERSION, len(header_data)))
+        f.write(header_data)
+        f.write(body)
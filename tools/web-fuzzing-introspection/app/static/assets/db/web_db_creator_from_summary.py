@@ -31,6 +31,7 @@ import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Any, Optional, Dict, Tuple, Set
 
+import columnar_db
 import constants
 import oss_fuzz
 
@@ -38,6 +39,7 @@ DB_JSON_DB_TIMESTAMP = 'db-timestamps.json'
 DB_JSON_ALL_PROJECT_TIMESTAMP = 'all-project-timestamps.json'
 DB_JSON_ALL_FUNCTIONS = 'all-functions-db-{PROJ}.json'
 DB_JSON_ALL_CONSTRUCTORS = 'all-constructors-db-{PROJ}.json'
+DB_JSON_ALL_XREFS = 'all-xrefs-db-{PROJ}.json'
 DB_JSON_ALL_CURRENT = 'all-project-current.json'
 DB_JSON_ALL_BRANCH_BLOCKERS = 'all-branch-blockers.json'
 DB_BUILD_STATUS_JSON = 'build-status.json'
@@ -48,6 +50,7 @@ ALL_JSON_FILES = [
     DB_JSON_ALL_PROJECT_TIMESTAMP,
     DB_JSON_ALL_FUNCTIONS,
     DB_JSON_ALL_CONSTRUCTORS,
+    DB_JSON_ALL_XREFS,
     DB_JSON_ALL_CURRENT,
 ]
 
@@ -1254,7 +1257,24 @@ def extend_db_json_files(project_timestamps, output_directory,
             f.write(orjson.dumps(existing_timestamps).decode('utf-8'))
 
 
-def extend_func_db(function_dict, output_dir, target):
+def create_xref_db(function_list) -> Dict[str, List[List[Any]]]:
+    """Creates the reverse call index of a function list. Maps the name of
+    each called function to a list of [caller name, caller filename, line]
+    of its callsites, in the order of the function list."""
+    xref_db: Dict[str, List[List[Any]]] = dict()
+    for function in function_list:
+        for callee, lines in function.get('callsites', {}).items():
+            xrefs = xref_db.setdefault(callee, [])
+            for line in lines:
+                xrefs.append([function['name'], function['file'], int(line)])
+    return xref_db
+
+
+def extend_func_db(function_dict, output_dir, target, xref_target=None):
+    """Extends the function json of each project with a new function list,
+    and writes the resulting function list as a columnar DB next to it. If
+    `xref_target` is set, the reverse call index of the resulting function
+    list is written to it."""
     # Loop for function list of all projects
     for proj in function_dict:
         json_path = os.path.join(output_dir, target.replace('{PROJ}', proj))
@@ -1278,6 +1298,15 @@ def extend_func_db(function_dict, output_dir, target):
         # Write to the function json for the target project
         with open(json_path, 'w') as f:
             json.dump(function_list, f)
+        columnar_db.write_columnar_db(
+            function_list,
+            os.path.splitext(json_path)[0] + columnar_db.FILE_EXTENSION)
+
+        if xref_target:
+            xref_path = os.path.join(output_dir,
+                                     xref_target.replace('{PROJ}', proj))
+            with open(xref_path, 'w') as f:
+                json.dump(create_xref_db(function_list), f)
 
 
 def update_db_files(db_timestamp,
@@ -1292,7 +1321,8 @@ def update_db_files(db_timestamp,
         "Updating the database with DB snapshot. Number of functions in total: %d",
         db_timestamp['function_count'])
     if should_include_details:
-        extend_func_db(function_dict, output_directory, DB_JSON_ALL_FUNCTIONS)
+        extend_func_db(function_dict, output_directory, DB_JSON_ALL_FUNCTIONS,
+                       DB_JSON_ALL_XREFS)
         extend_func_db(constructor_dict, output_directory,
                        DB_JSON_ALL_CONSTRUCTORS)
 
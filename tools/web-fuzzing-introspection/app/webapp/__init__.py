@@ -1,5 +1,6 @@
 import os
 import json
+import threading
 
 from typing import Dict, List, Any
 from . import data_storage, models
@@ -89,6 +90,8 @@ def load_db() -> None:
                 recent_results=project_timestamp.get('recent_results'),
             ))
 
+    data_storage.index_projects()
+
     if 'G_ANALYTICS_TAG' in os.environ:
         os.remove(project_currents)
 
@@ -123,7 +126,10 @@ def load_db() -> None:
             projects_not_in_ossfuzz = json.load(f)
         data_storage.PROJECTS_NOT_IN_OSSFUZZ = projects_not_in_ossfuzz
 
-    # Load all functions into a cache
-    data_storage.load_cache()
+    # Functions are loaded into the cache on demand. Index the function
+    # names for searching and load the hot projects in the background.
+    threading.Thread(target=data_storage.prewarm_cache,
+                     args=(data_storage.PREWARM_PROJECTS, ),
+                     daemon=True).start()
 
     return
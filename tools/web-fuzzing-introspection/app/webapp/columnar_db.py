@@ -0,0 +1,208 @@
+# Copyright 2024 Fuzz Introspector Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Reader of the columnar function DB files. The format is described in
+static/assets/db/columnar_db.py, which writes the files."""
+
+import os
+import sys
+import copy
+import mmap
+import struct
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+import orjson
+
+from . import models
+
+FILE_EXTENSION = '.fidb'
+MAGIC = b'FIDB'
+VERSION = 1
+MISSING = 0xFFFFFFFF
+
+# Approximate number of bytes taken by a FunctionView.
+FUNCTION_VIEW_SIZE = 72
+
+_TYPECODES: Dict[str, Literal['B', 'q', 'd', 'I']] = {
+    'bool': 'B',
+    'int': 'q',
+    'float': 'd',
+    'str': 'I',
+    'json': 'I'
+}
+
+
+class ColumnarFunctionDB:
+    """Memory-mapped columnar function DB file. Values are decoded from the
+    mapped file on access, so only the pages of the queried rows and columns
+    are read."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'Not a columnar function DB: {path}')
+        version, header_len = struct.unpack_from('<II', self.mm, len(MAGIC))
+        if version != VERSION:
+            raise ValueError(f'Unsupported columnar function DB version: '
+                             f'{version}')
+        body_offset = len(MAGIC) + 8 + header_len
+        header = orjson.loads(self.mm[len(MAGIC) + 8:body_offset])
+
+        view = memoryview(self.mm)
+        self.rows: int = header['rows']
+        self.columns: Dict[str, Tuple[str, 'memoryview[Any]']] = dict()
+        for key, column in header['columns'].items():
+            typecode = _TYPECODES[column['type']]
+            start = body_offset + column['offset']
+            end = start + self.rows * struct.calcsize(typecode)
+            self.columns[key] = (column['type'],
+                                 view[start:end].cast(typecode))
+
+        strings = header['strings']
+        offsets_start = body_offset + strings['offsets']
+        self.string_offsets = view[offsets_start:offsets_start +
+                                   strings['count'] * 8].cast('Q')
+        self.string_data_offset = body_offset + strings['data']
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def get_string(self, string_id: int) -> str:
+        start = self.string_offsets[string_id - 1] if string_id else 0
+        end = self.string_offsets[string_id]
+        return self.mm[self.string_data_offset +
+                       start:self.string_data_offset + end].decode('utf-8')
+
+    def has_value(self, key: str, row: int) -> bool:
+        """Returns True if the row has a value for the key."""
+        column = self.columns.get(key)
+        if column is None:
+            return False
+        column_type, values = column
+        return column_type not in ('str', 'json') or values[row] != MISSING
+
+    def get_value(self, key: str, row: int, default: Any = None) -> Any:
+        """Gets the value of the key in the row, or `default` if the row
+        has no value for it."""
+        column = self.columns.get(key)
+        if column is None:
+            return default
+
+        column_type, values = column
+        value = values[row]
+        if column_type == 'bool':
+            return bool(value)
+        if column_type in ('int', 'float'):
+            return value
+        if value == MISSING:
+            return default
+        if column_type == 'str':
+            return self.get_string(value)
+        return orjson.loads(self.get_string(value))
+
+
+def load_columnar_db(path: str) -> Optional[ColumnarFunctionDB]:
+    """Maps the columnar function DB file at `path`, if there is one
+    readable on this machine."""
+    if sys.byteorder != 'little' or not os.path.isfile(path):
+        return None
+    return ColumnarFunctionDB(path)
+
+
+class FunctionView:
+    """Lightweight view of a row of a columnar function DB, with the
+    attributes of `models.Function`. Attributes are read from the DB on
+    every access."""
+    __slots__ = ('db', 'row', 'project', 'is_constructor')
+
+    # Attribute name -> (key, default), as read by
+    # `data_storage.load_functions` from the json function DB. Defaults are
+    # copied, so that views do not share mutable defaults.
+    FIELDS: Dict[str, Tuple[str, Any]] = {
+        'name': ('name', ''),
+        'runtime_code_coverage': ('cov', 0.0),
+        'function_filename': ('file', ''),
+        'reached_by_fuzzers': ('fuzzers', []),
+        'cov_fuzzers': ('cov_fuzzers', []),
+        'comb_fuzzers': ('comb_fuzzers', []),
+        'code_coverage_url': ('cov_url', ''),
+        'llvm_instruction_count': ('icount', 0),
+        'accummulated_cyclomatic_complexity': ('acc_cc', 0),
+        'undiscovered_complexity': ('u-cc', 0),
+        'function_arguments': ('args', []),
+        'function_argument_names': ('args-names', []),
+        'source_line_begin': ('src_begin', -1),
+        'source_line_end': ('src_end', -1),
+        'callsites': ('callsites', {}),
+        'debug_data': ('debug', {}),
+        'is_accessible': ('access', True),
+        'is_jvm_library': ('jvm_lib', False),
+        'is_enum_class': ('enum', False),
+        'is_static': ('static', False),
+        'need_close': ('need_close', False),
+        'exceptions': ('exc', []),
+        'asserts': ('asserts', []),
+    }
+
+    def __init__(self, db: ColumnarFunctionDB, row: int, project: str,
+                 is_constructor: bool):
+        self.db = db
+        self.row = row
+        self.project = project
+        self.is_constructor = is_constructor
+
+    def __getattr__(self, attr: str) -> Any:
+        field = FunctionView.FIELDS.get(attr)
+        if field is None:
+            raise AttributeError(attr)
+        key, default = field
+        return self.db.get_value(key, self.row, copy.copy(default))
+
+    @property
+    def is_reached(self) -> bool:
+        return len(self.reached_by_fuzzers) > 0
+
+    @property
+    def calldepth(self) -> int:
+        return 0
+
+    @property
+    def return_type(self) -> str:
+        # Constructors must have a return type of its own class
+        if self.is_constructor:
+            return self.function_filename
+        return self.db.get_value('rtn', self.row, '')
+
+    @property
+    def raw_function_name(self) -> str:
+        if not self.db.has_value('raw-name', self.row):
+            return self.name
+        return self.db.get_value('raw-name', self.row)
+
+    @property
+    def func_signature(self) -> str:
+        if not self.db.has_value('sig', self.row):
+            return self.name
+        func_signature = self.db.get_value('sig', self.row)
+        # Handles the case when function signature is not available
+        if func_signature == 'N/A':
+            return self.name
+        return func_signature
+
+    @property
+    def function_debug_arguments(self) -> List[str]:
+        return self.debug_data.get('args', [])
+
+    to_dict = models.Function.to_dict
@@ -1,13 +1,23 @@
 # Auto-generated
 #from app.site.models import *
 
-from typing import List, Dict, Any, Optional
+from typing import (List, Dict, Any, Callable, Iterator, Optional, Tuple,
+                    Union)
 
 import os
+import sys
+import gzip
 import json
 import orjson
+import random
+import logging
+import functools
+import threading
+from collections import OrderedDict
 
 from .models import *
+from . import columnar_db
+from .helper import search_helper
 
 all_functions_file = os.path.join(
     os.path.dirname(__file__),
@@ -15,6 +25,30 @@ all_functions_file = os.path.join(
 all_constructors_file = os.path.join(
     os.path.dirname(__file__),
     '../static/assets/db/all-constructors-db-{PROJ}.json')
+all_xrefs_file = os.path.join(os.path.dirname(__file__),
+                              '../static/assets/db/all-xrefs-db-{PROJ}.json')
+
+# Number of projects whose cross references are kept in memory.
+XREF_CACHE_SIZE = int(
+    os.environ.get('FUZZ_INTROSPECTOR_XREF_CACHE_SIZE', '128'))
+
+# Bounds of the project function cache, 0 for no bound.
+CACHE_MAX_PROJECTS = int(
+    os.environ.get('FUZZ_INTROSPECTOR_CACHE_MAX_PROJECTS', '0'))
+CACHE_MAX_BYTES = int(os.environ.get('FUZZ_INTROSPECTOR_CACHE_MAX_BYTES', '0'))
+
+# Comma separated projects loaded into the cache in the background at
+# startup.
+PREWARM_PROJECTS = [
+    project for project in os.environ.get('FUZZ_INTROSPECTOR_PREWARM_PROJECTS',
+                                          '').split(',') if project
+]
+
+logger = logging.getLogger(__name__)
+
+# Function of a project, read from the json function DB or from a row of
+# the columnar function DB.
+ProjectFunction = Union[Function, columnar_db.FunctionView]
 
 PROJECT_TIMESTAMPS: List[ProjectTimestamp] = []
 
@@ -30,28 +64,283 @@ ALL_HEADER_FILES: List[Dict[str, Any]] = []
 
 TOTAL_FUNCTION_COUNT = -1
 
-JSON_TO_FUNCTION_CACHE: Dict[str, List[Function]] = dict()
-
 PROJECTS_NOT_IN_OSSFUZZ: List[str] = []
 
 ALL_INTEGRATED_PROJECTS: List[Dict[str, Any]] = []
 
+# Lookup index, see `index_projects`.
+PROJECT_NAME_TO_PROJECT: Dict[str, Project] = dict()
+
+# Optional SQLite FTS5 database file backing the function search index.
+SEARCH_INDEX_DB_PATH = os.environ.get('FUZZ_INTROSPECTOR_SEARCH_INDEX_DB', '')
+
+# Search index of the functions of all projects, referencing functions by
+# their project position in PROJECTS and their position in the function
+# list of the project, see `_get_function_ref`. None until it is built in
+# the background, see `build_search_index`.
+FUNCTION_SEARCH_INDEX: Optional[search_helper.FunctionSearchIndex] = None
+
+FUNCTION_SEARCH_INDEX_BUILDING = False
+
+# Number of times PROJECTS was indexed, so that a search index built over
+# a previous list of projects is discarded.
+PROJECTS_GENERATION = 0
+
+FUNCTION_SEARCH_INDEX_LOCK = threading.Lock()
+
+
+class FunctionIndex:
+    """Lookup indexes over the functions and constructors of a project.
+    `by_name` only holds the functions and `constructors_by_name` the
+    constructors. The other indexes keep the functions in the order of the
+    function list followed by the constructor list."""
+    __slots__ = ('by_name', 'constructors_by_name', 'by_raw_name',
+                 'by_signature')
+
+    def __init__(self, functions: List[ProjectFunction],
+                 constructors: List[ProjectFunction]):
+        self.by_name: Dict[str, List[ProjectFunction]] = dict()
+        self.constructors_by_name: Dict[str, List[ProjectFunction]] = dict()
+        self.by_raw_name: Dict[str, List[ProjectFunction]] = dict()
+        self.by_signature: Dict[str, List[ProjectFunction]] = dict()
+        for function in functions:
+            self.by_name.setdefault(function.name, []).append(function)
+        for function in constructors:
+            self.constructors_by_name.setdefault(function.name,
+                                                 []).append(function)
+
+        for function in functions + constructors:
+            self.by_raw_name.setdefault(function.raw_function_name,
+                                        []).append(function)
+            self.by_signature.setdefault(function.func_signature,
+                                         []).append(function)
+
+
+class ProjectFunctions:
+    """Functions and constructors of a project held in the cache, with the
+    approximate number of bytes they take."""
+    __slots__ = ('functions', 'constructors', 'size', 'function_index')
+
+    def __init__(self, functions: List[ProjectFunction],
+                 constructors: List[ProjectFunction], size: int):
+        self.functions = functions
+        self.constructors = constructors
+        self.size = size
+        self.function_index: Optional[FunctionIndex] = None
+
+
+class ProjectCache:
+    """Least recently used cache of the functions of projects, bounded by
+    a number of projects and a number of bytes. The most recently used
+    project is always kept, even if it exceeds the bounds alone."""
+
+    def __init__(self, max_projects: int, max_bytes: int):
+        self.max_projects = max_projects
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, ProjectFunctions] = OrderedDict()
+        self.lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _is_full(self) -> bool:
+        return ((self.max_projects > 0
+                 and len(self.entries) > self.max_projects)
+                or (self.max_bytes > 0 and self.size > self.max_bytes))
+
+    def get(self, proj: str) -> ProjectFunctions:
+        """Gets the functions of a project, loading them on a miss."""
+        with self.lock:
+            entry = self.entries.get(proj)
+            if entry is not None:
+                self.hits += 1
+                self.entries.move_to_end(proj)
+                return entry
+            self.misses += 1
+
+        # Projects are loaded outside of the lock, so a slow load does not
+        # block the requests of other projects.
+        entry = load_project_functions(proj)
+
+        with self.lock:
+            if proj in self.entries:
+                # Loaded concurrently by another request.
+                return self.entries[proj]
+            self.entries[proj] = entry
+            self.size += entry.size
+            while len(self.entries) > 1 and self._is_full():
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= evicted.size
+                self.evictions += 1
+        return entry
+
+    def get_if_cached(self, proj: str) -> Optional[ProjectFunctions]:
+        """Gets the functions of a project without loading them or
+        affecting the eviction order."""
+        with self.lock:
+            return self.entries.get(proj)
+
+    def get_for_scan(self, proj: str) -> ProjectFunctions:
+        """Gets the functions of a project as part of a scan over many
+        projects. Cached projects are returned without affecting the
+        eviction order and other projects are loaded without caching them,
+        so that a scan does not evict the projects in use."""
+        entry = self.get_if_cached(proj)
+        if entry is not None:
+            return entry
+        return load_project_functions(proj)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'projects': len(self.entries),
+                'bytes': self.size,
+                'max_projects': self.max_projects,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+PROJECT_CACHE = ProjectCache(CACHE_MAX_PROJECTS, CACHE_MAX_BYTES)
+
 
 def get_projects() -> List[Project]:
     return PROJECTS
 
 
-def load_cache():
+def index_projects() -> None:
+    """Rebuilds the project name index. Must be called once PROJECTS is
+    loaded, see `load_db`, and drops the search index which refers to the
+    positions of the projects."""
+    global FUNCTION_SEARCH_INDEX, PROJECTS_GENERATION
+
+    PROJECT_NAME_TO_PROJECT.clear()
     for project in PROJECTS:
-        get_functions_by_project(project.name)
+        PROJECT_NAME_TO_PROJECT.setdefault(project.name, project)
+    with FUNCTION_SEARCH_INDEX_LOCK:
+        FUNCTION_SEARCH_INDEX = None
+        PROJECTS_GENERATION += 1
+
+
+def get_project_by_name(project_name: str) -> Optional[Project]:
+    """Gets the project with the given name."""
+    return PROJECT_NAME_TO_PROJECT.get(project_name, None)
+
+
+def get_function_index(proj: str) -> FunctionIndex:
+    """Gets the lookup indexes of the functions and constructors of a
+    project. The indexes are cached and evicted with the functions of the
+    project."""
+    entry = PROJECT_CACHE.get(proj)
+    if entry.function_index is None:
+        entry.function_index = FunctionIndex(entry.functions,
+                                             entry.constructors)
+    return entry.function_index
+
+
+def get_project_functions_by_name(proj: str,
+                                  function_name: str) -> List[ProjectFunction]:
+    """Gets the functions followed by the constructors of a project with
+    the given name."""
+    function_index = get_function_index(proj)
+    return (function_index.by_name.get(function_name, []) +
+            function_index.constructors_by_name.get(function_name, []))
+
+
+def get_functions_by_name(function_name: str) -> List[ProjectFunction]:
+    """Gets the functions with the given name across all projects, in
+    the order of the projects."""
+    search_index = get_search_index()
+    if search_index is None:
+        return [
+            function for function in _scan_all_functions()
+            if function.name == function_name
+        ]
+    return _get_functions_from_refs(search_index.get_refs(function_name))
+
+
+def search_functions(
+        query: str,
+        mode: str = 'substring',
+        limit: Optional[int] = None,
+        sample: bool = False,
+        count_all: bool = True) -> Tuple[List[ProjectFunction], int]:
+    """Returns at most `limit` functions of all projects whose name matches
+    the query, and the total number of matching functions. If `count_all`
+    is False, the total is the number of returned functions. If `sample` is
+    set, the functions are a random sample of all matching functions.
+
+    Functions are grouped by name, with the names in the order they first
+    appear in the projects rather than in the order of the DB, see
+    `search_helper.FunctionSearchIndex`. While the search index is built,
+    all functions are scanned instead and are in the order of the DB."""
+    search_index = get_search_index()
+    if search_index is None:
+        functions = [
+            function for function in _scan_all_functions()
+            if search_helper.name_matches(function.name, query, mode)
+        ]
+        total_matches = len(functions)
+        if limit is not None:
+            if sample:
+                functions = random.sample(functions, min(limit, total_matches))
+            else:
+                functions = functions[:limit]
+        if not count_all:
+            total_matches = len(functions)
+        return functions, total_matches
+
+    if sample:
+        refs, total_matches = search_index.search(query, mode)
+        if limit is not None:
+            refs = random.sample(refs, min(limit, total_matches))
+    else:
+        refs, total_matches = search_index.search(query, mode, limit,
+                                                  count_all)
+    return _get_functions_from_refs(refs), total_matches
+
+
+def prewarm_cache(project_names: List[str]) -> None:
+    """Builds the search index and loads the given projects into the
+    cache."""
+    build_search_index()
+    for project_name in project_names:
+        get_functions_by_project(project_name)
+    logger.info('Prewarmed %d projects', len(project_names))
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    return PROJECT_CACHE.get_stats()
+
 
+def get_functions_by_project(proj: str) -> List[ProjectFunction]:
+    return PROJECT_CACHE.get(proj).functions
 
-def get_functions_by_project(proj: str) -> List[Function]:
-    return retrieve_functions(proj, False)
 
+def get_constructors_by_project(proj: str) -> List[ProjectFunction]:
+    return PROJECT_CACHE.get(proj).constructors
 
-def get_constructors_by_project(proj: str) -> List[Function]:
-    return retrieve_functions(proj, True)
+
+def scan_functions_by_project(proj: str) -> List[ProjectFunction]:
+    """Gets the functions of a project for a scan over all projects,
+    without evicting the cache. Uncached projects are loaded on every call,
+    so the functions may be new objects on every call."""
+    return PROJECT_CACHE.get_for_scan(proj).functions
+
+
+def _scan_all_functions() -> Iterator[ProjectFunction]:
+    """Iterates over the functions of all projects, serving searches
+    while the search index is built."""
+    for project in PROJECTS:
+        yield from scan_functions_by_project(project.name)
 
 
 def get_blockers() -> List[BranchBlocker]:
@@ -110,23 +399,186 @@ def get_project_branch_blockers(project: str) -> List[BranchBlocker]:
     return branch_models
 
 
-def retrieve_functions(proj: str, is_constructor: bool) -> List[Function]:
-    """Retrieve functions or constructors"""
+@functools.lru_cache(maxsize=XREF_CACHE_SIZE)
+def get_cross_references(proj: str) -> Dict[str, List[List[Any]]]:
+    """Gets the reverse call index of a project, mapping the name of each
+    called function to a list of [caller name, caller filename, line] of
+    its callsites. The index is built from the functions of the project if
+    the DB has no index for it."""
+    json_path = all_xrefs_file.replace('{PROJ}', proj)
+    if os.path.isfile(json_path):
+        with open(json_path, 'r') as file:
+            return orjson.loads(file.read())
+
+    xrefs: Dict[str, List[List[Any]]] = dict()
+    for function in get_functions_by_project(proj):
+        for callee, lines in function.callsites.items():
+            callee_xrefs = xrefs.setdefault(callee, [])
+            for line in lines:
+                callee_xrefs.append(
+                    [function.name, function.function_filename,
+                     int(line)])
+    return xrefs
+
+
+@functools.lru_cache(maxsize=XREF_CACHE_SIZE)
+def get_cross_reference_counts(proj: str) -> Dict[str, int]:
+    """Gets the number of functions calling each called function of a
+    project."""
+    return {
+        callee: len({(xref[0], xref[1])
+                     for xref in callee_xrefs})
+        for callee, callee_xrefs in get_cross_references(proj).items()
+    }
+
+
+def _get_function_ref(project_idx: int, function_idx: int) -> int:
+    return (project_idx << 32) | function_idx
+
+
+def _get_function_getter(proj: str) -> Callable[[int], ProjectFunction]:
+    """Gets a callable returning the function at a position of the function
+    list of a project. If the project is not cached and has a columnar DB,
+    only the rows of the requested functions are read from it without
+    caching the project. Otherwise the project is loaded into the cache, so
+    that its json DB is parsed once."""
+    entry = PROJECT_CACHE.get_if_cached(proj)
+    if entry is None:
+        db = columnar_db.load_columnar_db(_get_columnar_db_path(proj, False))
+        if db is not None:
+            return lambda row: columnar_db.FunctionView(db, row, proj, False)
+        entry = PROJECT_CACHE.get(proj)
+    return entry.functions.__getitem__
+
+
+def _get_functions_from_refs(refs: List[int]) -> List[ProjectFunction]:
+    """Gets the functions of search index references, reading the
+    functions of projects with a columnar DB without loading the projects
+    into the cache, see `_get_function_getter`."""
+    function_getters: Dict[int, Callable[[int], ProjectFunction]] = dict()
+    functions = []
+    for ref in refs:
+        project_idx = ref >> 32
+        get_function = function_getters.get(project_idx)
+        if get_function is None:
+            get_function = _get_function_getter(PROJECTS[project_idx].name)
+            function_getters[project_idx] = get_function
+        functions.append(get_function(ref & 0xFFFFFFFF))
+    return functions
+
+
+def _iter_search_index_entries():
+    """Iterates over the names and references of the functions of all
+    projects. Projects that are not cached are read from their columnar DB
+    without caching them, or loaded into the cache so that their json DB is
+    parsed once."""
+    for project_idx, project in enumerate(PROJECTS):
+        entry = PROJECT_CACHE.get_if_cached(project.name)
+        if entry is not None:
+            functions: Optional[List[ProjectFunction]] = entry.functions
+        else:
+            functions = _load_function_views(project.name, False)
+        if functions is None:
+            functions = PROJECT_CACHE.get(project.name).functions
+        for function_idx, function in enumerate(functions):
+            yield function.name, _get_function_ref(project_idx, function_idx)
+
+
+def build_search_index() -> None:
+    """Builds the search index of the names of all functions in the DB,
+    unless it is built or being built. Requests are not blocked while the
+    index is built, see `get_search_index`."""
+    global FUNCTION_SEARCH_INDEX, FUNCTION_SEARCH_INDEX_BUILDING
+
+    with FUNCTION_SEARCH_INDEX_LOCK:
+        if FUNCTION_SEARCH_INDEX is not None or FUNCTION_SEARCH_INDEX_BUILDING:
+            return
+        FUNCTION_SEARCH_INDEX_BUILDING = True
+        generation = PROJECTS_GENERATION
+
+    search_index = None
+    try:
+        search_index = search_helper.create_search_index(
+            _iter_search_index_entries(), SEARCH_INDEX_DB_PATH)
+        logger.info('Built the function search index')
+    finally:
+        with FUNCTION_SEARCH_INDEX_LOCK:
+            FUNCTION_SEARCH_INDEX_BUILDING = False
+            if search_index is not None and generation == PROJECTS_GENERATION:
+                FUNCTION_SEARCH_INDEX = search_index
+
+
+def get_search_index() -> Optional[search_helper.FunctionSearchIndex]:
+    """Gets the search index of the names of all functions in the DB, or
+    None if it is not built yet, in which case requests scan all functions
+    instead of waiting. The index is then built in the background if it is
+    not being built already."""
+    with FUNCTION_SEARCH_INDEX_LOCK:
+        if FUNCTION_SEARCH_INDEX is not None or FUNCTION_SEARCH_INDEX_BUILDING:
+            return FUNCTION_SEARCH_INDEX
+    threading.Thread(target=build_search_index, daemon=True).start()
+    return None
+
+
+def _get_functions_json_path(proj: str, is_constructor: bool) -> str:
     if is_constructor:
-        json_path = all_constructors_file.replace('{PROJ}', proj)
-    else:
-        json_path = all_functions_file.replace('{PROJ}', proj)
+        return all_constructors_file.replace('{PROJ}', proj)
+    return all_functions_file.replace('{PROJ}', proj)
 
-    if json_path in JSON_TO_FUNCTION_CACHE:
-        return JSON_TO_FUNCTION_CACHE[json_path]
+
+def _get_columnar_db_path(proj: str, is_constructor: bool) -> str:
+    json_path = _get_functions_json_path(proj, is_constructor)
+    return os.path.splitext(json_path)[0] + columnar_db.FILE_EXTENSION
+
+
+def _load_function_views(
+        proj: str, is_constructor: bool) -> Optional[List[ProjectFunction]]:
+    """Loads views of the functions or constructors of a project from its
+    columnar DB, if it has one."""
+    db = columnar_db.load_columnar_db(
+        _get_columnar_db_path(proj, is_constructor))
+    if db is None:
+        return None
+    return [
+        columnar_db.FunctionView(db, row, proj, is_constructor)
+        for row in range(len(db))
+    ]
+
+
+def load_project_functions(proj: str) -> ProjectFunctions:
+    """Loads the functions and constructors of a project, without caching
+    them."""
+    functions, functions_size = load_functions(proj, False)
+    constructors, constructors_size = load_functions(proj, True)
+    return ProjectFunctions(functions, constructors,
+                            functions_size + constructors_size)
+
+
+def load_functions(proj: str,
+                   is_constructor: bool) -> Tuple[List[ProjectFunction], int]:
+    """Loads the functions or constructors of a project, without caching
+    them. Returns the functions and the approximate number of bytes they
+    take."""
+    json_path = _get_functions_json_path(proj, is_constructor)
+
+    # Prefer the columnar DB, which is mapped instead of parsed and is
+    # kept on disk as rows are read from it on demand.
+    function_views = _load_function_views(proj, is_constructor)
+    if function_views is not None:
+        return function_views, sys.getsizeof(function_views) + len(
+            function_views) * columnar_db.FUNCTION_VIEW_SIZE
 
     if os.path.isfile(json_path):
-        with open(json_path, 'r') as file:
-            function_list = orjson.loads(file.read())
+        with open(json_path, 'rb') as file:
+            function_data = file.read()
+    elif os.path.isfile(json_path + '.gz'):
+        with gzip.open(json_path + '.gz', 'rb') as file:
+            function_data = file.read()
     else:
-        return []
+        return [], 0
+    function_list = orjson.loads(function_data)
 
-    result_list = []
+    result_list: List[ProjectFunction] = []
     for func in function_list:
         try:
             debug_argtypes = func['debug']['args']
@@ -167,11 +619,15 @@ def retrieve_functions(proj: str, is_constructor: bool) -> List[Function]:
                      need_close=func.get('need_close', False),
                      exceptions=func.get('exc', []),
                      asserts=func.get('asserts', [])))
-    JSON_TO_FUNCTION_CACHE[json_path] = result_list
 
     # At this point if google analytics tag is set it means we are in production, and we should
-    # delete the .json file then to save storage.
-    if 'G_ANALYTICS_TAG' in os.environ:
+    # replace the .json file with a compressed one to save storage. The
+    # compressed file is kept to reload the project once evicted.
+    if 'G_ANALYTICS_TAG' in os.environ and os.path.isfile(json_path):
+        with gzip.open(json_path + '.gz', 'wb') as file:
+            file.write(function_data)
         os.remove(json_path)
 
-    return result_list
+    # The size of the parsed functions is estimated from the size of their
+    # json data.
+    return result_list, len(function_data)
@@ -0,0 +1,352 @@
+# Copyright 2024 Fuzz Introspector Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Search index of function names"""
+
+import os
+import re
+import heapq
+import bisect
+import logging
+import sqlite3
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ('substring', 'prefix', 'token')
+
+TOKEN_PATTERN = re.compile(r'[A-Za-z0-9]+')
+
+
+def _get_trigrams(text: str) -> Set[str]:
+    return {text[idx:idx + 3] for idx in range(len(text) - 2)}
+
+
+def _get_tokens(text: str) -> Set[str]:
+    return {token.lower() for token in TOKEN_PATTERN.findall(text)}
+
+
+def name_matches(name: str, query: str, mode: str) -> bool:
+    """Returns True if a function name matches the query in the search
+    mode, as searched by `FunctionSearchIndex`."""
+    if mode not in SEARCH_MODES:
+        raise ValueError(f'Unknown search mode: {mode}')
+    if mode == 'prefix':
+        return name.startswith(query)
+    if mode == 'token':
+        query_tokens = _get_tokens(query)
+        return bool(query_tokens) and query_tokens.issubset(_get_tokens(name))
+    return query in name
+
+
+def _get_short_substrings(text: str) -> Set[str]:
+    """Gets the substrings of one and two characters of the text."""
+    return {
+        text[idx:idx + length]
+        for length in (1, 2)
+        for idx in range(len(text) - length + 1)
+    }
+
+
+def _merge_postings(all_postings: Iterable[Iterable[int]]) -> Iterator[int]:
+    """Iterates over the union of sorted postings, in order."""
+    last_name_id = -1
+    for name_id in heapq.merge(*all_postings):
+        if name_id != last_name_id:
+            yield name_id
+            last_name_id = name_id
+
+
+class FunctionSearchIndex:
+    """Search index of the names of functions. Functions are given as
+    (name, reference) pairs, where the reference is an unsigned 64 bit
+    integer identifying the function, and searches return references.
+
+    Each distinct name has an id in the order the name is first seen, and
+    the index maps trigrams and tokens of the names to the ids of the names
+    holding them. Substring queries shorter than a trigram are matched
+    through the postings of the trigrams holding them. Matches are returned
+    in the order of the name ids, so the functions of a name are grouped and
+    names come in the order they are first seen, except for prefix queries
+    which are returned in the order of the names."""
+
+    def __init__(self, functions: Iterable[Tuple[str, int]]):
+        self.names: List[str] = []
+        self.name_ids: Dict[str, int] = dict()
+
+        function_name_ids = array('I')
+        function_refs = array('Q')
+        for name, ref in functions:
+            name_id = self.name_ids.get(name)
+            if name_id is None:
+                name_id = len(self.names)
+                self.name_ids[name] = name_id
+                self.names.append(name)
+            function_name_ids.append(name_id)
+            function_refs.append(ref)
+
+        # Group the references by name, keeping their order. The references
+        # of a name are refs[ref_offsets[name_id]:ref_offsets[name_id + 1]].
+        self.ref_offsets = array('Q', bytes(8 * (len(self.names) + 1)))
+        for name_id in function_name_ids:
+            self.ref_offsets[name_id + 1] += 1
+        for name_id in range(len(self.names)):
+            self.ref_offsets[name_id + 1] += self.ref_offsets[name_id]
+        next_offsets = array('Q', self.ref_offsets)
+        self.refs = array('Q', bytes(8 * len(function_refs)))
+        for name_id, ref in zip(function_name_ids, function_refs):
+            self.refs[next_offsets[name_id]] = ref
+            next_offsets[name_id] += 1
+
+        self.sorted_name_ids = sorted(range(len(self.names)),
+                                      key=self.names.__getitem__)
+        self.sorted_names = [
+            self.names[name_id] for name_id in self.sorted_name_ids
+        ]
+
+        # Names without trigrams, matched against short queries on top of
+        # the names holding a trigram with the query.
+        self.short_name_ids = array('I', [
+            name_id for name_id, name in enumerate(self.names) if len(name) < 3
+        ])
+
+        self.trigrams: Dict[str, array] = dict()
+        self.tokens: Dict[str, array] = dict()
+        self.short_substring_trigrams: Dict[str, List[str]] = dict()
+        self._build_postings()
+
+    def _build_postings(self) -> None:
+        """Builds the trigram and token postings of the names."""
+        for name_id, name in enumerate(self.names):
+            for trigram in _get_trigrams(name):
+                postings = self.trigrams.get(trigram)
+                if postings is None:
+                    postings = array('I')
+                    self.trigrams[trigram] = postings
+                postings.append(name_id)
+            self._add_tokens(name_id, name)
+
+        # Trigrams holding each substring of one and two characters.
+        for trigram in self.trigrams:
+            for substring in _get_short_substrings(trigram):
+                self.short_substring_trigrams.setdefault(substring,
+                                                         []).append(trigram)
+
+    def _add_tokens(self, name_id: int, name: str) -> None:
+        for token in _get_tokens(name):
+            postings = self.tokens.get(token)
+            if postings is None:
+                postings = array('I')
+                self.tokens[token] = postings
+            postings.append(name_id)
+
+    def _get_short_substring_candidates(self, query: str) -> Iterable[int]:
+        """Gets the ids of the names that may hold a query shorter than a
+        trigram, in order. The names longer than the query hold it in one
+        of their trigrams. If the trigrams hold more ids than there are
+        names, all names are matched instead."""
+        all_postings = [
+            self.trigrams[trigram]
+            for trigram in self.short_substring_trigrams.get(query, [])
+        ]
+        if sum(map(len, all_postings)) >= len(self.names):
+            return range(len(self.names))
+        all_postings.append(self.short_name_ids)
+        return _merge_postings(all_postings)
+
+    def _get_substring_candidates(self, query: str) -> Iterable[int]:
+        """Gets the ids of the names that may hold the query, in order."""
+        if len(query) < 3:
+            return self._get_short_substring_candidates(query)
+
+        smallest_postings: Optional[array] = None
+        for trigram in _get_trigrams(query):
+            postings = self.trigrams.get(trigram)
+            if postings is None:
+                return []
+            if smallest_postings is None or len(postings) < len(
+                    smallest_postings):
+                smallest_postings = postings
+        return smallest_postings or []
+
+    def _iter_matches(self, query: str, mode: str) -> Iterator[int]:
+        """Iterates over the ids of the names matching the query."""
+        if mode == 'prefix':
+            idx = bisect.bisect_left(self.sorted_names, query)
+            while (idx < len(self.sorted_names)
+                   and self.sorted_names[idx].startswith(query)):
+                yield self.sorted_name_ids[idx]
+                idx += 1
+        elif mode == 'token':
+            query_tokens = _get_tokens(query)
+            if not query_tokens:
+                return
+            all_postings = []
+            for token in query_tokens:
+                postings = self.tokens.get(token)
+                if postings is None:
+                    return
+                all_postings.append(postings)
+            all_postings.sort(key=len)
+            other_postings = [set(postings) for postings in all_postings[1:]]
+            for name_id in all_postings[0]:
+                if all(name_id in postings for postings in other_postings):
+                    yield name_id
+        else:
+            for name_id in self._get_substring_candidates(query):
+                if query in self.names[name_id]:
+                    yield name_id
+
+    def _get_name_refs(self, name_id: int) -> array:
+        start = self.ref_offsets[name_id]
+        end = self.ref_offsets[name_id + 1]
+        return self.refs[start:end]
+
+    def get_refs(self, name: str) -> List[int]:
+        """Returns the references of the functions with the given name."""
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            return []
+        return self._get_name_refs(name_id).tolist()
+
+    def search(self,
+               query: str,
+               mode: str = 'substring',
+               limit: Optional[int] = None,
+               count_all: bool = True) -> Tuple[List[int], int]:
+        """Returns the references of at most `limit` functions matching the
+        query and the total number of matching functions. If `count_all` is
+        False, the search stops once `limit` functions are found and the
+        total is the number of functions returned."""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f'Unknown search mode: {mode}')
+
+        refs: List[int] = []
+        total_matches = 0
+        for name_id in self._iter_matches(query, mode):
+            name_refs = self._get_name_refs(name_id)
+            total_matches += len(name_refs)
+            if limit is None:
+                refs.extend(name_refs)
+                continue
+
+            refs.extend(name_refs[:limit - len(refs)])
+            if len(refs) >= limit and not count_all:
+                total_matches = len(refs)
+                break
+
+        return refs, total_matches
+
+
+class SqliteFunctionSearchIndex(FunctionSearchIndex):
+    """Search index keeping the trigram and token postings in an SQLite
+    FTS5 database file instead of in memory."""
+
+    def __init__(self, functions: Iterable[Tuple[str, int]], db_path: str):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        super().__init__(functions)
+
+    def _build_postings(self) -> None:
+        """Builds the FTS5 tables of the names, replacing any previous
+        database file."""
+        if os.path.isfile(self.db_path):
+            os.remove(self.db_path)
+
+        self.connection = sqlite3.connect(self.db_path,
+                                          check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                'CREATE VIRTUAL TABLE names_trigram USING '
+                'fts5(name, tokenize="trigram case_sensitive 1")')
+            self.connection.execute(
+                'CREATE VIRTUAL TABLE names_trigram_terms USING '
+                'fts5vocab(names_trigram, row)')
+            self.connection.execute(
+                'CREATE VIRTUAL TABLE names_trigram_instances USING '
+                'fts5vocab(names_trigram, instance)')
+            self.connection.execute(
+                'CREATE VIRTUAL TABLE names_token USING fts5(tokens)')
+            self.connection.executemany(
+                'INSERT INTO names_trigram(rowid, name) VALUES (?, ?)',
+                enumerate(self.names))
+            self.connection.executemany(
+                'INSERT INTO names_token(rowid, tokens) VALUES (?, ?)',
+                ((name_id, ' '.join(_get_tokens(name)))
+                 for name_id, name in enumerate(self.names)))
+
+    def _get_short_substring_candidates(self, query: str) -> Iterable[int]:
+        return _merge_postings([
+            self._select_rowids(
+                'SELECT DISTINCT doc FROM names_trigram_instances WHERE term '
+                'IN (SELECT term FROM names_trigram_terms '
+                'WHERE instr(term, ?) > 0) ORDER BY doc', query),
+            self.short_name_ids
+        ])
+
+    def _get_substring_candidates(self, query: str) -> Iterable[int]:
+        if len(query) < 3:
+            return self._get_short_substring_candidates(query)
+
+        quoted_query = '"' + query.replace('"', '""') + '"'
+        return self._select_rowids(
+            'SELECT rowid FROM names_trigram WHERE names_trigram MATCH ? '
+            'ORDER BY rowid', quoted_query)
+
+    def _select_rowids(self, statement: str, match: str) -> List[int]:
+        """Runs a query of name ids, one at a time as the connection is
+        shared across threads."""
+        with self.lock:
+            return [
+                row[0]
+                for row in self.connection.execute(statement, (match, ))
+            ]
+
+    def _iter_matches(self, query: str, mode: str) -> Iterator[int]:
+        if mode != 'token':
+            yield from super()._iter_matches(query, mode)
+            return
+
+        query_tokens = _get_tokens(query)
+        if not query_tokens:
+            return
+        token_query = ' AND '.join(f'"{token}"' for token in query_tokens)
+        yield from self._select_rowids(
+            'SELECT rowid FROM names_token WHERE names_token MATCH ? '
+            'ORDER BY rowid', token_query)
+
+
+def _has_fts5_trigram() -> bool:
+    """Returns True if SQLite supports FTS5 with the trigram tokenizer."""
+    connection = sqlite3.connect(':memory:')
+    try:
+        connection.execute(
+            'CREATE VIRTUAL TABLE probe USING fts5(name, tokenize="trigram")')
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        connection.close()
+
+
+def create_search_index(functions: Iterable[Tuple[str, int]],
+                        db_path: str = '') -> FunctionSearchIndex:
+    """Creates the search index of the functions, backed by the SQLite
+    database file `db_path` if it is set and FTS5 is available."""
+    if db_path:
+        if _has_fts5_trigram():
+            return SqliteFunctionSearchIndex(functions, db_path)
+        logger.info('SQLite FTS5 not available, using in-memory index')
+    return FunctionSearchIndex(functions)
@@ -19,7 +19,7 @@ import re
 import json
 import signal
 import logging
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 import requests
 
 from flask import render_template, request, redirect
@@ -28,7 +28,7 @@ from flask_smorest import Blueprint
 import marshmallow
 
 from . import models, data_storage, page_texts
-from .helper import function_helper
+from .helper import function_helper, search_helper
 
 # Use these during testing.
 #from app.site import test_data
@@ -42,6 +42,7 @@ api_blueprint = Blueprint('api',
 gtag = None
 is_local = False
 allow_shutdown = False
+allow_admin = False
 local_oss_fuzz = ''
 
 LOG_FMT = ('%(asctime)s.%(msecs)03d %(levelname)s '
@@ -172,13 +173,6 @@ def get_coverage_report_url(project_name, datestr, language):
     return project_url
 
 
-def all_functions_in_db():
-    """Iterator for going through all functions in the DB"""
-    for project in data_storage.get_projects():
-        for function in data_storage.get_functions_by_project(project.name):
-            yield function
-
-
 def extract_introspector_raw_source_code(project_name, date_str,
                                          target_file) -> str:
     """Returns the contents of a source code file."""
@@ -332,19 +326,15 @@ def extract_lines_from_source_code(
 
 def get_target_function(project_name: str, function_name: str):
     """Gets information about a specific function."""
-    all_functions = data_storage.get_functions_by_project(project_name)
-    all_functions = all_functions + data_storage.get_constructors_by_project(
-        project_name)
-
-    for function in all_functions:
+    for function in data_storage.get_project_functions_by_name(
+            project_name, function_name):
         # Skipping non-related jvm methods and methods from enum classes
         # is_accessible is True by default, i.e. for non jvm projects
         if (not function.is_accessible or function.is_jvm_library
                 or function.is_enum_class):
             continue
         if function.project == project_name:
-            if function.name == function_name:
-                return function
+            return function
     return None
 
 
@@ -385,7 +375,7 @@ def api_get_target_function(args):
 
 
 def get_functions_of_interest(
-        project_name: str) -> List[data_storage.Function]:
+        project_name: str) -> List[data_storage.ProjectFunction]:
     """Returns functions that are publicly available sorted by cyclomatic
     complexity and code coverage."""
     all_functions = data_storage.get_functions_by_project(project_name)
@@ -447,23 +437,17 @@ def get_frontpage_summary_stats() -> models.DBSummary:
 
 def get_project_with_name(project_name) -> Optional[models.Project]:
     """Extracts project with given project name."""
-    all_projects = data_storage.get_projects()
-    for project in all_projects:
-        if project.name == project_name:
-            return project
-
     # TODO: Handle the case where there is no such project.
-    return None
+    return data_storage.get_project_by_name(project_name)
 
 
-def get_fuction_with_name(function_name,
-                          project_name) -> Optional[models.Function]:
+def get_fuction_with_name(
+        function_name, project_name) -> Optional[data_storage.ProjectFunction]:
     """Gets the function with the given function name from a given project"""
 
-    all_functions = data_storage.get_functions_by_project(project_name)
-    for function in all_functions:
-        if function.name == function_name:
-            return function
+    function_index = data_storage.get_function_index(project_name)
+    for function in function_index.by_name.get(function_name, []):
+        return function
 
     # TODO: Handle the case where there is no such function
     for tmp_proj in data_storage.PROJECTS:
@@ -473,17 +457,16 @@ def get_fuction_with_name(function_name,
     return None
 
 
-def get_all_related_functions(primary_function) -> List[models.Function]:
+def get_all_related_functions(
+        primary_function) -> List[data_storage.ProjectFunction]:
     """Gets all functions across the DB that has the same name."""
     related_functions = []
-    for tmp_proj in data_storage.PROJECTS:
-        proj_func_list = data_storage.get_functions_by_project(tmp_proj.name)
-        for function in proj_func_list:
-            # Skipping non-related jvm methods
-            if not function.is_accessible or function.is_jvm_library:
-                continue
-            if function.name == primary_function.name and function.project != primary_function.project:
-                related_functions.append(function)
+    for function in data_storage.get_functions_by_name(primary_function.name):
+        # Skipping non-related jvm methods
+        if not function.is_accessible or function.is_jvm_library:
+            continue
+        if function.project != primary_function.project:
+            related_functions.append(function)
     return related_functions
 
 
@@ -719,6 +702,9 @@ def function_search():
     """Renders function search page"""
     info_msg = None
     query = request.args.get('q', '')
+    search_mode = request.args.get('mode', 'substring')
+    if search_mode not in search_helper.SEARCH_MODES:
+        search_mode = 'substring'
     logger.info("query: { %s }" % (query))
     if query == '':
         # Pick a random interesting query
@@ -729,31 +715,21 @@ def function_search():
             'header', 'decompress', 'file_read'
         ]
         interesting_query = random.choice(interesting_query_roulette)
-        tmp_list = []
-        for function in all_functions_in_db():
-            if interesting_query in function.name:
-                tmp_list.append(function)
-        functions_to_display = tmp_list
-
-        # Shuffle to give varying results each time
-        random.shuffle(functions_to_display)
-
-        total_matches = len(functions_to_display)
-        if total_matches >= 100:
-            functions_to_display = functions_to_display[:100]
+        # Sample to give varying results each time
+        functions_to_display, _ = data_storage.search_functions(
+            interesting_query, limit=100, sample=True)
         info_msg = f"No query was given, picked the query \"{interesting_query}\" for this"
     else:
-        tmp_list = []
-        for function in all_functions_in_db():
-            if query in function.name:
-                tmp_list.append(function)
-        functions_to_display = tmp_list
-
-        total_matches = len(functions_to_display)
-        if total_matches >= MAX_MATCHES_TO_DISPLAY:
-            functions_to_display = functions_to_display[
-                0:MAX_MATCHES_TO_DISPLAY]
-            info_msg = f"Found {total_matches} matches. Only showing the first {MAX_MATCHES_TO_DISPLAY}."
+        # One more match than displayed tells if there are more matches,
+        # without counting all of them.
+        functions_to_display, _ = data_storage.search_functions(
+            query,
+            search_mode,
+            limit=MAX_MATCHES_TO_DISPLAY + 1,
+            count_all=False)
+        if len(functions_to_display) > MAX_MATCHES_TO_DISPLAY:
+            del functions_to_display[MAX_MATCHES_TO_DISPLAY:]
+            info_msg = f"Found more than {MAX_MATCHES_TO_DISPLAY} matches. Only showing the first {MAX_MATCHES_TO_DISPLAY}."
 
     return render_template('function-search.html',
                            gtag=gtag,
@@ -795,6 +771,10 @@ def oracle_3(all_functions, all_projects):
     """
     functions_of_interest = []
     projects_added = dict()
+    c_cpp_projects = {
+        proj.name
+        for proj in all_projects if proj.language in {'c', 'c++'}
+    }
 
     for function in all_functions:
         if (function.runtime_code_coverage < 20.0
@@ -803,13 +783,7 @@ def oracle_3(all_functions, all_projects):
                 and len(function.function_argument_names) > 0):
 
             # Skip non c/c++
-            to_continue = False
-            for proj in all_projects:
-                if proj.name == function.project and proj.language in {
-                        'c', 'c++'
-                }:
-                    to_continue = True
-            if not to_continue:
+            if function.project not in c_cpp_projects:
                 continue
 
             # If there is only a single argument then we want it to be
@@ -845,6 +819,10 @@ def oracle_1(all_functions,
              only_referenced_functions=False):
     tmp_list = []
     project_count = dict()
+    c_cpp_projects = {
+        proj.name
+        for proj in all_projects if proj.language in {'c', 'c++'}
+    }
 
     if only_referenced_functions and len(all_projects) == 1:
         xref_dict = get_cross_reference_dict_from_project(all_projects[0].name)
@@ -887,14 +865,7 @@ def oracle_1(all_functions,
                 and project_count.get(function.project, 0) < max_project_count
                 and function.accummulated_cyclomatic_complexity > 30):
 
-            to_continue = False
-
-            for proj in all_projects:
-                if proj.name == function.project and proj.language in {
-                        'c', 'c++'
-                }:
-                    to_continue = True
-            if not to_continue:
+            if function.project not in c_cpp_projects:
                 continue
 
             if no_static_functions:
@@ -1059,6 +1030,13 @@ def oracle_2(all_functions,
     return functions_to_display
 
 
+def get_function_key(function) -> Tuple[str, str, str, int]:
+    """Gets a key identifying a function, as scanned projects may be
+    loaded again for each scan."""
+    return (function.project, function.function_filename,
+            function.func_signature, function.source_line_begin)
+
+
 @blueprint.route('/target_oracle')
 def target_oracle():
     all_projects = data_storage.get_projects()
@@ -1075,20 +1053,20 @@ def target_oracle():
         for tmp_proj in project_list:
             if len(functions_to_display) > funcs_max_to_display:
                 break
-            proj_func_list = data_storage.get_functions_by_project(tmp_proj)
+            proj_func_list = data_storage.scan_functions_by_project(tmp_proj)
             func_targets = oracle(proj_func_list, all_projects)
             for func in func_targets:
-                if func in total_funcs:
+                func_key = get_function_key(func)
+                if func_key in total_funcs:
                     continue
-                total_funcs.add(func)
+                total_funcs.add(func_key)
                 functions_to_display.append((func, heuristic_name))
     func_to_lang = dict()
     for func, _ in functions_to_display:
         language = 'c'
-        for proj in all_projects:
-            if proj.name == func.project:
-                language = proj.language
-                break
+        proj = get_project_with_name(func.project)
+        if proj is not None:
+            language = proj.language
         # We may overwrite here, and in that case we just use the new
         # heuristic for labeling.
         func_to_lang[func.name] = language
@@ -1183,7 +1161,7 @@ def api_optimal_targets(args):
         return {'result': 'error', 'msg': 'Found no introspector data.'}
 
     # Get all functions of the target project
-    project_functions = data_storage.get_functions_by_project(project_name)
+    function_index = data_storage.get_function_index(project_name)
 
     try:
         optimal_targets_raw = target_project.introspector_data[
@@ -1191,34 +1169,34 @@ def api_optimal_targets(args):
         function_model_optimal_targets = []
         for function in optimal_targets_raw:
             substituted_function = None
-            for model_func in project_functions:
-                if model_func.name == function['name'].replace(' ', ''):
-                    if only_functions_declared_in_header_files:
-                        possible_header_files = model_func.debug_data.get(
-                            'possible-header-files', [])
-                        if not possible_header_files:
-                            continue
-
-                    substituted_function = {
-                        'function_name': model_func.name,
-                        'function_filename': model_func.function_filename,
-                        'runtime_coverage_percent':
-                        model_func.runtime_code_coverage,
-                        'accummulated_complexity':
-                        model_func.accummulated_cyclomatic_complexity,
-                        'function_arguments': model_func.function_arguments,
-                        'function_argument_names':
-                        model_func.function_argument_names,
-                        'return_type': model_func.return_type,
-                        'is_reached': model_func.is_reached,
-                        'reached_by_fuzzers': model_func.reached_by_fuzzers,
-                        'raw_function_name': model_func.raw_function_name,
-                        'source_line_begin': model_func.source_line_begin,
-                        'source_line_end': model_func.source_line_end,
-                        'function_signature': model_func.func_signature,
-                        'debug_summary': model_func.debug_data,
-                    }
-                    break
+            for model_func in function_index.by_name.get(
+                    function['name'].replace(' ', ''), []):
+                if only_functions_declared_in_header_files:
+                    possible_header_files = model_func.debug_data.get(
+                        'possible-header-files', [])
+                    if not possible_header_files:
+                        continue
+
+                substituted_function = {
+                    'function_name': model_func.name,
+                    'function_filename': model_func.function_filename,
+                    'runtime_coverage_percent':
+                    model_func.runtime_code_coverage,
+                    'accummulated_complexity':
+                    model_func.accummulated_cyclomatic_complexity,
+                    'function_arguments': model_func.function_arguments,
+                    'function_argument_names':
+                    model_func.function_argument_names,
+                    'return_type': model_func.return_type,
+                    'is_reached': model_func.is_reached,
+                    'reached_by_fuzzers': model_func.reached_by_fuzzers,
+                    'raw_function_name': model_func.raw_function_name,
+                    'source_line_begin': model_func.source_line_begin,
+                    'source_line_end': model_func.source_line_end,
+                    'function_signature': model_func.func_signature,
+                    'debug_summary': model_func.debug_data,
+                }
+                break
             if substituted_function:
                 function_model_optimal_targets.append(substituted_function)
 
@@ -1575,11 +1553,9 @@ def branch_blockers(args):
 
 
 def get_function_from_func_signature(func_signature, project_name):
-    all_functions = data_storage.get_functions_by_project(project_name)
-    all_constructors = data_storage.get_constructors_by_project(project_name)
-    for function in (all_functions + all_constructors):
-        if function.func_signature == func_signature:
-            return function
+    function_index = data_storage.get_function_index(project_name)
+    for function in function_index.by_signature.get(func_signature, []):
+        return function
     return None
 
 
@@ -1651,25 +1627,15 @@ def api_cross_references(args):
         }
     function_name = target_function.raw_function_name
 
-    # Get all functions of the target project
-    project_functions = data_storage.get_functions_by_project(project_name)
-
-    func_xrefs = []
     xrefs = []
-    for function in project_functions:
-        callsites = function.callsites
-        for cs_dst in callsites:
-            if cs_dst == function_name:
-                func_xrefs.append(function)
-                all_locations = function.callsites[cs_dst]
-                for loc in all_locations:
-                    cs_linenumber = int(loc)
-                    xrefs.append({
-                        'filename': function.function_filename,
-                        'cs_linenumber': cs_linenumber,
-                        'src_func': function.name,
-                        'dst_func': function_name
-                    })
+    for src_func, filename, cs_linenumber in data_storage.get_cross_references(
+            project_name).get(function_name, []):
+        xrefs.append({
+            'filename': filename,
+            'cs_linenumber': cs_linenumber,
+            'src_func': src_func,
+            'dst_func': function_name
+        })
     return {'result': 'success', 'callsites': xrefs}
 
 
@@ -2093,17 +2059,13 @@ def api_function_signature(args):
     if not function_name:
         return {'result': 'error', 'msg': 'No function name provided'}
 
-    all_functions = data_storage.get_functions_by_project(project_name)
-    all_functions = all_functions + data_storage.get_constructors_by_project(
-        project_name)
-
-    for function in all_functions:
-        if function.raw_function_name == function_name:
-            return {
-                'result': 'success',
-                'signature': function.func_signature,
-                'raw_data': function.debug_data,
-            }
+    function_index = data_storage.get_function_index(project_name)
+    for function in function_index.by_raw_name.get(function_name, []):
+        return {
+            'result': 'success',
+            'signature': function.func_signature,
+            'raw_data': function.debug_data,
+        }
 
     return {'result': 'failed', 'msg': 'could not find specified function'}
 
@@ -2659,6 +2621,16 @@ def shutdown():
         return {'result': 'failed', 'msg': 'not a local server'}
 
 
+@api_blueprint.route('/api/cache-stats')
+def cache_stats():
+    """Gets the statistics of the project function cache, only if it's a
+    local server or admin endpoints are allowed."""
+    if is_local or allow_admin:
+        return {'result': 'success', 'stats': data_storage.get_cache_stats()}
+    else:
+        return {'result': 'failed', 'msg': 'admin endpoints not allowed'}
+
+
 @api_blueprint.route('/api/all-header-files')
 @api_blueprint.arguments(ProjectSchema, location='query')
 def all_project_header_files(args):
@@ -3095,22 +3067,22 @@ def api_all_interesting_function_targets():
         for tmp_proj in data_storage.PROJECTS:
             if len(functions_to_display) > funcs_max_to_display:
                 break
-            proj_func_list = data_storage.get_functions_by_project(
+            proj_func_list = data_storage.scan_functions_by_project(
                 tmp_proj.name)
             func_targets = oracle(proj_func_list, all_projects)
             for func in func_targets:
-                if func in total_funcs:
+                func_key = get_function_key(func)
+                if func_key in total_funcs:
                     continue
-                total_funcs.add(func)
+                total_funcs.add(func_key)
                 functions_to_display.append((func, heuristic_name))
 
     func_to_lang = {}
     for func, _ in functions_to_display:
         language = 'c'
-        for proj in all_projects:
-            if proj.name == func.project:
-                language = proj.language
-                break
+        proj = get_project_with_name(func.project)
+        if proj is not None:
+            language = proj.language
         # We may overwrite here, and in that case we just use the new
         # heuristic for labeling.
         func_to_lang[func.name] = language
@@ -3133,17 +3105,7 @@ def api_all_interesting_function_targets():
 
 
 def get_cross_reference_dict_from_project(project_name) -> Dict[str, int]:
-    # Get all functions of the target project
-    project_functions = data_storage.get_functions_by_project(project_name)
-
-    func_xrefs: Dict[str, int] = dict()
-    for function in project_functions:
-        callsites = function.callsites
-        for cs_dst in callsites:
-            func_xref_count = func_xrefs.get(cs_dst, 0)
-            func_xref_count += 1
-            func_xrefs[cs_dst] = func_xref_count
-    return func_xrefs
+    return data_storage.get_cross_reference_counts(project_name)
 
 
 def _get_projects_with_light_but_not_full():
@@ -3282,14 +3244,17 @@ def sample_cross_references(args):
         }
     function_name = target_function.raw_function_name
 
-    # Get all functions of the target project
-    project_functions = data_storage.get_functions_by_project(project_name)
-
+    # Get the functions calling the target function
+    function_index = data_storage.get_function_index(project_name)
     func_xrefs = []
-    for function in project_functions:
-        callsites = function.callsites
-        for cs_dst in callsites:
-            if cs_dst == function_name:
+    seen_callers = set()
+    for src_func, filename, _ in data_storage.get_cross_references(
+            project_name).get(function_name, []):
+        if (src_func, filename) in seen_callers:
+            continue
+        seen_callers.add((src_func, filename))
+        for function in function_index.by_name.get(src_func, []):
+            if function.function_filename == filename:
                 func_xrefs.append(function)
 
     if is_local:
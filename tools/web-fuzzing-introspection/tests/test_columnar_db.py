@@ -0,0 +1,169 @@
+# Copyright 2024 Fuzz Introspector Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test the columnar function DB written by static/assets/db/columnar_db.py
+and read by webapp/columnar_db.py"""
+
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../app/")
+sys.path.append(
+    os.path.dirname(os.path.realpath(__file__)) + "/../app/static/assets/db/")
+
+import columnar_db as columnar_db_writer  # noqa: E402
+from webapp import columnar_db, data_storage  # noqa: E402
+
+FUNCTION_LIST = [{
+    'name': 'parse',
+    'file': 'parse.c',
+    'cov': 1,
+    'cov_url': 'https://coverage/parse.c.html',
+    'fuzzers': ['fuzz_parse'],
+    'icount': 12,
+    'acc_cc': 3,
+    'u-cc': 2,
+    'args': ['char *', 'int'],
+    'args-names': ['data', 'size'],
+    'rtn': 'int',
+    'raw-name': '_Z5parsePci',
+    'src_begin': 10,
+    'src_end': 20,
+    'callsites': {
+        'malloc': ['12']
+    },
+    'sig': 'int parse(char *, int)',
+    'debug': {
+        'args': ['char *', 'int']
+    },
+    'exc': ['ParseError'],
+}, {
+    'name': 'free_all',
+    'file': 'free.c',
+    'cov': 0.5,
+    'cov_url': '',
+    'fuzzers': [],
+    'icount': 3,
+    'acc_cc': 1,
+    'u-cc': 1,
+    'args': [],
+    'args-names': [],
+    'rtn': 'void',
+    'sig': 'N/A',
+    'access': False,
+    'static': True,
+    'asserts': [{
+        'condition': 'ptr != NULL'
+    }],
+}]
+
+ATTRIBUTES = [
+    'name', 'project', 'is_reached', 'runtime_code_coverage',
+    'function_filename', 'reached_by_fuzzers', 'cov_fuzzers', 'comb_fuzzers',
+    'code_coverage_url', 'accummulated_cyclomatic_complexity',
+    'llvm_instruction_count', 'undiscovered_complexity', 'function_arguments',
+    'function_debug_arguments', 'return_type', 'function_argument_names',
+    'raw_function_name', 'source_line_begin', 'source_line_end', 'callsites',
+    'calldepth', 'func_signature', 'debug_data', 'is_accessible',
+    'is_jvm_library', 'is_enum_class', 'is_static', 'need_close', 'exceptions',
+    'asserts'
+]
+
+
+@pytest.fixture
+def function_db_dir(tmpdir, monkeypatch):
+    """Directory of the function DB files, in place of the webapp DB"""
+    monkeypatch.setattr(data_storage, 'all_functions_file',
+                        os.path.join(tmpdir, 'all-functions-db-{PROJ}.json'))
+    monkeypatch.setattr(
+        data_storage, 'all_constructors_file',
+        os.path.join(tmpdir, 'all-constructors-db-{PROJ}.json'))
+    return tmpdir
+
+
+def _write_function_db(function_db_dir, is_constructor):
+    target = 'all-constructors-db-proj' if is_constructor else 'all-functions-db-proj'
+    with open(os.path.join(function_db_dir, target + '.json'), 'w') as f:
+        json.dump(FUNCTION_LIST, f)
+    json_functions, _ = data_storage.load_functions('proj', is_constructor)
+
+    columnar_db_writer.write_columnar_db(
+        FUNCTION_LIST,
+        os.path.join(function_db_dir,
+                     target + columnar_db_writer.FILE_EXTENSION))
+    function_views, _ = data_storage.load_functions('proj', is_constructor)
+    return json_functions, function_views
+
+
+@pytest.mark.parametrize('is_constructor', [False, True])
+def test_columnar_db_round_trip(function_db_dir, is_constructor):
+    """Test functions read from the columnar DB match the json DB"""
+    json_functions, function_views = _write_function_db(
+        function_db_dir, is_constructor)
+
+    assert len(json_functions) == len(function_views) == len(FUNCTION_LIST)
+    for json_function, function_view in zip(json_functions, function_views):
+        assert isinstance(function_view, columnar_db.FunctionView)
+        for attr in ATTRIBUTES:
+            assert getattr(json_function,
+                           attr) == getattr(function_view, attr), attr
+        assert json_function.to_dict() == function_view.to_dict()
+
+
+def test_columnar_db_column_types(function_db_dir):
+    """Test values keep their type, except for integers of float columns"""
+    json_functions, function_views = _write_function_db(function_db_dir, False)
+
+    # The coverage column holds a float, so integer coverage is read as a
+    # float.
+    assert json_functions[0].runtime_code_coverage == 1
+    assert isinstance(json_functions[0].runtime_code_coverage, int)
+    assert function_views[0].runtime_code_coverage == 1.0
+    assert isinstance(function_views[0].runtime_code_coverage, float)
+
+    assert isinstance(function_views[0].llvm_instruction_count, int)
+    assert function_views[1].is_static is True
+    assert function_views[0].is_accessible is True
+    assert function_views[1].is_accessible is False
+    assert function_views[0].callsites == {'malloc': ['12']}
+    assert function_views[1].func_signature == 'free_all'
+
+
+def test_columnar_db_defaults_not_shared(function_db_dir):
+    """Test views do not share the mutable defaults of missing values"""
+    _, function_views = _write_function_db(function_db_dir, False)
+
+    function_views[1].callsites['malloc'] = ['1']
+    function_views[1].cov_fuzzers.append('fuzz_parse')
+    assert function_views[1].callsites == {}
+    assert function_views[1].cov_fuzzers == []
+    assert columnar_db.FunctionView.FIELDS['callsites'][1] == {}
+    assert columnar_db.FunctionView.FIELDS['cov_fuzzers'][1] == []
+
+
+def test_load_columnar_db_not_found(tmpdir):
+    """Test a missing columnar DB is not loaded"""
+    assert columnar_db.load_columnar_db(
+        os.path.join(tmpdir, 'missing' + columnar_db.FILE_EXTENSION)) is None
+
+
+def test_columnar_db_bad_magic(tmpdir):
+    """Test files which are not columnar DBs are rejected"""
+    path = os.path.join(tmpdir, 'bad' + columnar_db.FILE_EXTENSION)
+    with open(path, 'wb') as f:
+        f.write(b'JSON' + bytes(16))
+    with pytest.raises(ValueError):
+        columnar_db.load_columnar_db(path)
@@ -0,0 +1,195 @@
+# Copyright 2024 Fuzz Introspector Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test webapp/data_storage.py"""
+
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../app/")
+sys.path.append(
+    os.path.dirname(os.path.realpath(__file__)) + "/../app/static/assets/db/")
+
+import columnar_db as columnar_db_writer  # noqa: E402
+from webapp import data_storage, models  # noqa: E402
+
+PROJECT_NAMES = ['proj0', 'proj1', 'proj2', 'proj3']
+
+
+def _get_function(name):
+    return {
+        'name': name,
+        'file': 'file.c',
+        'cov': 0,
+        'cov_url': '',
+        'fuzzers': [],
+        'icount': 1,
+        'acc_cc': 1,
+        'u-cc': 1,
+        'args': [],
+        'args-names': [],
+        'rtn': 'void'
+    }
+
+
+def _get_project(name):
+    return models.Project(name=name,
+                          language='c',
+                          date='',
+                          coverage_data=None,
+                          introspector_data=None,
+                          fuzzer_count=1,
+                          project_repository=None,
+                          light_analysis={},
+                          recent_results=None)
+
+
+@pytest.fixture
+def projects(tmpdir, monkeypatch):
+    """Projects with a json function DB, except for the last one which has
+    a columnar function DB, served from a cache of two projects"""
+    monkeypatch.setattr(data_storage, 'all_functions_file',
+                        os.path.join(tmpdir, 'all-functions-db-{PROJ}.json'))
+    monkeypatch.setattr(
+        data_storage, 'all_constructors_file',
+        os.path.join(tmpdir, 'all-constructors-db-{PROJ}.json'))
+    monkeypatch.setattr(data_storage, 'PROJECT_CACHE',
+                        data_storage.ProjectCache(2, 0))
+    monkeypatch.setattr(data_storage, 'PROJECTS',
+                        [_get_project(name) for name in PROJECT_NAMES])
+    monkeypatch.setattr(data_storage, 'SEARCH_INDEX_DB_PATH', '')
+
+    for name in PROJECT_NAMES[:-1]:
+        with open(os.path.join(tmpdir, f'all-functions-db-{name}.json'),
+                  'w') as f:
+            json.dump([_get_function(f'{name}_parse'),
+                       _get_function('main')], f)
+    name = PROJECT_NAMES[-1]
+    columnar_db_writer.write_columnar_db(
+        [_get_function(f'{name}_parse'),
+         _get_function('main')],
+        os.path.join(tmpdir, f'all-functions-db-{name}.fidb'))
+
+    data_storage.index_projects()
+    yield PROJECT_NAMES
+    data_storage.index_projects()
+
+
+def test_project_cache_eviction(projects):
+    """Test the least recently used project is evicted"""
+    cache = data_storage.PROJECT_CACHE
+
+    assert [f.name
+            for f in cache.get('proj0').functions] == ['proj0_parse', 'main']
+    cache.get('proj1')
+    cache.get('proj0')
+    cache.get('proj2')
+
+    assert cache.get_if_cached('proj1') is None
+    assert cache.get_if_cached('proj0') is not None
+    assert cache.get_if_cached('proj2') is not None
+    assert cache.get_stats() == {
+        'projects': 2,
+        'bytes': cache.size,
+        'max_projects': 2,
+        'max_bytes': 0,
+        'hits': 1,
+        'misses': 3,
+        'evictions': 1,
+    }
+    assert cache.size == sum(entry.size for entry in cache.entries.values())
+
+
+def test_project_cache_max_bytes(projects):
+    """Test the cache is bounded by bytes, keeping the last project"""
+    cache = data_storage.ProjectCache(0, 1)
+
+    cache.get('proj0')
+    cache.get('proj1')
+    assert list(cache.entries) == ['proj1']
+    assert cache.get_stats()['evictions'] == 1
+
+    cache.clear()
+    assert cache.get_stats()['projects'] == 0
+    assert cache.get_stats()['bytes'] == 0
+
+
+def test_scan_does_not_evict(projects):
+    """Test scanning all projects keeps the cached projects"""
+    cache = data_storage.PROJECT_CACHE
+    cache.get('proj1')
+    cache.get('proj0')
+    stats = cache.get_stats()
+
+    for _ in range(2):
+        for name in projects:
+            functions = data_storage.scan_functions_by_project(name)
+            assert functions[0].name == f'{name}_parse'
+
+    assert list(cache.entries) == ['proj1', 'proj0']
+    assert cache.get_stats() == stats
+    assert (data_storage.scan_functions_by_project('proj0')
+            is cache.get_if_cached('proj0').functions)
+
+
+def test_search_functions(projects):
+    """Test searches load json projects into the cache once"""
+    data_storage.build_search_index()
+    cache = data_storage.PROJECT_CACHE
+
+    functions, total_matches = data_storage.search_functions('_parse')
+    assert [function.name for function in functions
+            ] == [f'{name}_parse' for name in projects]
+    assert total_matches == len(projects)
+
+    functions = data_storage.get_functions_by_name('main')
+    assert [function.project for function in functions] == projects
+
+    # The columnar project is read without caching it, and json projects
+    # are parsed into the cache rather than on every search.
+    assert cache.get_if_cached(projects[-1]) is None
+    data_storage.search_functions('proj2')
+    misses = cache.get_stats()['misses']
+    data_storage.search_functions('proj2')
+    assert cache.get_stats()['misses'] == misses
+    assert cache.get_if_cached('proj2') is not None
+
+
+def test_search_index_not_built(projects):
+    """Test searches scan all functions while the search index is built"""
+    data_storage.FUNCTION_SEARCH_INDEX_BUILDING = True
+    try:
+        functions, total_matches = data_storage.search_functions('_parse',
+                                                                 limit=2)
+        assert [function.name
+                for function in functions] == ['proj0_parse', 'proj1_parse']
+        assert total_matches == len(projects)
+
+        functions, total_matches = data_storage.search_functions(
+            'parse', 'token', limit=2, count_all=False)
+        assert len(functions) == total_matches == 2
+
+        functions = data_storage.get_functions_by_name('main')
+        assert [function.project for function in functions] == projects
+        assert data_storage.PROJECT_CACHE.get_stats()['projects'] == 0
+    finally:
+        data_storage.FUNCTION_SEARCH_INDEX_BUILDING = False
+
+
+def test_get_project_by_name(projects):
+    """Test projects are found by name"""
+    assert data_storage.get_project_by_name('proj1').name == 'proj1'
+    assert data_storage.get_project_by_name('unknown') is None
@@ -0,0 +1,132 @@
+# Copyright 2024 Fuzz Introspector Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test webapp/helper/search_helper.py"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../app/")
+
+from webapp.helper import search_helper  # noqa: E402
+
+FUNCTION_NAMES = [
+    'parse_xml', 'xmlReadFile', 'read_file', 'parse_xml', 'png_read', 'ab',
+    'XML_Parse', 'x'
+]
+
+
+def _create_index(index_type, tmpdir):
+    functions = [(name, ref) for ref, name in enumerate(FUNCTION_NAMES)]
+    if index_type == 'sqlite':
+        if not search_helper._has_fts5_trigram():
+            pytest.skip('SQLite FTS5 trigram tokenizer not available')
+        return search_helper.SqliteFunctionSearchIndex(
+            functions, os.path.join(tmpdir, 'search.db'))
+    return search_helper.FunctionSearchIndex(functions)
+
+
+def _search_linear(query, mode):
+    """Reference search over all names, in the order of the index"""
+    names = list(dict.fromkeys(FUNCTION_NAMES))
+    if mode == 'prefix':
+        names.sort()
+    refs = []
+    for name in names:
+        if mode == 'substring':
+            matches = query in name
+        elif mode == 'prefix':
+            matches = name.startswith(query)
+        else:
+            query_tokens = search_helper._get_tokens(query)
+            matches = bool(query_tokens) and query_tokens.issubset(
+                search_helper._get_tokens(name))
+        if matches:
+            refs.extend(ref for ref, function_name in enumerate(FUNCTION_NAMES)
+                        if function_name == name)
+    return refs
+
+
+@pytest.mark.parametrize('index_type', ['memory', 'sqlite'])
+@pytest.mark.parametrize('mode,query', [
+    ('substring', 'xml'),
+    ('substring', 'read_f'),
+    ('substring', 'ml'),
+    ('substring', 'a'),
+    ('substring', 'x'),
+    ('substring', 'zz'),
+    ('prefix', 'parse'),
+    ('prefix', 'x'),
+    ('prefix', 'none'),
+    ('token', 'xml'),
+    ('token', 'read file'),
+    ('token', 'parse png'),
+])
+def test_search(tmpdir, index_type, mode, query):
+    """Test searches match a linear search over all names"""
+    search_index = _create_index(index_type, tmpdir)
+
+    refs, total_matches = search_index.search(query, mode)
+    assert refs == _search_linear(query, mode)
+    assert total_matches == len(refs)
+
+
+@pytest.mark.parametrize('index_type', ['memory', 'sqlite'])
+def test_search_limit(tmpdir, index_type):
+    """Test searches return at most the limit and count all matches"""
+    search_index = _create_index(index_type, tmpdir)
+
+    refs, total_matches = search_index.search('a', 'substring', 2)
+    assert refs == _search_linear('a', 'substring')[:2]
+    assert total_matches == len(_search_linear('a', 'substring'))
+
+    refs, total_matches = search_index.search('a',
+                                              'substring',
+                                              2,
+                                              count_all=False)
+    assert refs == _search_linear('a', 'substring')[:2]
+    assert total_matches == 2
+
+
+@pytest.mark.parametrize('index_type', ['memory', 'sqlite'])
+def test_get_refs(tmpdir, index_type):
+    """Test the references of a name are found in order"""
+    search_index = _create_index(index_type, tmpdir)
+
+    assert search_index.get_refs('parse_xml') == [0, 3]
+    assert search_index.get_refs('x') == [7]
+    assert search_index.get_refs('parse') == []
+
+
+@pytest.mark.parametrize('mode,query', [('substring', 'xml'),
+                                        ('prefix', 'parse'),
+                                        ('token', 'read file'),
+                                        ('token', '_')])
+def test_name_matches(mode, query):
+    """Test names match queries as searched by the index"""
+    refs = [
+        ref for ref, name in enumerate(FUNCTION_NAMES)
+        if search_helper.name_matches(name, query, mode)
+    ]
+    assert sorted(refs) == sorted(_search_linear(query, mode))
+
+
+def test_search_unknown_mode():
+    """Test unknown search modes are rejected"""
+    search_index = search_helper.FunctionSearchIndex([])
+    with pytest.raises(ValueError):
+        search_index.search('xml', 'regex')
+    with pytest.raises(ValueError):
+        search_helper.name_matches('parse_xml', 'xml', 'regex')
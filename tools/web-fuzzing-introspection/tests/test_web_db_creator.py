@@ -0,0 +1,116 @@
+# Copyright 2024 Fuzz Introspector Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test static/assets/db/web_db_creator_from_summary.py"""
+
+import os
+import sys
+import json
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../app/")
+sys.path.append(
+    os.path.dirname(os.path.realpath(__file__)) + "/../app/static/assets/db/")
+
+import web_db_creator_from_summary  # noqa: E402
+from webapp import data_storage  # noqa: E402
+
+
+def _get_function(name, filename, callsites):
+    return {
+        'name': name,
+        'file': filename,
+        'cov': 0,
+        'cov_url': '',
+        'fuzzers': [],
+        'icount': 1,
+        'acc_cc': 1,
+        'u-cc': 1,
+        'args': [],
+        'args-names': [],
+        'rtn': 'void',
+        'callsites': callsites
+    }
+
+
+FUNCTION_LIST = [
+    _get_function('main', 'main.c', {
+        'parse': ['10', '12'],
+        'free': ['20']
+    }),
+    _get_function('parse', 'parse.c', {
+        'parse': ['5'],
+        'malloc': ['3']
+    }),
+    _get_function('parse', 'other.c', {'parse': ['7']}),
+    _get_function('leaf', 'leaf.c', {}),
+]
+
+
+def _get_cross_references_linear(function_list, function_name):
+    """Cross references as found by scanning the callsites of all
+    functions"""
+    xrefs = []
+    for function in function_list:
+        callsites = function.get('callsites', {})
+        for cs_dst in callsites:
+            if cs_dst == function_name:
+                for loc in callsites[cs_dst]:
+                    xrefs.append({
+                        'filename': function['file'],
+                        'cs_linenumber': int(loc),
+                        'src_func': function['name'],
+                        'dst_func': function_name
+                    })
+    return xrefs
+
+
+def _get_cross_references_indexed(xref_db, function_name):
+    """Cross references as answered from the reverse call index"""
+    return [{
+        'filename': filename,
+        'cs_linenumber': cs_linenumber,
+        'src_func': src_func,
+        'dst_func': function_name
+    } for src_func, filename, cs_linenumber in xref_db.get(function_name, [])]
+
+
+def test_create_xref_db():
+    """Test the reverse call index answers as scanning all callsites"""
+    xref_db = web_db_creator_from_summary.create_xref_db(FUNCTION_LIST)
+
+    assert set(xref_db) == {'parse', 'free', 'malloc'}
+    for function_name in ['parse', 'free', 'malloc', 'leaf', 'unknown']:
+        assert (_get_cross_references_indexed(
+            xref_db, function_name) == _get_cross_references_linear(
+                FUNCTION_LIST, function_name))
+
+
+def test_get_cross_references_without_xref_db(tmpdir, monkeypatch):
+    """Test the reverse call index built from the function DB matches the
+    one written to the DB"""
+    monkeypatch.setattr(data_storage, 'all_functions_file',
+                        os.path.join(tmpdir, 'all-functions-db-{PROJ}.json'))
+    monkeypatch.setattr(data_storage, 'all_xrefs_file',
+                        os.path.join(tmpdir, 'all-xrefs-db-{PROJ}.json'))
+    with open(os.path.join(tmpdir, 'all-functions-db-proj.json'), 'w') as f:
+        json.dump(FUNCTION_LIST, f)
+    data_storage.PROJECT_CACHE.clear()
+    data_storage.get_cross_references.cache_clear()
+
+    try:
+        assert data_storage.get_cross_references(
+            'proj') == web_db_creator_from_summary.create_xref_db(
+                FUNCTION_LIST)
+    finally:
+        data_storage.PROJECT_CACHE.clear()
+        data_storage.get_cross_references.cache_clear()